@@ -20,7 +20,153 @@ mimetypes.add_type("text/css", ".css", True)
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 GRAPHDB_URL = os.getenv("GRAPHDB_URL", "http://localhost:7200/repositories/Nama-Kelompok")
+WIKIDATA_URL = os.getenv("WIKIDATA_URL", "https://query.wikidata.org/sparql")
+
+# "graphdb" memakai endpoint GRAPHDB_URL, "embedded" menjawab query lokal
+# dari file RDF yang dimuat ke rdflib di dalam proses (tanpa GraphDB)
+LOCAL_SPARQL_BACKEND = os.getenv("LOCAL_SPARQL_BACKEND", "graphdb")
+EMBEDDED_CACHE_DIR = os.getenv("EMBEDDED_CACHE_DIR", str(BASE_DIR / "cache" / "rdf"))
+
+# "remote" memakai query.wikidata.org, "local" memakai snapshot Wikidata
+# (lihat manage.py harvest_wikidata) di named graph WIKIDATA_GRAPH pada GraphDB
+WIKIDATA_SOURCE = os.getenv("WIKIDATA_SOURCE", "remote")
+WIKIDATA_GRAPH = "http://nama-kelompok.org/graph/wikidata"
+WIKIDATA_SNAPSHOT_PATH = BASE_DIR / "graphdb" / "wikidata_snapshot.ttl"
+
+# Pool koneksi keep-alive per endpoint SPARQL dan timeout (detik)
+SPARQL_POOL_SIZE = int(os.getenv("SPARQL_POOL_SIZE", "16"))
+SPARQL_CONNECT_TIMEOUT = float(os.getenv("SPARQL_CONNECT_TIMEOUT", "3"))
+SPARQL_READ_TIMEOUT = float(os.getenv("SPARQL_READ_TIMEOUT", "30"))
+SPARQL_USER_AGENT = os.getenv("SPARQL_USER_AGENT", "TopMovies/1.0 (https://github.com/Nama-Kelompok/TopMovies)")
+
+# Ketahanan terhadap Wikidata yang lambat (detik): timeout per query, batas
+# total enrichment satu halaman detail, circuit breaker (jumlah kegagalan
+# berturut-turut dan jeda sebelum mencoba lagi), dan jeda sebelum query
+# yang lambat dikirim ulang secara paralel (0 = tanpa hedged request)
+WIKIDATA_CALL_TIMEOUT = float(os.getenv("WIKIDATA_CALL_TIMEOUT", "10"))
+DETAIL_PAGE_DEADLINE = float(os.getenv("DETAIL_PAGE_DEADLINE", "12"))
+SPARQL_BREAKER_THRESHOLD = int(os.getenv("SPARQL_BREAKER_THRESHOLD", "5"))
+SPARQL_BREAKER_RESET = float(os.getenv("SPARQL_BREAKER_RESET", "30"))
+SPARQL_HEDGE_DELAY = float(os.getenv("SPARQL_HEDGE_DELAY", "0"))
+
+# Header Server-Timing berisi durasi query SPARQL per label (dibatasi
+# SERVER_TIMING_MAX_ENTRIES label terlambat). Dengan DEBUG, sejumlah
+# SPARQL_TIMING_SLOWEST query paling lambat per request dicetak ke console
+SERVER_TIMING_ENABLED = bool(int(os.getenv("SERVER_TIMING_ENABLED", "1")))
+SERVER_TIMING_MAX_ENTRIES = int(os.getenv("SERVER_TIMING_MAX_ENTRIES", "20"))
+SPARQL_TIMING_SLOWEST = int(os.getenv("SPARQL_TIMING_SLOWEST", "5"))
+
+# Jumlah worker untuk menjalankan query enrichment Wikidata secara paralel
+ENRICHMENT_MAX_WORKERS = int(os.getenv("ENRICHMENT_MAX_WORKERS", "8"))
+
+# Jumlah aktor per query batch (label lokal dan pencocokan cast Wikidata)
+ACTOR_BATCH_SIZE = int(os.getenv("ACTOR_BATCH_SIZE", "50"))
+
+# Jumlah film per query pada API batch: data lokal dan query Wikidata
+# (enrichment, aktor, director). MOVIE_API_MAX_IDS membatasi ID per request
+MOVIE_BATCH_SIZE = int(os.getenv("MOVIE_BATCH_SIZE", "50"))
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "25"))
+MOVIE_API_MAX_IDS = int(os.getenv("MOVIE_API_MAX_IDS", "100"))
+
+# Jumlah entitas per query gambar dan kapasitas memo gambar per entitas
+IMAGE_BATCH_SIZE = int(os.getenv("IMAGE_BATCH_SIZE", "100"))
+IMAGE_MEMO_SIZE = int(os.getenv("IMAGE_MEMO_SIZE", "20000"))
+
+# "index" memakai index n-gram in-memory untuk pencarian film,
+# "sparql" memakai query REGEX langsung ke GraphDB
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "index")
+
+# Batas parameter page pada pencarian, halaman lebih dalam memakai cursor
+SEARCH_MAX_PAGE = int(os.getenv("SEARCH_MAX_PAGE", "50"))
+
+# Cache response JSON pencarian, dibatasi jumlah entry dan ukuran total.
+# Halaman awal dari daftar tanpa kata kunci di-pin agar tidak pernah dibuang
+SEARCH_CACHE_ENABLED = bool(int(os.getenv("SEARCH_CACHE_ENABLED", "1")))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+SEARCH_CACHE_PIN_PAGES = int(os.getenv("SEARCH_CACHE_PIN_PAGES", "3"))
+
+# File RDF lokal dan versinya (default: dihitung dari file RDF)
+RDF_DATA_PATH = BASE_DIR / "graphdb" / "NamaKelompok_RDF.ttl"
+RDF_SCHEMA_PATH = BASE_DIR / "graphdb" / "NamaKelompok_RDF_Schema.ttl"
+DATASET_VERSION = os.getenv("DATASET_VERSION", "")
+# Stamp dan salinan kanonik versi dataset yang terakhir dimuat ke GraphDB
+# oleh manage.py load_dataset (dipakai sebagai versi dataset jika ada)
+DATASET_STATE_DIR = os.getenv("DATASET_STATE_DIR", str(BASE_DIR / "cache" / "dataset"))
+DATASET_LOAD_BATCH_SIZE = int(os.getenv("DATASET_LOAD_BATCH_SIZE", "5000"))
+
+# Proxy gambar lokal (/img/<variant>?src=...): poster dan foto dari host
+# berikut diambil sekali, diubah ukurannya ke lebar IMAGE_VARIANTS (piksel)
+# dan disimpan di IMAGE_CACHE_DIR, dibatasi IMAGE_CACHE_MAX_BYTES (LRU)
+IMAGE_PROXY_ENABLED = bool(int(os.getenv("IMAGE_PROXY_ENABLED", "1")))
+IMAGE_PROXY_HOSTS = os.getenv(
+    "IMAGE_PROXY_HOSTS", "m.media-amazon.com,upload.wikimedia.org,commons.wikimedia.org"
+).split(",")
+IMAGE_VARIANTS = {"thumb": 160, "grid": 300, "detail": 600}
+IMAGE_JPEG_QUALITY = int(os.getenv("IMAGE_JPEG_QUALITY", "82"))
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", str(BASE_DIR / "cache" / "images"))
+IMAGE_CACHE_MAX_BYTES = int(os.getenv("IMAGE_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+IMAGE_PROXY_RATE = float(os.getenv("IMAGE_PROXY_RATE", "10"))
+IMAGE_PROXY_TIMEOUT = float(os.getenv("IMAGE_PROXY_TIMEOUT", "15"))
+IMAGE_PROXY_MAX_AGE = int(os.getenv("IMAGE_PROXY_MAX_AGE", str(365 * 24 * 60 * 60)))
+
+# Halaman detail statis hasil manage.py prerender_movies. Dengan
+# PRERENDER_SERVE, WhiteNoise melayani /movie/<id>/ dari PRERENDER_DIR
+# sebelum view dijalankan (tanpa DEBUG, file dibaca saat server start)
+PRERENDER_DIR = os.getenv("PRERENDER_DIR", str(BASE_DIR / "prerendered"))
+PRERENDER_MANIFEST_PATH = os.getenv("PRERENDER_MANIFEST_PATH", str(BASE_DIR / "cache" / "prerender.json"))
+PRERENDER_SERVE = bool(int(os.getenv("PRERENDER_SERVE", "0")))
+if PRERENDER_SERVE:
+    WHITENOISE_ROOT = PRERENDER_DIR
+    WHITENOISE_INDEX_FILE = True
+
+# Route utama memakai view async (untuk deployment ASGI, mis. uvicorn)
+ASYNC_VIEWS = bool(int(os.getenv("ASYNC_VIEWS", "0")))
+
+# Halaman detail dikirim bertahap: data lokal dulu, section Wikidata menyusul.
+# Section yang belum selesai setelah deadline (detik) diganti placeholder
+DETAIL_STREAMING = bool(int(os.getenv("DETAIL_STREAMING", "0")))
+DETAIL_STREAM_DEADLINE = float(os.getenv("DETAIL_STREAM_DEADLINE", "8"))
+
+# Cache hasil query SPARQL: LRU in-memory lalu SQLite di disk.
+# TTL dalam detik per endpoint, None berarti tidak kedaluwarsa
+# (entry lokal sudah terikat ke versi dataset)
+SPARQL_CACHE_ENABLED = bool(int(os.getenv("SPARQL_CACHE_ENABLED", "1")))
+SPARQL_CACHE_MEMORY_SIZE = int(os.getenv("SPARQL_CACHE_MEMORY_SIZE", "2048"))
+SPARQL_CACHE_PATH = os.getenv("SPARQL_CACHE_PATH", str(BASE_DIR / "cache" / "sparql.sqlite3"))
+SPARQL_CACHE_TTL = {
+    "local": None,
+    "wikidata": int(os.getenv("WIKIDATA_CACHE_TTL", str(3 * 24 * 60 * 60))),
+}
+SPARQL_CACHE_NEGATIVE_TTL = {
+    "local": None,
+    "wikidata": int(os.getenv("WIKIDATA_NEGATIVE_CACHE_TTL", str(6 * 60 * 60))),
+}
+
+# Header cache HTTP (ETag, Last-Modified, Cache-Control) per route, dalam detik.
+# Route dengan "wikidata" memuat data Wikidata langsung, jadi validatornya
+# ikut berganti setiap WIKIDATA_CACHE_TTL selain saat dataset lokal berubah
+HTTP_CACHE_ENABLED = bool(int(os.getenv("HTTP_CACHE_ENABLED", "1")))
+HTTP_CACHE_POLICIES = {
+    "search": {
+        "max_age": int(os.getenv("SEARCH_HTTP_MAX_AGE", "60")),
+        "stale_while_revalidate": int(os.getenv("SEARCH_HTTP_STALE", "600")),
+    },
+    "detail": {
+        "max_age": int(os.getenv("DETAIL_HTTP_MAX_AGE", "300")),
+        "stale_while_revalidate": int(os.getenv("DETAIL_HTTP_STALE", "86400")),
+        "wikidata": True,
+    },
+    "api": {
+        "max_age": int(os.getenv("API_HTTP_MAX_AGE", "300")),
+        "stale_while_revalidate": int(os.getenv("API_HTTP_STALE", "86400")),
+        "wikidata": True,
+    },
+}
 
+# Versi build yang ikut menentukan ETag (mis. commit git saat deploy).
+# Kosong berarti memakai fingerprint template dan kode view
+BUILD_VERSION = os.getenv("BUILD_VERSION", "")
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.1/howto/deployment/checklist/
@@ -55,7 +201,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'main.middleware.StaticFilesMiddleware',
+    'main.middleware.ServerTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'TopMovies.urls'
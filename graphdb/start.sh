@@ -1,2 +1,11 @@
-/opt/graphdb/dist/bin/importrdf load -f -c /graphdb-data/Nama-Kelompok-config.ttl -m parallel /graphdb-data/NamaKelompok_RDF.ttl
-/opt/graphdb/dist/bin/graphdb -s
\ No newline at end of file
+/opt/graphdb/dist/bin/graphdb -s &
+GRAPHDB_PID=$!
+
+# Repository hanya dibuat sekali (data tersimpan di volume graphdb-home).
+# Isinya dimuat secara inkremental oleh manage.py load_dataset dari container web
+until curl -sf http://localhost:7200/rest/repositories > /dev/null; do sleep 2; done
+if ! curl -sf http://localhost:7200/rest/repositories/Nama-Kelompok > /dev/null; then
+    curl -sf -X POST -F "config=@/graphdb-data/Nama-Kelompok-config.ttl" http://localhost:7200/rest/repositories
+fi
+
+wait $GRAPHDB_PID
@@ -0,0 +1,90 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+def empty_results(query):
+    return {"head": {"vars": []}, "results": {"bindings": []}}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Backlog besar agar ratusan koneksi bersamaan (uji beban async) tidak ditolak
+    request_queue_size = 512
+
+
+class FakeSparqlEndpoint:
+    """
+    Endpoint SPARQL lokal untuk benchmark. Setiap query dijawab oleh
+    responder(query) setelah jeda latency detik.
+    """
+
+    def __init__(self, responder=empty_results, latency=0.0):
+        self.responder = responder
+        self.latency = latency
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = _Server(("127.0.0.1", 0), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/sparql"
+
+    def _make_handler(self):
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # Keep-alive seperti endpoint SPARQL sungguhan. Header dan body
+            # ditulis terpisah, jadi Nagle dimatikan agar tidak ada jeda
+            # delayed ACK (~40ms) di setiap response
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                params = parse_qs(urlparse(self.path).query)
+                self._answer(params.get("query", [""])[0])
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length).decode("utf-8")
+                if self.headers.get("Content-Type", "").startswith("application/sparql-query"):
+                    query = body
+                else:
+                    query = parse_qs(body).get("query", [""])[0]
+                self._answer(query)
+
+            def _answer(self, query):
+                with endpoint._lock:
+                    endpoint.request_count += 1
+                if endpoint.latency:
+                    time.sleep(endpoint.latency)
+                payload = json.dumps(endpoint.responder(query)).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/sparql-results+json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
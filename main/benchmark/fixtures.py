@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import re
+import threading
+
+import requests
+
+from .endpoint import empty_results
+
+FIXTURE_VERSION = 1
+
+
+def fixture_key(endpoint, query):
+    # Whitespace dinormalisasi agar perbedaan indentasi tidak mengubah key
+    normalized = re.sub(r"\s+", " ", query).strip()
+    return hashlib.sha1(f"{endpoint}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+class FixtureStore:
+    """
+    Respons SPARQL yang direkam, disimpan dalam satu file JSON:
+    {"version": 1, "queries": {key: {"endpoint", "query", "response"}}}.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.queries = {}
+        self.misses = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != FIXTURE_VERSION:
+                raise ValueError(f"Versi fixture {path} tidak didukung")
+            self.queries = data["queries"]
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": FIXTURE_VERSION, "queries": self.queries}, f)
+        os.replace(tmp_path, self.path)
+
+    def recorder(self, endpoint, url):
+        """
+        Responder FakeSparqlEndpoint yang meneruskan query ke endpoint asli
+        lalu menyimpan responsnya.
+        """
+        session = requests.Session()
+
+        def responder(query):
+            response = session.post(
+                url, data={"query": query}, headers={"Accept": "application/sparql-results+json"}, timeout=120,
+            )
+            response.raise_for_status()
+            data = response.json()
+            with self._lock:
+                self.queries[fixture_key(endpoint, query)] = {
+                    "endpoint": endpoint, "query": query, "response": data,
+                }
+            return data
+        return responder
+
+    def replayer(self, endpoint):
+        """
+        Responder yang menjawab dari rekaman. Query yang tidak ada di rekaman
+        dijawab kosong dan dihitung di misses.
+        """
+        def responder(query):
+            entry = self.queries.get(fixture_key(endpoint, query))
+            if entry is not None:
+                return entry["response"]
+            with self._lock:
+                self.misses[endpoint] = self.misses.get(endpoint, 0) + 1
+            return empty_results(query)
+        return responder
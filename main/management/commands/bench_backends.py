@@ -0,0 +1,131 @@
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from main.benchmark.endpoint import FakeSparqlEndpoint
+from main.utils.movie import build_movie_query
+from main.utils.rdf_store import embedded_paths, load_graph
+from main.utils.search import build_hydrate_query
+from main.utils.search_index import INDEX_QUERY
+from main.utils.sparql import EmbeddedSparqlClient, SparqlClient
+
+SAMPLE_QUERY = """
+    PREFIX : <http://nama-kelompok.org/data/>
+    PREFIX v: <http://nama-kelompok.org/vocab#>
+
+    SELECT ?movie ?star WHERE {
+        ?movie a :Movie ;
+            v:star ?star .
+    }
+    ORDER BY ?movie
+    LIMIT 50
+"""
+
+# Film untuk query detail/batch, termasuk film tanpa v:star
+MOVIES_QUERY = """
+    PREFIX : <http://nama-kelompok.org/data/>
+
+    SELECT ?movie WHERE {
+        ?movie a :Movie .
+    }
+    ORDER BY ?movie
+    LIMIT 50
+"""
+
+
+def label_query(uri):
+    # Sama dengan fetch_label, dipanggil sekali per bintang film
+    return f"""
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?label WHERE {{
+        <{uri}> rdfs:label ?label .
+    }}
+    LIMIT 1
+    """
+
+
+def labels_query(uris):
+    # Sama dengan fetch_labels
+    values = " ".join(f"<{uri}>" for uri in uris)
+    return f"""
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?uri ?label WHERE {{
+        VALUES ?uri {{ {values} }}
+        ?uri rdfs:label ?label .
+    }}
+    """
+
+
+class Command(BaseCommand):
+    help = "Membandingkan latency query lokal antara GraphDB (HTTP) dan backend rdflib embedded"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--endpoint", default=settings.GRAPHDB_URL)
+        parser.add_argument(
+            "--fake-graphdb", action="store_true",
+            help="Ganti GraphDB dengan endpoint HTTP tiruan di atas graph yang sama (mengukur overhead HTTP saja)",
+        )
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def time_query(self, client, query, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            client.query(query)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def handle(self, *args, **options):
+        paths = embedded_paths()
+        start = time.perf_counter()
+        graph = load_graph(paths)
+        self.stdout.write(f"turtle parse   {time.perf_counter() - start:.2f}s ({len(graph)} triples)")
+        load_graph(paths, settings.EMBEDDED_CACHE_DIR)
+        start = time.perf_counter()
+        load_graph(paths, settings.EMBEDDED_CACHE_DIR)
+        self.stdout.write(f"pickle load    {time.perf_counter() - start:.2f}s")
+
+        embedded = EmbeddedSparqlClient("bench-embedded")
+        rows = embedded.query(SAMPLE_QUERY)["results"]["bindings"]
+        movies = sorted({row["movie"]["value"] for row in rows})
+        stars = sorted({row["star"]["value"] for row in rows})
+        batch = [row["movie"]["value"] for row in embedded.query(MOVIES_QUERY)["results"]["bindings"]]
+        queries = {
+            "label x1": label_query(stars[0]),
+            f"labels x{len(stars)}": labels_query(stars),
+            f"hydrate x{len(movies)}": build_hydrate_query(movies),
+            "search index": INDEX_QUERY,
+            "movie x1": build_movie_query(batch[:1]),
+            f"movies x{len(batch)}": build_movie_query(batch),
+        }
+
+        endpoint = None
+        url = options["endpoint"]
+        if options["fake_graphdb"]:
+            endpoint = FakeSparqlEndpoint(
+                lambda query: json.loads(graph.query(query).serialize(format="json"))
+            ).start()
+            url = endpoint.url
+        clients = [("embedded", embedded), ("graphdb", SparqlClient("bench-graphdb", url))]
+
+        try:
+            with override_settings(SPARQL_CACHE_ENABLED=False):
+                for label, query in queries.items():
+                    line = f"{label:<14}"
+                    for name, client in clients:
+                        try:
+                            timings = self.time_query(client, query, options["repeat"])
+                        except Exception as e:
+                            line += f"  {name} failed ({type(e).__name__})"
+                            continue
+                        line += f"  {name} p50 {statistics.median(timings) * 1000:8.1f}ms"
+                    self.stdout.write(line)
+        finally:
+            if endpoint:
+                endpoint.stop()
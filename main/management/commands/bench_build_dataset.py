@@ -0,0 +1,125 @@
+import ast
+import os
+import random
+import resource
+import tempfile
+import time
+
+import pandas as pd
+from django.core.management.base import BaseCommand
+
+from main.utils.rdf_build import build_dataset, parse_hr_min, split_list
+
+CATALOG_SIZE = 1000
+GENRES = ["Action", "Adventure", "Comedy", "Crime", "Drama", "Fantasy", "History", "Sci-Fi", "Thriller", "War"]
+DISTRIBUTORS = ["Warner Bros.", "Universal Pictures", "Paramount Pictures", "Lionsgate", "Walt Disney Studios"]
+
+
+def synthetic_imdb(rows, rng):
+    people = [f"Person {i}" for i in range(rows // 2 + 10)]
+    return pd.DataFrame({
+        "Poster_Link": [f"https://m.media-amazon.com/images/M/{i}.jpg" for i in range(rows)],
+        "Series_Title": [f"Movie {i}: The \"Sequel\", Part {i % 7}" for i in range(rows)],
+        "Released_Year": [str(1920 + i % 100) if i % 500 else "PG" for i in range(rows)],
+        "Certificate": [rng.choice(["A", "U", "UA", "R", ""]) for _ in range(rows)],
+        "Runtime": [f"{rng.randint(60, 200)} min" for _ in range(rows)],
+        "Genre": [", ".join(rng.sample(GENRES, 3)) for _ in range(rows)],
+        "IMDB_Rating": [f"{rng.uniform(7.5, 9.3):.1f}" for _ in range(rows)],
+        "Overview": ["A synthetic overview with a comma, a quote \" and unicode éà."] * rows,
+        "Meta_score": [str(rng.randint(40, 100)) if i % 7 else "" for i in range(rows)],
+        "Director": [rng.choice(people) for _ in range(rows)],
+        **{f"Star{n}": [rng.choice(people) for _ in range(rows)] for n in range(1, 5)},
+        "No_of_Votes": [str(rng.randint(25000, 2500000)) for _ in range(rows)],
+        "Gross": [f"{rng.randint(1000, 900000000):,}" if i % 5 else "" for i in range(rows)],
+        "wikidata_id": [f"http://www.wikidata.org/entity/Q{100000 + i}" if i % 10 else "" for i in range(rows)],
+    })
+
+
+def synthetic_hollywood(rows, rng):
+    return pd.DataFrame({
+        "Title": [f"Movie {i}: The \"Sequel\", Part {i % 7}" for i in range(rows)],
+        "Movie Info": ["A synthetic film description."] * rows,
+        "Year": [str(1920 + i % 100) for i in range(rows)],
+        "Distributor": [rng.choice(DISTRIBUTORS) if i % 50 else "$1,000" for i in range(rows)],
+        "Budget (in $)": [str(rng.randint(10 ** 6, 3 * 10 ** 8)) if i % 4 else "N/A" for i in range(rows)],
+        "Domestic Opening (in $)": [str(rng.randint(10 ** 5, 10 ** 8)) if i % 9 else "N/A" for i in range(rows)],
+        "Domestic Sales (in $)": [str(rng.randint(10 ** 6, 10 ** 9)) for _ in range(rows)],
+        "International Sales (in $)": [str(rng.randint(10 ** 6, 10 ** 9)) for _ in range(rows)],
+        "World Wide Sales (in $)": [str(rng.randint(10 ** 6, 2 * 10 ** 9)) for _ in range(rows)],
+        "Release Date": [f"December {1 + i % 28}, {1920 + i % 100}" if i % 6 else "" for i in range(rows)],
+        "Genre": [str(rng.sample(GENRES, rng.randint(1, 4))) for _ in range(rows)],
+        "Running Time": [f"{rng.randint(1, 3)} hr" + (f" {rng.randint(1, 59)} min" if i % 8 else "") for i in range(rows)],
+        "License": [rng.choice(["G", "PG", "PG-13", "R"]) if i % 3 else "" for i in range(rows)],
+        "wikidata_id": [f"http://www.wikidata.org/entity/Q{100000 + i}" if i % 10 else "" for i in range(rows)],
+        "Poster Link": [f"//upload.wikimedia.org/wikipedia/en/{i}.jpg" for i in range(rows)],
+    })
+
+
+def rowwise_hollywood(path):
+    # Langkah hollywood_preproc.ipynb: literal_eval + explode + apply per baris
+    def convert_time(value):
+        hour_split = value.split(" hr")
+        hour_str = hour_split[0].strip()
+        min_str = "0" if hour_split[1] == "" else hour_split[1].split(" min")[0][1:]
+        return 60 * int(hour_str) + int(min_str)
+
+    df = pd.read_csv(path)
+    df["Genre"] = df["Genre"].apply(ast.literal_eval)
+    df = df.explode("Genre", ignore_index=True)
+    df["Running Time"] = df["Running Time"].apply(convert_time)
+    return df
+
+
+def vectorized_hollywood(path):
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    return split_list(df["Genre"], "pylist"), parse_hr_min(df["Running Time"])
+
+
+class Command(BaseCommand):
+    help = "Benchmark build_dataset pada katalog sintetis (default 100x ukuran katalog asli)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=100, help="Kelipatan dari 1000 baris per sumber")
+        parser.add_argument("--chunksize", type=int, default=5000)
+        parser.add_argument("--format", choices=["turtle", "nt"], default="nt")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--skip-rowwise", action="store_true", help="Lewati pembanding cara notebook")
+
+    def timed(self, label, func, rows):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<28} {elapsed:8.2f}s  {rows / elapsed:10.0f} rows/s")
+        return result, elapsed
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        rows = CATALOG_SIZE * options["scale"]
+        with tempfile.TemporaryDirectory() as tmp:
+            imdb_path = os.path.join(tmp, "imdb.csv")
+            hollywood_path = os.path.join(tmp, "hollywood.csv")
+            output = os.path.join(tmp, f"dataset.{'nt' if options['format'] == 'nt' else 'ttl'}")
+            synthetic_imdb(rows, rng).to_csv(imdb_path, index=False)
+            synthetic_hollywood(rows, rng).to_csv(hollywood_path, index=False)
+            self.stdout.write(f"Synthetic catalog: {rows} IMDb + {rows} Hollywood rows")
+
+            if not options["skip_rowwise"]:
+                self.timed("hollywood parse (row-wise)", lambda: rowwise_hollywood(hollywood_path), rows)
+                self.timed("hollywood parse (vectorized)", lambda: vectorized_hollywood(hollywood_path), rows)
+
+            (total_rows, triples), elapsed = self.timed(
+                "build_dataset",
+                lambda: build_dataset(
+                    [("imdb", imdb_path), ("hollywood", hollywood_path)], output,
+                    options["format"], options["chunksize"],
+                ),
+                rows * 2,
+            )
+            size = os.path.getsize(output)
+
+        # ru_maxrss dalam KiB di Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        self.stdout.write(
+            f"{triples} triples from {total_rows} rows, {size / 1024 / 1024:.1f} MiB output, "
+            f"{triples / elapsed:.0f} triples/s, peak RSS {peak:.0f} MiB"
+        )
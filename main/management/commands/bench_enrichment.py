@@ -0,0 +1,77 @@
+import os
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+from main.benchmark.endpoint import FakeSparqlEndpoint, empty_results
+from main.utils.sparql import local_sparql, wikidata_sparql
+from main.views import get_movie_details
+
+MOVIE_URI = "http://nama-kelompok.org/data/Benchmark_Movie"
+
+
+def local_responder(query):
+    # Query detail film dijawab dengan satu baris film tanpa aktor lokal,
+    # query lain (label) dijawab kosong
+    if "VALUES ?movies" not in query:
+        return empty_results(query)
+    row = {
+        "movies": {"type": "uri", "value": MOVIE_URI},
+        "title": {"type": "literal", "value": "Benchmark Movie"},
+        "stars": {"type": "literal", "value": ""},
+        "wikidataUri": {"type": "uri", "value": "http://www.wikidata.org/entity/Q1"},
+        "runningTime": {"type": "literal", "value": "120"},
+    }
+    return {"head": {"vars": list(row)}, "results": {"bindings": [row]}}
+
+
+class Command(BaseCommand):
+    help = "Membandingkan waktu halaman detail film secara sekuensial dan paralel terhadap endpoint tiruan"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--latency", type=float, default=0.2, help="Latency Wikidata tiruan per query (detik)")
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        latency = options["latency"]
+        factory = RequestFactory()
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                FakeSparqlEndpoint(local_responder) as local, \
+                FakeSparqlEndpoint(latency=latency) as wikidata:
+            cache_path = os.path.join(tmp, "sparql.sqlite3")
+            original = (local_sparql.endpoint, wikidata_sparql.endpoint)
+            local_sparql.endpoint = local.url
+            wikidata_sparql.endpoint = wikidata.url
+            try:
+                runs = (
+                    ("sequential", {"ENRICHMENT_MAX_WORKERS": 1, "SPARQL_CACHE_ENABLED": False}),
+                    ("concurrent", {"SPARQL_CACHE_ENABLED": False}),
+                    # Run pertama mengisi cache, sisanya tidak boleh keluar ke endpoint
+                    ("warm cache", {"SPARQL_CACHE_ENABLED": True, "SPARQL_CACHE_PATH": cache_path}),
+                )
+                for label, overrides in runs:
+                    with override_settings(**overrides):
+                        timings = []
+                        wikidata.request_count = 0
+                        for _ in range(options["repeat"]):
+                            request = factory.get(f"/movie/{MOVIE_URI}/")
+                            start = time.perf_counter()
+                            response = get_movie_details(request, uri=MOVIE_URI)
+                            timings.append(time.perf_counter() - start)
+                            if len(timings) == 1:
+                                first_run_queries = wikidata.request_count
+                            if response.status_code != 200:
+                                self.stderr.write(f"{label}: status {response.status_code}")
+                        if label == "warm cache":
+                            queries = wikidata.request_count - first_run_queries
+                        else:
+                            queries = wikidata.request_count // options["repeat"]
+                        self.stdout.write(
+                            f"{label:<11} best {min(timings):.3f}s  "
+                            f"({queries} Wikidata queries x {latency:.3f}s = {queries * latency:.3f}s if run in series)"
+                        )
+            finally:
+                local_sparql.endpoint, wikidata_sparql.endpoint = original
@@ -0,0 +1,67 @@
+import json
+import re
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+
+from main.benchmark.endpoint import FakeSparqlEndpoint, empty_results
+from main.utils.sparql import local_sparql, wikidata_sparql
+from main.views import get_movie_details, get_movie_details_batch
+
+
+def batch_local_responder(query):
+    # Setiap film di VALUES ?movies dijawab dengan satu baris tanpa aktor lokal
+    match = re.search(r"VALUES \?movies \{(.*?)\}", query, re.S)
+    if not match:
+        return empty_results(query)
+    rows = []
+    for number, uri in enumerate(re.findall(r"<([^>]+)>", match.group(1))):
+        rows.append({
+            "movies": {"type": "uri", "value": uri},
+            "title": {"type": "literal", "value": uri.split("/")[-1]},
+            "stars": {"type": "literal", "value": ""},
+            "wikidataUri": {"type": "uri", "value": f"http://www.wikidata.org/entity/Q{number + 1}"},
+            "runningTime": {"type": "literal", "value": "120"},
+        })
+    return {"head": {"vars": list(rows[0]) if rows else []}, "results": {"bindings": rows}}
+
+
+class Command(BaseCommand):
+    help = "Membandingkan N halaman detail film dengan satu request ke API batch /api/movies"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--movies", type=int, default=100, help="Jumlah film yang diambil")
+        parser.add_argument("--latency", type=float, default=0.2, help="Latency Wikidata tiruan per query (detik)")
+
+    def handle(self, *args, **options):
+        factory = RequestFactory()
+        ids = [f"Benchmark_Movie_{number}" for number in range(options["movies"])]
+
+        with FakeSparqlEndpoint(batch_local_responder) as local, \
+                FakeSparqlEndpoint(latency=options["latency"]) as wikidata:
+            original = (local_sparql.endpoint, wikidata_sparql.endpoint)
+            local_sparql.endpoint = local.url
+            wikidata_sparql.endpoint = wikidata.url
+            try:
+                with override_settings(SPARQL_CACHE_ENABLED=False, MOVIE_API_MAX_IDS=len(ids)):
+                    wikidata.request_count = 0
+                    start = time.perf_counter()
+                    for id in ids:
+                        get_movie_details(factory.get(f"/movie/{id}/"), uri=id)
+                    self.stdout.write(
+                        f"{len(ids)} detail pages  {time.perf_counter() - start:7.2f}s  "
+                        f"({wikidata.request_count} Wikidata queries)"
+                    )
+
+                    wikidata.request_count = 0
+                    start = time.perf_counter()
+                    response = get_movie_details_batch(factory.get("/api/movies", {"ids": ",".join(ids)}))
+                    elapsed = time.perf_counter() - start
+                    found = len(json.loads(response.content).get("movies", []))
+                    self.stdout.write(
+                        f"batch API        {elapsed:7.2f}s  "
+                        f"({wikidata.request_count} Wikidata queries, {found} movies)"
+                    )
+            finally:
+                local_sparql.endpoint, wikidata_sparql.endpoint = original
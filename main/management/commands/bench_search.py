@@ -0,0 +1,95 @@
+import json
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory, override_settings
+from rdflib import Graph
+
+from main.benchmark.endpoint import FakeSparqlEndpoint
+from main.utils.search_index import get_search_index
+from main.utils.sparql import local_sparql
+from main.views import search_movies
+
+DEFAULT_QUERIES = ["", "a", "the", "star", "action", "love story", "zzzz"]
+SORTS = ["alphabet_asc", "rating", "budget"]
+
+
+def graph_responder(graph):
+    def responder(query):
+        return json.loads(graph.query(query).serialize(format="json"))
+    return responder
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = "Membandingkan latency pencarian REGEX SPARQL dengan index in-memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--query", action="append", dest="queries", help="Teks pencarian (boleh berulang)")
+        parser.add_argument(
+            "--rdf", help="Layani file Turtle ini lewat endpoint tiruan berbasis rdflib, bukan GraphDB",
+        )
+
+    def run_backend(self, backend, queries, repeat):
+        factory = RequestFactory()
+        timings = []
+        pages = {}
+        with override_settings(SEARCH_BACKEND=backend):
+            for _ in range(repeat):
+                for text in queries:
+                    for sort in SORTS:
+                        request = factory.get("/search/", {"movie": text, "sort": sort, "page": 1})
+                        start = time.perf_counter()
+                        response = search_movies(request)
+                        timings.append(time.perf_counter() - start)
+                        pages[(text, sort)] = json.loads(response.content)
+        return timings, pages
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or DEFAULT_QUERIES
+        endpoint = None
+        original = local_sparql.endpoint
+        if options["rdf"]:
+            graph = Graph()
+            graph.parse(options["rdf"])
+            endpoint = FakeSparqlEndpoint(graph_responder(graph)).start()
+            local_sparql.endpoint = endpoint.url
+
+        try:
+            with override_settings(SPARQL_CACHE_ENABLED=False, SEARCH_CACHE_ENABLED=False):
+                start = time.perf_counter()
+                index = get_search_index()
+                self.stdout.write(
+                    f"index build {time.perf_counter() - start:.3f}s "
+                    f"({len(index.movies)} movies, {len(index.postings)} n-grams)"
+                )
+
+                results = {}
+                for backend in ("sparql", "index"):
+                    timings, results[backend] = self.run_backend(backend, queries, options["repeat"])
+                    self.stdout.write(
+                        f"{backend:<6} p50 {statistics.median(timings) * 1000:8.1f}ms  "
+                        f"p99 {percentile(timings, 99) * 1000:8.1f}ms  ({len(timings)} requests)"
+                    )
+
+            # Hasil kedua backend dibandingkan berdasarkan himpunan film, karena
+            # urutan film dengan nilai sort yang sama tidak ditentukan oleh REGEX query
+            for key, page in results["sparql"].items():
+                if "error" in page:
+                    self.stderr.write(f"{key}: sparql backend failed: {page['error']}")
+                    continue
+                expected = {movie["movieId"] for movie in page.get("movies", [])}
+                actual = {movie["movieId"] for movie in results["index"][key].get("movies", [])}
+                if expected != actual:
+                    self.stderr.write(f"{key}: {len(expected ^ actual)} movies differ between backends")
+        finally:
+            local_sparql.endpoint = original
+            if endpoint:
+                endpoint.stop()
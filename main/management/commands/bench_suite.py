@@ -0,0 +1,173 @@
+import json
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+
+from main.benchmark.endpoint import FakeSparqlEndpoint
+from main.benchmark.fixtures import FixtureStore
+from main.utils.image import clear_image_memo
+from main.utils.search_index import SORT_FIELDS, MovieSearchIndex
+from main.utils.sparql import EmbeddedSparqlClient, local_sparql, wikidata_sparql
+from main.utils.timing import collect_queries
+from main.views import get_movie_details, search_movies
+
+SELECTIVE_QUERY = "star"
+CURSOR_PAGES = 10
+
+
+def percentile(timings, pct):
+    ordered = sorted(timings)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark pencarian dan halaman detail film terhadap endpoint SPARQL tiruan yang "
+        "memutar ulang respons rekaman (--record untuk merekam dari GraphDB dan Wikidata asli)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fixtures", default=str(settings.BASE_DIR / "benchmarks" / "fixtures.json"))
+        parser.add_argument(
+            "--record", action="store_true",
+            help="Jalankan terhadap GRAPHDB_URL dan WIKIDATA_URL asli lalu simpan responsnya ke --fixtures",
+        )
+        parser.add_argument("--local-latency", type=float, default=0.005, help="Latency lokal tiruan (detik)")
+        parser.add_argument("--wikidata-latency", type=float, default=0.1, help="Latency Wikidata tiruan (detik)")
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--movies", type=int, default=5, help="Jumlah film untuk benchmark halaman detail")
+        parser.add_argument("--output", help="Tulis hasil dalam JSON ke file ini")
+
+    def measure(self, func, repeat):
+        timings = []
+        queries = []
+        for _ in range(repeat):
+            with collect_queries() as recorded:
+                start = time.perf_counter()
+                func()
+                timings.append(time.perf_counter() - start)
+            queries.append(len(recorded))
+        return {
+            "samples": len(timings),
+            "p50_ms": round(statistics.median(timings) * 1000, 2),
+            "p95_ms": round(percentile(timings, 95) * 1000, 2),
+            "mean_ms": round(statistics.mean(timings) * 1000, 2),
+            "queries": round(statistics.mean(queries), 1),
+        }
+
+    def search(self, **params):
+        response = search_movies(self.factory.get("/search", params))
+        if response.status_code != 200:
+            raise CommandError(f"Pencarian {params} gagal: {response.content[:200]!r}")
+        return json.loads(response.content)
+
+    def walk_cursor(self, sort):
+        page = self.search(movie="", sort=sort)
+        for _ in range(CURSOR_PAGES - 1):
+            if not page.get("nextCursor"):
+                break
+            page = self.search(movie="", sort=sort, cursor=page["nextCursor"])
+
+    def detail(self, movie_id):
+        response = get_movie_details(self.factory.get(f"/movie/{movie_id}/"), uri=movie_id)
+        if response.status_code != 200:
+            raise CommandError(f"Detail {movie_id} gagal: {response.content[:200]!r}")
+
+    def details_cold(self, movie_ids):
+        for movie_id in movie_ids:
+            clear_image_memo()
+            self.detail(movie_id)
+
+    def run_suite(self, options):
+        repeat = options["repeat"]
+        results = {}
+        with override_settings(SPARQL_CACHE_ENABLED=False, SEARCH_CACHE_ENABLED=False):
+            results["search:index_build"] = self.measure(MovieSearchIndex.from_store, 1)
+
+            for sort in SORT_FIELDS:
+                results[f"search:{sort}:empty"] = self.measure(lambda: self.search(movie="", sort=sort), repeat)
+                results[f"search:{sort}:selective"] = self.measure(
+                    lambda: self.search(movie=SELECTIVE_QUERY, sort=sort), repeat
+                )
+            results["search:deep_page"] = self.measure(
+                lambda: self.search(movie="", page=settings.SEARCH_MAX_PAGE), repeat
+            )
+            results[f"search:cursor_walk_{CURSOR_PAGES}"] = self.measure(lambda: self.walk_cursor("rating"), repeat)
+
+            top = self.search(movie="", sort="rating")["movies"][:options["movies"]]
+            movie_ids = [movie["movieId"] for movie in top]
+            results["detail:cold"] = self.measure(lambda: self.details_cold(movie_ids), repeat)
+            results["detail:cold"]["movies"] = len(movie_ids)
+
+        with tempfile.TemporaryDirectory() as tmp, \
+                override_settings(SPARQL_CACHE_ENABLED=True, SPARQL_CACHE_PATH=f"{tmp}/sparql.sqlite3"):
+            # Satu putaran mengisi cache, putaran berikutnya yang diukur
+            for movie_id in movie_ids:
+                self.detail(movie_id)
+            results["detail:warm"] = self.measure(lambda: [self.detail(movie_id) for movie_id in movie_ids], repeat)
+            results["detail:warm"]["movies"] = len(movie_ids)
+        return results
+
+    def handle(self, *args, **options):
+        if isinstance(local_sparql, EmbeddedSparqlClient) or isinstance(wikidata_sparql, EmbeddedSparqlClient):
+            raise CommandError("Benchmark membutuhkan endpoint HTTP, jalankan dengan LOCAL_SPARQL_BACKEND=graphdb")
+
+        store = FixtureStore(options["fixtures"])
+        if options["record"]:
+            local_responder = store.recorder("local", local_sparql.endpoint)
+            wikidata_responder = store.recorder("wikidata", wikidata_sparql.endpoint)
+            latencies = (0.0, 0.0)
+            options["repeat"] = 1
+        else:
+            if not store.queries:
+                raise CommandError(f"Fixture {options['fixtures']} kosong, rekam dulu dengan --record")
+            local_responder = store.replayer("local")
+            wikidata_responder = store.replayer("wikidata")
+            latencies = (options["local_latency"], options["wikidata_latency"])
+
+        self.factory = RequestFactory()
+        with FakeSparqlEndpoint(local_responder, latencies[0]) as local, \
+                FakeSparqlEndpoint(wikidata_responder, latencies[1]) as wikidata:
+            original = (local_sparql.endpoint, wikidata_sparql.endpoint)
+            local_sparql.endpoint = local.url
+            wikidata_sparql.endpoint = wikidata.url
+            try:
+                results = self.run_suite(options)
+            finally:
+                local_sparql.endpoint, wikidata_sparql.endpoint = original
+
+        if options["record"]:
+            store.save()
+            self.stdout.write(f"{len(store.queries)} responses recorded to {options['fixtures']}")
+
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<36} p50 {result['p50_ms']:9.1f}ms  p95 {result['p95_ms']:9.1f}ms  "
+                f"{result['queries']:6.1f} queries"
+            )
+        for endpoint, misses in store.misses.items():
+            self.stderr.write(f"{misses} {endpoint} queries missing from fixtures (answered empty)")
+
+        if options["output"]:
+            report = {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "python": platform.python_version(),
+                "mode": "record" if options["record"] else "replay",
+                "latency": {"local": latencies[0], "wikidata": latencies[1]},
+                "settings": {
+                    "SEARCH_BACKEND": settings.SEARCH_BACKEND,
+                    "ENRICHMENT_MAX_WORKERS": settings.ENRICHMENT_MAX_WORKERS,
+                    "SPARQL_POOL_SIZE": settings.SPARQL_POOL_SIZE,
+                },
+                "results": results,
+                "replayMisses": store.misses,
+            }
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
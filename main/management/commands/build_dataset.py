@@ -0,0 +1,51 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.utils.rdf_build import SOURCES, build_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Membangun file RDF dataset dari CSV IMDb dan Hollywood (hasil reconcile_wikidata/harvest_posters), "
+        "pengganti imdb_preproc.ipynb dan hollywood_preproc.ipynb"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--imdb", default=str(settings.BASE_DIR / "imdb_top_1000_with_wikidata.csv"), help="CSV IMDb",
+        )
+        parser.add_argument(
+            "--hollywood",
+            default=str(settings.BASE_DIR / "highest_holywood_grossing_movies_with_wikidata_with_posters.csv"),
+            help="CSV Hollywood",
+        )
+        parser.add_argument("--output", default=str(settings.RDF_DATA_PATH))
+        parser.add_argument("--format", choices=["turtle", "nt"], help="Default: dari ekstensi --output")
+        parser.add_argument("--chunksize", type=int, default=5000, help="Jumlah baris CSV per chunk")
+
+    def handle(self, *args, **options):
+        inputs = []
+        for source in SOURCES:
+            path = options[source]
+            if not os.path.exists(path):
+                self.stderr.write(f"{source}: {path} not found, skipped")
+                continue
+            inputs.append((source, path))
+        if not inputs:
+            raise CommandError("Tidak ada CSV sumber yang ditemukan")
+
+        fmt = options["format"] or ("nt" if options["output"].endswith(".nt") else "turtle")
+        start = time.perf_counter()
+
+        def progress(source, rows, triples):
+            self.stdout.write(f"{source}: {rows} rows, {triples} triples")
+
+        rows, triples = build_dataset(inputs, options["output"], fmt, options["chunksize"], progress)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f"Wrote {triples} triples from {rows} rows to {options['output']} in {elapsed:.2f}s "
+            f"({rows / elapsed:.0f} rows/s)"
+        )
@@ -0,0 +1,215 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from html.parser import HTMLParser
+import json
+import os
+import time
+from urllib.parse import urljoin
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from main.utils.http_fetch import ConditionalCache, Fetcher
+
+WIKIDATA_ENTITY = "http://www.wikidata.org/entity/"
+ENTITY_DATA_URL = "https://www.wikidata.org/wiki/Special:EntityData/{id}.json"
+
+
+class _PosterFound(Exception):
+    pass
+
+
+class PosterParser(HTMLParser):
+    """
+    Mengambil src <img> pertama di dalam <table> pertama (infobox), sama
+    seperti poster_scrapper.ipynb. Parsing dihentikan begitu gambar ketemu
+    atau tabel pertama selesai, sisa halaman tidak diproses.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.depth = 0
+        self.src = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            self.depth += 1
+        elif tag == "img" and self.depth:
+            self.src = dict(attrs).get("src")
+            raise _PosterFound
+
+    def handle_endtag(self, tag):
+        if tag == "table" and self.depth:
+            self.depth -= 1
+            if not self.depth:
+                raise _PosterFound
+
+
+def find_poster(html, page_url):
+    parser = PosterParser()
+    try:
+        parser.feed(html)
+    except _PosterFound:
+        pass
+    # src di Wikipedia berbentuk //upload.wikimedia.org/..., dijadikan URL lengkap
+    return urljoin(page_url, parser.src) if parser.src else None
+
+
+def normalize_entity(value):
+    value = str(value).strip()
+    if value.startswith("https://www.wikidata.org/wiki/"):
+        value = WIKIDATA_ENTITY + value.rsplit("/", 1)[-1]
+    return value if value.startswith(WIKIDATA_ENTITY) else None
+
+
+def plan_fetches(df, title_column, id_column, poster_column):
+    """
+    Menentukan entity Wikidata untuk setiap baris dan mengumpulkan entity
+    unik yang posternya belum ada. Baris tanpa wikidata_id memakai entity
+    dari baris lain dengan judul yang sama.
+    """
+    entity_by_title = {}
+    entities = []
+    for title, value in zip(df[title_column], df[id_column]):
+        entity = normalize_entity(value)
+        if entity:
+            entity_by_title.setdefault(title, entity)
+        entities.append(entity)
+    entities = [entity or entity_by_title.get(title) for entity, title in zip(entities, df[title_column])]
+
+    known = {}
+    for entity, poster in zip(entities, df[poster_column]):
+        if entity and poster:
+            known.setdefault(entity, poster)
+    pending = list(dict.fromkeys(entity for entity in entities if entity and entity not in known))
+    return entities, known, pending
+
+
+class ResultLog:
+    # Hasil per entity ditulis (dan di-fsync) satu baris JSON begitu selesai
+    def __init__(self, path):
+        self.path = path
+        self.results = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue   # baris terakhir terpotong saat crash
+                    self.results[entry["wikidata_id"]] = entry["poster"]
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.file = open(path, "a", encoding="utf-8")
+        # Baris terpotong ditutup dulu agar hasil baru tidak tersambung ke baris itu
+        if self.file.tell() and not self._ends_with_newline(path):
+            self.file.write("\n")
+
+    @staticmethod
+    def _ends_with_newline(path):
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def write(self, entity, poster, page):
+        self.results[entity] = poster
+        self.file.write(json.dumps({"wikidata_id": entity, "poster": poster, "page": page}) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
+
+
+class Command(BaseCommand):
+    help = "Mencari link poster film dari infobox Wikipedia berdasarkan wikidata_id (pengganti poster_scrapper.ipynb)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--input", default=str(settings.BASE_DIR / "highest_holywood_grossing_movies_with_wikidata.csv"),
+            help="CSV hasil reconcile_wikidata",
+        )
+        parser.add_argument("--output", help="Default: <input>_with_posters.csv")
+        parser.add_argument("--results", help="Log hasil JSONL untuk melanjutkan run, default: <output>.jsonl")
+        parser.add_argument("--title-column", default="Title")
+        parser.add_argument("--id-column", default="wikidata_id")
+        parser.add_argument("--poster-column", default="Poster Link")
+        parser.add_argument("--entity-data-url", default=ENTITY_DATA_URL, help="Template URL JSON entity, {id}=Q-id")
+        parser.add_argument("--http-cache", default=str(settings.BASE_DIR / "cache" / "posters_http.sqlite3"))
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument("--rate", type=float, default=5.0, help="Maksimal request per detik per host")
+        parser.add_argument("--retries", type=int, default=2)
+
+    def harvest(self, entity):
+        # Wikipedia bahasa Inggris dulu, lalu sitelink lain sampai ada poster
+        entity_id = entity.removeprefix(WIKIDATA_ENTITY)
+        content, _ = self.fetcher.get(self.entity_data_url.format(id=entity_id))
+        sitelinks = json.loads(content)["entities"][entity_id]["sitelinks"]
+        pages = sorted(sitelinks.values(), key=lambda link: link["site"] != "enwiki")
+        for link in pages:
+            if "url" not in link:
+                continue
+            html, _ = self.fetcher.get(link["url"])
+            poster = find_poster(html.decode("utf-8", errors="replace"), link["url"])
+            if poster:
+                return poster, link["url"]
+        return None, None
+
+    def handle(self, *args, **options):
+        df = pd.read_csv(options["input"], dtype=str, keep_default_na=False)
+        df = df.drop(columns=["Unnamed: 0"], errors="ignore")
+        for column in (options["title_column"], options["id_column"]):
+            if column not in df.columns:
+                raise CommandError(f"Kolom {column} tidak ada di {options['input']}")
+        if options["poster_column"] not in df.columns:
+            df[options["poster_column"]] = ""
+
+        output = options["output"] or f"{os.path.splitext(options['input'])[0]}_with_posters.csv"
+        log = ResultLog(options["results"] or f"{output}.jsonl")
+        entities, known, pending = plan_fetches(
+            df, options["title_column"], options["id_column"], options["poster_column"]
+        )
+        pending = [entity for entity in pending if entity not in log.results]
+        self.stdout.write(
+            f"{len(df)} rows, {len(set(filter(None, entities)))} unique films, {len(known)} with posters, "
+            f"{len(log.results)} from previous runs, {len(pending)} to fetch"
+        )
+
+        self.entity_data_url = options["entity_data_url"]
+        cache = ConditionalCache(options["http_cache"]) if options["http_cache"] else None
+        self.fetcher = Fetcher(rate=options["rate"], cache=cache, retries=options["retries"])
+
+        failed = 0
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+                futures = {executor.submit(self.harvest, entity): entity for entity in pending}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    entity = futures[future]
+                    try:
+                        poster, page = future.result()
+                    except Exception as e:
+                        # Tidak dicatat di log, jadi dicoba lagi di run berikutnya
+                        failed += 1
+                        self.stderr.write(f"[{done}/{len(pending)}] {entity} failed: {e}")
+                        continue
+                    log.write(entity, poster, page)
+                    self.stdout.write(f"[{done}/{len(pending)}] {entity}: {poster}")
+        finally:
+            log.close()
+
+        found = {**log.results, **known}
+        df[options["id_column"]] = [entity or value for entity, value in zip(entities, df[options["id_column"]])]
+        df[options["poster_column"]] = [
+            poster or found.get(entity) or "" for entity, poster in zip(entities, df[options["poster_column"]])
+        ]
+        tmp_output = f"{output}.tmp"
+        df.to_csv(tmp_output, index=False)
+        os.replace(tmp_output, output)
+
+        elapsed = time.perf_counter() - start
+        stats = self.fetcher.stats
+        self.stdout.write(
+            f"Wrote {output}: {sum(1 for value in df[options['poster_column']] if value)}/{len(df)} rows with "
+            f"posters in {elapsed:.1f}s ({stats['requests']} requests, {stats['not_modified']} not modified, "
+            f"{failed} failed)"
+        )
@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from rdflib import Graph
+
+from main.utils.sparql import SparqlClient, chunked, local_sparql
+
+# Properti film -> item yang dipakai halaman detail, beserta gambar itemnya
+ITEM_PROPERTIES = [
+    "P161",   # cast
+    "P57",    # director
+    "P58",    # screenwriter
+    "P750",   # distributor
+    "P495",   # country of origin
+    "P166",   # award received
+    "P915",   # filming location
+    "P344", "P1040", "P2554", "P2515", "P86", "P162",   # crew
+]
+
+
+def build_harvest_query(movie_uris):
+    films = " ".join(f"wd:{uri.split('/')[-1]}" for uri in movie_uris)
+    properties = " ".join(f"wdt:{prop}" for prop in ITEM_PROPERTIES)
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX p: <http://www.wikidata.org/prop/>
+    PREFIX ps: <http://www.wikidata.org/prop/statement/>
+    PREFIX pq: <http://www.wikidata.org/prop/qualifier/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    CONSTRUCT {{
+        ?film wdt:P31 ?type .
+        ?film rdfs:label ?filmLabel .
+        ?film ?property ?item .
+        ?item rdfs:label ?label .
+        ?item wdt:P18 ?image .
+        ?item wdt:P154 ?logo .
+        ?item wdt:P41 ?flag .
+        ?film p:P58 ?screenwriterStatement .
+        ?screenwriterStatement ps:P58 ?item .
+        ?film p:P444 ?reviewStatement .
+        ?reviewStatement ps:P444 ?score .
+        ?reviewStatement pq:P447 ?reviewer .
+        ?reviewer rdfs:label ?reviewerLabel .
+    }}
+    WHERE {{
+        VALUES ?film {{ {films} }}
+        {{
+            ?film wdt:P31 ?type .
+            OPTIONAL {{ ?film rdfs:label ?filmLabel. FILTER(LANG(?filmLabel) = "en") }}
+        }}
+        UNION
+        {{
+            VALUES ?property {{ {properties} }}
+            ?film ?property ?item .
+            OPTIONAL {{ ?item rdfs:label ?label. FILTER(LANG(?label) = "en") }}
+            OPTIONAL {{ ?item wdt:P18 ?image. }}
+            OPTIONAL {{ ?item wdt:P154 ?logo. }}
+            OPTIONAL {{ ?item wdt:P41 ?flag. }}
+        }}
+        UNION
+        {{
+            ?film p:P58 ?screenwriterStatement .
+            ?screenwriterStatement ps:P58 ?item .
+        }}
+        UNION
+        {{
+            ?film p:P444 ?reviewStatement .
+            ?reviewStatement ps:P444 ?score .
+            OPTIONAL {{
+                ?reviewStatement pq:P447 ?reviewer .
+                OPTIONAL {{ ?reviewer rdfs:label ?reviewerLabel. FILTER(LANG(?reviewerLabel) = "en") }}
+            }}
+        }}
+    }}
+    """
+
+
+class Command(BaseCommand):
+    help = "Mengambil semua data Wikidata yang dipakai aplikasi untuk setiap film lokal ke file Turtle"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=str(settings.WIKIDATA_SNAPSHOT_PATH))
+        parser.add_argument("--batch-size", type=int, default=25)
+        parser.add_argument("--workers", type=int, default=2)
+
+    def fetch_movie_uris(self):
+        results = local_sparql.query("""
+        PREFIX : <http://nama-kelompok.org/data/>
+        PREFIX v: <http://nama-kelompok.org/vocab#>
+
+        SELECT DISTINCT ?wikidataUri WHERE {
+            ?movie a :Movie ;
+                v:wikidataUri ?wikidataUri .
+        }
+        """)
+        return sorted(
+            binding["wikidataUri"]["value"]
+            for binding in results["results"]["bindings"]
+            if binding["wikidataUri"]["value"].startswith("http://www.wikidata.org/entity/")
+        )
+
+    def handle(self, *args, **options):
+        # Selalu ke Wikidata publik, apa pun nilai WIKIDATA_SOURCE
+        wikidata = SparqlClient("wikidata-harvest", settings.WIKIDATA_URL)
+        movie_uris = self.fetch_movie_uris()
+        batches = list(chunked(movie_uris, options["batch_size"]))
+        self.stdout.write(f"Harvesting {len(movie_uris)} films in {len(batches)} batches")
+
+        snapshot = Graph()
+        snapshot.bind("wd", "http://www.wikidata.org/entity/")
+        snapshot.bind("wdt", "http://www.wikidata.org/prop/direct/")
+        snapshot.bind("p", "http://www.wikidata.org/prop/")
+        snapshot.bind("ps", "http://www.wikidata.org/prop/statement/")
+        snapshot.bind("pq", "http://www.wikidata.org/prop/qualifier/")
+
+        failed = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = {
+                executor.submit(wikidata.construct, build_harvest_query(batch)): batch
+                for batch in batches
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    snapshot += future.result()
+                except Exception as e:
+                    failed += 1
+                    self.stderr.write(f"Batch starting at {futures[future][0]} failed: {e}")
+                self.stdout.write(f"[{done}/{len(batches)}] {len(snapshot)} triples")
+
+        snapshot.serialize(destination=options["output"], format="turtle")
+        self.stdout.write(
+            f"Wrote {len(snapshot)} triples to {options['output']} "
+            f"in {time.perf_counter() - start:.1f}s ({failed} failed batches)"
+        )
@@ -0,0 +1,97 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.utils.dataset_loader import (
+    DatasetState, GraphDBLoader, canonical_ntriples, combined_version, dataset_graphs, diff_sorted, file_digest,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Memuat NamaKelompok_RDF.ttl (dan snapshot Wikidata) ke GraphDB secara inkremental: hanya triple yang "
+        "berubah sejak versi terakhir yang dihapus/ditambahkan, tidak ada yang dimuat jika file tidak berubah"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wait", type=float, default=0, help="Tunggu GraphDB siap sampai N detik")
+        parser.add_argument("--batch-size", type=int, default=settings.DATASET_LOAD_BATCH_SIZE)
+        parser.add_argument(
+            "--max-delta", type=float, default=0.5,
+            help="Jika perubahan melebihi fraksi ini dari jumlah triple, graph diganti seluruhnya",
+        )
+        parser.add_argument("--force", action="store_true", help="Muat ulang penuh semua graph")
+
+    def load_graph(self, loader, state, key, graph, path, trusted, force):
+        # Mengembalikan (info graph untuk stamp, baris kanonik atau None jika tidak berubah)
+        digest = file_digest(path)
+        previous = state.graph(key) if trusted and not force else None
+        if previous and previous["file"] == digest:
+            self.stdout.write(f"{key}: {path} unchanged ({previous['triples']} triples)")
+            return previous, None
+
+        start = time.perf_counter()
+        lines = canonical_ntriples(path)
+        version = hashlib.sha1("\n".join(lines).encode("utf-8")).hexdigest()[:12]
+        info = {"graph": graph, "file": digest, "version": version, "triples": len(lines)}
+        old_lines = state.lines(key) if previous else None
+
+        if previous and previous["version"] == version:
+            self.stdout.write(f"{key}: file changed but triples are identical")
+        elif old_lines is None:
+            loader.replace(graph, lines)
+            self.stdout.write(f"{key}: full load of {len(lines)} triples in {time.perf_counter() - start:.1f}s")
+        else:
+            removed, added = diff_sorted(old_lines, lines)
+            if len(removed) + len(added) > len(lines) * self.max_delta:
+                loader.replace(graph, lines)
+                mode = "full load"
+            else:
+                loader.apply(graph, removed, added)
+                mode = "delta"
+            self.stdout.write(
+                f"{key}: {mode}, -{len(removed)} +{len(added)} triples in {time.perf_counter() - start:.1f}s"
+            )
+        return info, lines
+
+    def handle(self, *args, **options):
+        self.max_delta = options["max_delta"]
+        state = DatasetState(settings.DATASET_STATE_DIR)
+        loader = GraphDBLoader(settings.GRAPHDB_URL, options["batch_size"])
+        if options["wait"]:
+            loader.wait_until_ready(options["wait"])
+
+        # State lokal hanya dipercaya jika cocok dengan versi yang tercatat di GraphDB
+        # (mis. volume GraphDB dihapus atau load sebelumnya terputus)
+        loaded_version = loader.loaded_version()
+        trusted = bool(state.stamp) and loaded_version == state.stamp.get("version")
+        if not trusted:
+            self.stdout.write(
+                f"GraphDB has version {loaded_version or 'none'}, local state has "
+                f"{state.stamp.get('version') or 'none'}: loading everything"
+            )
+
+        graphs = {}
+        changed = {}
+        for key, graph, path in dataset_graphs():
+            info, lines = self.load_graph(loader, state, key, graph, path, trusted, options["force"])
+            graphs[key] = info
+            if lines is not None:
+                changed[key] = lines
+
+        # Graph yang filenya sudah tidak ada (mis. snapshot dihapus) dikosongkan
+        for key, info in (state.stamp.get("graphs", {}) if trusted else {}).items():
+            if key not in graphs and info.get("graph"):
+                loader.replace(info["graph"], [])
+                changed[key] = []
+                self.stdout.write(f"{key}: source removed, graph {info['graph']} cleared")
+
+        version = combined_version({key: info["version"] for key, info in graphs.items()})
+        if trusted and not changed:
+            self.stdout.write(f"Dataset unchanged (version {version}), nothing loaded")
+            return
+        loader.set_loaded_version(version)
+        state.save(graphs, changed)
+        self.stdout.write(f"Dataset version {version} loaded")
@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from main.benchmark.endpoint import FakeSparqlEndpoint
+from main.management.commands.bench_enrichment import MOVIE_URI, local_responder
+from main.utils.sparql import local_sparql, wikidata_sparql
+
+
+class Command(BaseCommand):
+    help = "Uji beban halaman detail film: view sync (WSGI, thread) dibandingkan view async (ASGI, satu event loop)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=200, help="Jumlah request per mode")
+        parser.add_argument("--threads", type=int, default=8, help="Jumlah thread worker WSGI")
+        parser.add_argument("--latency", type=float, default=0.2, help="Latency Wikidata tiruan per query (detik)")
+        parser.add_argument("--pool", type=int, default=100, help="Batas koneksi SPARQL bersamaan untuk mode async")
+
+    def run_sync(self, total, threads):
+        url = reverse("main:movie_detail_sync", kwargs={"uri": MOVIE_URI})
+
+        def worker(_):
+            return Client().get(url).status_code
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(worker, range(total)))
+
+    async def run_async(self, total):
+        url = reverse("main:movie_detail_async", kwargs={"uri": MOVIE_URI})
+        client = AsyncClient()
+        responses = await asyncio.gather(*(client.get(url) for _ in range(total)))
+        return [response.status_code for response in responses]
+
+    def report(self, label, statuses, elapsed):
+        failed = sum(1 for status in statuses if status != 200)
+        self.stdout.write(
+            f"{label:<12} {len(statuses)} requests in {elapsed:.2f}s "
+            f"= {len(statuses) / elapsed:7.1f} req/s ({failed} failed)"
+        )
+
+    def handle(self, *args, **options):
+        total = options["requests"]
+        with FakeSparqlEndpoint(local_responder) as local, \
+                FakeSparqlEndpoint(latency=options["latency"]) as wikidata:
+            original = (local_sparql.endpoint, wikidata_sparql.endpoint)
+            local_sparql.endpoint = local.url
+            wikidata_sparql.endpoint = wikidata.url
+            try:
+                # Cache dimatikan agar setiap request benar-benar menunggu endpoint
+                with override_settings(SPARQL_CACHE_ENABLED=False):
+                    start = time.perf_counter()
+                    statuses = self.run_sync(total, options["threads"])
+                    self.report(f"sync x{options['threads']}", statuses, time.perf_counter() - start)
+
+                    with override_settings(SPARQL_POOL_SIZE=options["pool"]):
+                        start = time.perf_counter()
+                        statuses = asyncio.run(self.run_async(total))
+                        self.report("async", statuses, time.perf_counter() - start)
+            finally:
+                local_sparql.endpoint, wikidata_sparql.endpoint = original
@@ -0,0 +1,176 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import unquote
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from main.utils.build import detail_templates, files_fingerprint
+from main.utils.http_cache import wikidata_window
+from main.utils.movie import fetch_movies
+from main.utils.search import PREFIXES
+from main.utils.sparql import chunked, local_sparql
+from main.views import build_movie_documents
+
+DATA = "http://nama-kelompok.org/data/"
+
+MOVIE_IDS_QUERY = f"""{PREFIXES}
+    SELECT DISTINCT ?movieId WHERE {{ ?movieId rdf:type :Movie . }}
+"""
+
+def fingerprint(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def page_path(uri):
+    # /movie/<id>/index.html, dilayani WhiteNoise (WHITENOISE_INDEX_FILE) di URL /movie/<id>/
+    url = reverse("main:movie_detail", kwargs={"uri": uri.removeprefix(DATA)})
+    return f"{unquote(url).strip('/')}/index.html"
+
+
+class Command(BaseCommand):
+    help = (
+        "Merender detail_movie.html untuk setiap :Movie ke direktori statis (untuk WhiteNoise atau CDN). "
+        "Dengan --incremental hanya film yang triple sumbernya atau enrichment Wikidata-nya berubah yang dirender ulang"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default=settings.PRERENDER_DIR)
+        parser.add_argument("--manifest", default=settings.PRERENDER_MANIFEST_PATH)
+        parser.add_argument("--incremental", action="store_true")
+        parser.add_argument("--workers", type=int, default=4, help="Jumlah batch film yang diproses bersamaan")
+        parser.add_argument("--batch-size", type=int, default=settings.MOVIE_BATCH_SIZE)
+
+    def load_manifest(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            print(f"Error reading prerender manifest {path}: {e}")
+            return {}
+
+    def save_manifest(self, path, manifest):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def write_page(self, path, html):
+        path = Path(self.output) / path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(html, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def is_fresh(self, entry, source):
+        # Triple sumber sama dan enrichment masih dari jendela cache Wikidata
+        # yang sama (seperti ETag halaman detail): halaman tidak berubah
+        return (
+            entry is not None and entry["source"] == source and entry["window"] == self.window
+            and (Path(self.output) / entry["path"]).exists()
+        )
+
+    def render_batch(self, movies, previous):
+        # Mengembalikan {uri: entry manifest baru atau None jika gagal} dan jumlah halaman yang ditulis
+        entries, written = {}, 0
+        sources = {uri: fingerprint(movie) for uri, movie in movies.items()}
+        documents = build_movie_documents(movies)
+        for uri, document in documents.items():
+            if document["section_errors"]:
+                # Halaman yang section-nya gagal tidak ditulis, request tetap ke view
+                # (atau halaman lama) dan film ini dicoba lagi pada build berikutnya
+                entries[uri] = None
+                continue
+            entry = {
+                "path": page_path(uri), "source": sources[uri], "window": self.window,
+                "document": fingerprint(document),
+            }
+            old = previous.get(uri)
+            if not (old and old["document"] == entry["document"] and old["path"] == entry["path"]
+                    and (Path(self.output) / old["path"]).exists()):
+                self.write_page(entry["path"], render_to_string("detail_movie.html", {"movie": document}))
+                written += 1
+            entries[uri] = entry
+        return entries, written
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        self.output = options["output"]
+        self.window = wikidata_window(settings.HTTP_CACHE_POLICIES["detail"])
+
+        manifest = self.load_manifest(options["manifest"])
+        # Perubahan template detail membuat semua halaman dirender ulang
+        templates = files_fingerprint(detail_templates())
+        incremental = options["incremental"] and manifest.get("templates") == templates
+        if options["incremental"] and not incremental:
+            self.stdout.write("Templates changed since the last build, rendering everything")
+        previous = manifest.get("movies", {}) if incremental else {}
+
+        uris = sorted(
+            binding["movieId"]["value"]
+            for binding in local_sparql.query(MOVIE_IDS_QUERY, label="prerender:movies")["results"]["bindings"]
+        )
+        movies = fetch_movies(uris)
+        self.stdout.write(f"{len(movies)} movies in the local store, local data fetched in {time.perf_counter() - start:.1f}s")
+
+        entries = {}
+        stale = {}
+        for uri, movie in movies.items():
+            entry = previous.get(uri)
+            if self.is_fresh(entry, fingerprint(movie)):
+                entries[uri] = entry
+            else:
+                stale[uri] = movie
+        if incremental:
+            self.stdout.write(f"{len(entries)} pages up to date, {len(stale)} to rebuild")
+
+        render_start = time.perf_counter()
+        batches = [dict((uri, stale[uri]) for uri in batch) for batch in chunked(list(stale), options["batch_size"])]
+        rendered = written = failed = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = {executor.submit(self.render_batch, batch, previous): batch for batch in batches}
+            for done, future in enumerate(as_completed(futures), start=1):
+                batch = futures[future]
+                try:
+                    batch_entries, batch_written = future.result()
+                except Exception as e:
+                    print(f"Error rendering batch of {len(batch)} movies: {e}")
+                    batch_entries, batch_written = {uri: None for uri in batch}, 0
+                for uri, entry in batch_entries.items():
+                    if entry is None:
+                        failed += 1
+                        # Halaman lama (jika ada) tetap dipakai sampai berhasil dirender ulang
+                        if uri in previous:
+                            entries[uri] = dict(previous[uri], window=None)
+                    else:
+                        rendered += 1
+                        entries[uri] = entry
+                written += batch_written
+                self.stdout.write(f"  [{done}/{len(batches)}] {rendered} rendered, {failed} failed")
+        render_time = time.perf_counter() - render_start
+
+        # Halaman film yang sudah tidak ada di store dihapus
+        removed = 0
+        for uri, entry in manifest.get("movies", {}).items():
+            if uri not in movies:
+                page_dir = (Path(self.output) / entry["path"]).parent
+                shutil.rmtree(page_dir, ignore_errors=True)
+                removed += 1
+
+        self.save_manifest(options["manifest"], {"templates": templates, "movies": entries})
+        total = time.perf_counter() - start
+        self.stdout.write(
+            f"Rendered {rendered} pages ({written} written, {rendered - written} unchanged), "
+            f"{len(movies) - len(stale)} skipped, {failed} failed, {removed} removed in {total:.1f}s "
+            f"({rendered / render_time if render_time else 0:.1f} pages/s) into {self.output}"
+        )
@@ -0,0 +1,220 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import sqlite3
+import time
+
+import pandas as pd
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from main.utils.http_fetch import RateLimiter
+from main.utils.sparql import SparqlClient, chunked, escape_literal
+
+# Nama sumber -> (file CSV, kolom judul, kolom tahun), sama seperti scrapper.py
+SOURCES = {
+    "imdb": ("imdb_top_1000.csv", "Series_Title", "Released_Year"),
+    "hollywood": ("highest_holywood_grossing_movies.csv", "Title", "Year"),
+}
+
+FILM_TYPES_QUERY = """
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+
+    SELECT DISTINCT ?type WHERE {
+        ?type wdt:P279* wd:Q11424 .
+    }
+"""
+
+
+def build_match_query(titles):
+    # Label persis (bahasa Inggris) lewat VALUES, tanpa REGEX per baris.
+    # Tipe film dan tahun rilis dicocokkan di Python
+    values = " ".join(f'"{escape_literal(title)}"@en' for title in titles)
+    return f"""
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?label ?id ?type ?date WHERE {{
+        VALUES ?label {{ {values} }}
+        ?id rdfs:label ?label ;
+            wdt:P31 ?type ;
+            wdt:P577 ?date .
+    }}
+    """
+
+
+def parse_year(value):
+    value = str(value).strip()
+    if value.endswith(".0"):
+        value = value[:-2]
+    return int(value) if value.isdigit() else None
+
+
+def entity_number(uri):
+    # Q-id terkecil dipakai jika ada beberapa kandidat (biasanya item utama)
+    suffix = uri.rsplit("/Q", 1)[-1]
+    return int(suffix) if suffix.isdigit() else float("inf")
+
+
+def pick_matches(bindings, film_types, rows):
+    """
+    rows berisi (judul, tahun) per baris. Hasil: baris -> URI Wikidata atau
+    None, dengan syarat item berjenis film (atau subclass-nya) dan, jika
+    tahun diketahui, dirilis pada tahun tersebut.
+    """
+    candidates = {}
+    for binding in bindings:
+        if binding["type"]["value"] not in film_types:
+            continue
+        title = binding["label"]["value"]
+        candidates.setdefault(title, {}).setdefault(binding["id"]["value"], set()).add(
+            binding["date"]["value"][:4].lstrip("+")
+        )
+
+    matches = {}
+    for row, (title, year) in rows.items():
+        items = candidates.get(title, {})
+        ids = [uri for uri, years in items.items() if year is None or str(year) in years]
+        matches[row] = min(ids, key=entity_number) if ids else None
+    return matches
+
+
+class Checkpoint:
+    """
+    Hasil per baris disimpan di SQLite dan di-commit setiap batch, jadi run
+    yang terhenti dilanjutkan tepat dari baris yang belum selesai. Daftar
+    subclass film juga disimpan agar tidak dihitung ulang.
+    """
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS matches ("
+                "source TEXT, row INTEGER, title TEXT, wikidata_id TEXT, PRIMARY KEY (source, row))"
+            )
+            self.conn.execute("CREATE TABLE IF NOT EXISTS film_types (uri TEXT PRIMARY KEY)")
+
+    def done_rows(self, source):
+        return {row for (row,) in self.conn.execute("SELECT row FROM matches WHERE source = ?", (source,))}
+
+    def matches(self, source):
+        return dict(self.conn.execute("SELECT row, wikidata_id FROM matches WHERE source = ?", (source,)))
+
+    def save(self, source, titles, matches):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO matches (source, row, title, wikidata_id) VALUES (?, ?, ?, ?)",
+                [(source, row, titles[row], uri) for row, uri in matches.items()],
+            )
+
+    def film_types(self):
+        return {uri for (uri,) in self.conn.execute("SELECT uri FROM film_types")}
+
+    def save_film_types(self, film_types):
+        with self.conn:
+            self.conn.execute("DELETE FROM film_types")
+            self.conn.executemany("INSERT INTO film_types (uri) VALUES (?)", [(uri,) for uri in film_types])
+
+
+class Command(BaseCommand):
+    help = "Mencocokkan judul film di CSV IMDb dan Hollywood ke item Wikidata (pengganti scrapper.py)"
+
+    def add_arguments(self, parser):
+        for source, (filename, _, _) in SOURCES.items():
+            parser.add_argument(f"--{source}", default=str(settings.BASE_DIR / filename), help=f"CSV {source}")
+        parser.add_argument("--checkpoint", default=str(settings.BASE_DIR / "cache" / "reconcile.sqlite3"))
+        parser.add_argument("--batch-size", type=int, default=50, help="Jumlah judul per query VALUES")
+        parser.add_argument("--workers", type=int, default=4)
+        parser.add_argument("--rate", type=float, default=2.0, help="Maksimal query per detik ke Wikidata")
+        parser.add_argument("--retries", type=int, default=3)
+        parser.add_argument("--refresh-types", action="store_true", help="Hitung ulang subclass film (Q11424)")
+
+    def query(self, query, label):
+        # Dicoba ulang dengan jeda bertambah jika Wikidata menolak atau timeout
+        for attempt in range(self.retries + 1):
+            self.limiter.wait()
+            try:
+                return self.wikidata.query(query, label=label)["results"]["bindings"]
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                self.stderr.write(f"Retrying {label} after error: {e}")
+                time.sleep(2 ** attempt)
+
+    def load_film_types(self, checkpoint, refresh):
+        film_types = set() if refresh else checkpoint.film_types()
+        if not film_types:
+            film_types = {binding["type"]["value"] for binding in self.query(FILM_TYPES_QUERY, "reconcile:film_types")}
+            checkpoint.save_film_types(film_types)
+        self.stdout.write(f"{len(film_types)} film classes (Q11424 and subclasses)")
+        return film_types
+
+    def match_batch(self, rows, film_types):
+        titles = list(dict.fromkeys(title for title, _ in rows.values()))
+        bindings = self.query(build_match_query(titles), "reconcile:labels")
+        return pick_matches(bindings, film_types, rows)
+
+    def reconcile(self, source, path, checkpoint, film_types, options):
+        _, title_column, year_column = SOURCES[source]
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        done = checkpoint.done_rows(source)
+        pending = {
+            row: (str(title).strip(), parse_year(year))
+            for row, (title, year) in enumerate(zip(df[title_column], df[year_column]))
+            if row not in done
+        }
+        titles = {row: title for row, (title, _) in pending.items()}
+        batches = list(chunked(sorted(pending), options["batch_size"]))
+        self.stdout.write(f"{source}: {len(df)} rows, {len(done)} already done, {len(batches)} batches to query")
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=options["workers"]) as executor:
+            futures = {
+                executor.submit(self.match_batch, {row: pending[row] for row in batch}, film_types): batch
+                for batch in batches
+            }
+            for number, future in enumerate(as_completed(futures), start=1):
+                batch = futures[future]
+                try:
+                    matches = future.result()
+                except Exception as e:
+                    # Baris batch ini tidak disimpan, jadi dicoba lagi di run berikutnya
+                    failed += 1
+                    self.stderr.write(f"{source}: batch starting at row {batch[0]} failed: {e}")
+                    continue
+                checkpoint.save(source, titles, matches)
+                found = sum(1 for uri in matches.values() if uri)
+                self.stdout.write(f"{source} [{number}/{len(batches)}] {found}/{len(batch)} matched")
+
+        matches = checkpoint.matches(source)
+        df["wikidata_id"] = [matches.get(row) for row in range(len(df))]
+        output = f"{os.path.splitext(path)[0]}_with_wikidata.csv"
+        tmp_output = f"{output}.tmp"
+        df.to_csv(tmp_output, index=False)
+        os.replace(tmp_output, output)
+        matched = sum(1 for uri in matches.values() if uri)
+        self.stdout.write(
+            f"{source}: wrote {output} ({matched}/{len(df)} matched, {len(df) - len(matches)} rows pending, "
+            f"{failed} failed batches)"
+        )
+
+    def handle(self, *args, **options):
+        # Tanpa cache SPARQL: hasil yang sudah selesai disimpan di checkpoint, dan
+        # --refresh-types serta run ulang harus melihat data Wikidata terbaru
+        self.wikidata = SparqlClient("wikidata-reconcile", settings.WIKIDATA_URL, cache=False)
+        self.limiter = RateLimiter(options["rate"])
+        self.retries = options["retries"]
+        checkpoint = Checkpoint(options["checkpoint"])
+
+        start = time.perf_counter()
+        film_types = self.load_film_types(checkpoint, options["refresh_types"])
+        for source in SOURCES:
+            path = options[source]
+            if not os.path.exists(path):
+                self.stderr.write(f"{source}: {path} not found, skipped")
+                continue
+            self.reconcile(source, path, checkpoint, film_types, options)
+        self.stdout.write(f"Done in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,57 @@
+from concurrent.futures import ThreadPoolExecutor
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+
+from main.benchmark.endpoint import FakeSparqlEndpoint
+from main.utils.sparql import SparqlClient
+
+ID_PATTERN = re.compile(r'BIND\("([^"]+)" AS \?id\)')
+
+
+def echo_responder(query):
+    # Jeda acak agar request dari banyak thread saling bertumpuk
+    time.sleep(random.uniform(0, 0.005))
+    request_id = ID_PATTERN.search(query).group(1)
+    return {
+        "head": {"vars": ["id"]},
+        "results": {"bindings": [{"id": {"type": "literal", "value": request_id}}]},
+    }
+
+
+class Command(BaseCommand):
+    help = "Uji beban SparqlClient dari banyak thread dan memastikan tidak ada hasil query yang tertukar"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=32)
+        parser.add_argument("--queries", type=int, default=200, help="Jumlah query per thread")
+
+    def handle(self, *args, **options):
+        with FakeSparqlEndpoint(echo_responder) as endpoint, override_settings(SPARQL_CACHE_ENABLED=False):
+            client = SparqlClient("stress", endpoint.url)
+
+            def worker(thread_id):
+                mismatches = 0
+                for i in range(options["queries"]):
+                    request_id = f"t{thread_id}-q{i}"
+                    query = f'SELECT ?id WHERE {{ BIND("{request_id}" AS ?id) }}'
+                    result = client.query(query)
+                    if result["results"]["bindings"][0]["id"]["value"] != request_id:
+                        mismatches += 1
+                return mismatches
+
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=options["threads"]) as executor:
+                mismatches = sum(executor.map(worker, range(options["threads"])))
+            elapsed = time.perf_counter() - start
+
+        total = options["threads"] * options["queries"]
+        self.stdout.write(
+            f"{total} queries from {options['threads']} threads in {elapsed:.2f}s "
+            f"({total / elapsed:.0f} q/s), {mismatches} mismatched results"
+        )
+        if mismatches:
+            raise CommandError(f"{mismatches} results did not match their query")
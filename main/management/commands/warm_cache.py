@@ -0,0 +1,197 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import unquote, urlencode
+import re
+import statistics
+import threading
+import time
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from main.utils.http_fetch import USER_AGENT
+from main.utils.search import PREFIXES
+from main.utils.search_index import SORT_FIELDS
+from main.utils.sparql import local_sparql
+
+DATA = "http://nama-kelompok.org/data/"
+
+MOVIES_QUERY = f"""{PREFIXES}
+    SELECT ?movieId (SAMPLE(?movieVotes) AS ?votes) (SAMPLE(?movieRating) AS ?rating) WHERE {{
+        ?movieId rdf:type :Movie .
+        OPTIONAL {{ ?movieId v:votes ?movieVotes . }}
+        OPTIONAL {{ ?movieId v:imdbRating ?movieRating . }}
+    }}
+    GROUP BY ?movieId
+"""
+
+# Request halaman detail di access log (format common/combined, gunicorn, runserver)
+LOG_PATTERN = re.compile(r'"(?:GET|HEAD) /movie/([^/?#" ]+)/?(?:[?#][^" ]*)? HTTP/')
+
+
+def _number(binding, name):
+    try:
+        return float(binding[name]["value"])
+    except (KeyError, ValueError):
+        return None
+
+
+def store_movies():
+    # movieId -> (votes, rating) dari store lokal
+    results = local_sparql.query(MOVIES_QUERY, label="warm:movies")
+    return {
+        binding["movieId"]["value"]: (_number(binding, "votes"), _number(binding, "rating"))
+        for binding in results["results"]["bindings"]
+    }
+
+
+def rank_movies(movies, order):
+    """
+    Urutan film paling populer lebih dulu: "votes" (lalu rating) atau
+    "rating" (lalu votes). Film tanpa nilai berada di akhir.
+    """
+    primary = 0 if order == "votes" else 1
+
+    def key(item):
+        movie_id, values = item
+        value, other = values[primary], values[1 - primary]
+        return (value is None, -(value or 0), -(other or 0), movie_id)
+
+    return [movie_id for movie_id, _ in sorted(movies.items(), key=key)]
+
+
+def rank_from_log(path, movies):
+    # Film diurutkan menurut jumlah request di access log, hanya yang ada di store
+    hits = Counter()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = LOG_PATTERN.search(line)
+            if match:
+                hits[f"{DATA}{unquote(match.group(1))}"] += 1
+    return [movie_id for movie_id, _ in hits.most_common() if movie_id in movies]
+
+
+class Command(BaseCommand):
+    help = (
+        "Menghangatkan cache setelah deploy: halaman awal setiap mode sort pencarian dan halaman detail "
+        "film terpopuler (menurut votes/rating atau access log), dengan jumlah request bersamaan terbatas"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=200, help="Jumlah film terpopuler yang dihangatkan")
+        parser.add_argument("--order", choices=["votes", "rating"], default="votes")
+        parser.add_argument("--access-log", help="Urutkan film menurut jumlah request di access log ini")
+        parser.add_argument(
+            "--search-pages", type=int, default=settings.SEARCH_CACHE_PIN_PAGES,
+            help="Jumlah halaman awal per mode sort pencarian",
+        )
+        parser.add_argument("--workers", type=int, default=4, help="Jumlah request bersamaan")
+        parser.add_argument(
+            "--base-url",
+            help="Kirim request ke server yang berjalan (mis. http://localhost:8000) sehingga cache in-memory "
+                 "server dan CDN ikut terisi. Tanpa opsi ini view dijalankan di proses ini dan hanya cache "
+                 "SPARQL di disk (SPARQL_CACHE_PATH) yang terisi",
+        )
+        parser.add_argument("--timeout", type=float, default=60, help="Timeout per request untuk --base-url")
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def fetch(self, path):
+        # Mengembalikan (status, lengkap?) - halaman dengan section Wikidata
+        # yang gagal dikirim dengan no-store, jadi belum tentu ter-cache
+        if self.base_url:
+            response = self._session().get(f"{self.base_url}{path}", timeout=self.timeout)
+            status, cache_control = response.status_code, response.headers.get("Cache-Control", "")
+        else:
+            response = Client().get(path)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            status, cache_control = response.status_code, response.get("Cache-Control", "")
+        return status, "no-store" not in cache_control
+
+    def run(self, kind, paths, workers):
+        stats = {"ok": 0, "partial": 0, "failed": 0, "timings": []}
+        if not paths:
+            return stats
+        self.stdout.write(f"Warming {len(paths)} {kind} pages with {workers} workers")
+        start = time.perf_counter()
+
+        def job(path):
+            job_start = time.perf_counter()
+            try:
+                status, complete = self.fetch(path)
+            except Exception as e:
+                print(f"Error warming {path}: {e}")
+                status, complete = None, False
+            return status, complete, time.perf_counter() - job_start
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(job, path): path for path in paths}
+            for done, future in enumerate(as_completed(futures), start=1):
+                status, complete, elapsed = future.result()
+                stats["timings"].append(elapsed)
+                if status != 200:
+                    stats["failed"] += 1
+                    result = f"failed ({status})"
+                elif complete:
+                    stats["ok"] += 1
+                    result = "ok"
+                else:
+                    stats["partial"] += 1
+                    result = "partial"
+                self.stdout.write(f"  [{done}/{len(paths)}] {result:<12} {elapsed:6.2f}s {futures[future]}")
+
+        total = time.perf_counter() - start
+        timings = stats["timings"]
+        self.stdout.write(
+            f"{kind}: {stats['ok']} ok, {stats['partial']} partial, {stats['failed']} failed in {total:.1f}s "
+            f"({len(paths) / total:.1f} pages/s, median {statistics.median(timings):.2f}s, max {max(timings):.2f}s)"
+        )
+        return stats
+
+    def handle(self, *args, **options):
+        self.base_url = (options["base_url"] or "").rstrip("/")
+        self.timeout = options["timeout"]
+        self._local = threading.local()
+        start = time.perf_counter()
+
+        movies = store_movies()
+        if options["access_log"]:
+            try:
+                ranked = rank_from_log(options["access_log"], movies)
+            except OSError as e:
+                raise CommandError(f"Cannot read access log: {e}")
+            source = f"access log {options['access_log']}"
+        else:
+            ranked = rank_movies(movies, options["order"])
+            source = f"{options['order']}"
+        ranked = ranked[:options["limit"]]
+        self.stdout.write(f"{len(movies)} movies in the local store, warming the top {len(ranked)} by {source}")
+
+        # Halaman pencarian dulu (murah, membangun index), lalu detail film
+        # dari yang terpopuler agar tetap berguna jika dihentikan di tengah
+        search_url = reverse("main:search_movie")
+        search_paths = [
+            f"{search_url}?{urlencode({'sort': sort, 'page': page})}"
+            for sort in SORT_FIELDS
+            for page in range(1, options["search_pages"] + 1)
+        ]
+        detail_paths = [
+            reverse("main:movie_detail", kwargs={"uri": movie_id.removeprefix(DATA)}) for movie_id in ranked
+        ]
+        search = self.run("search", search_paths, options["workers"])
+        detail = self.run("detail", detail_paths, options["workers"])
+
+        failed = search["failed"] + detail["failed"]
+        self.stdout.write(
+            f"Cache warm-up finished in {time.perf_counter() - start:.1f}s "
+            f"({len(search_paths) + len(detail_paths)} pages, {failed} failed)"
+        )
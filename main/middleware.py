@@ -0,0 +1,75 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from .utils.timing import collect_queries, print_slowest, server_timing_header
+
+
+class StaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise yang juga mendukung request async. WhiteNoiseMiddleware asli
+    hanya sync, sehingga di bawah ASGI Django menjalankan view async lewat
+    satu thread dan request tidak lagi berjalan bersamaan.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _static_file(self, request):
+        if self.autorefresh:
+            return self.find_file(request.path_info)
+        return self.files.get(request.path_info)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        static_file = self._static_file(request)
+        if static_file is not None:
+            return self.serve(static_file, request)
+        return await self.get_response(request)
+
+
+class ServerTimingMiddleware:
+    """
+    Mencatat setiap query SPARQL selama request (endpoint, label, durasi,
+    jumlah baris, status cache) dan mengirimnya di header Server-Timing.
+    Dengan DEBUG, query paling lambat juga dicetak ke console. Response
+    streaming hanya memuat query sebelum header dikirim.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _finish(self, request, response, queries):
+        if settings.SERVER_TIMING_ENABLED and queries:
+            response["Server-Timing"] = server_timing_header(queries, settings.SERVER_TIMING_MAX_ENTRIES)
+        if settings.DEBUG:
+            print_slowest(request.path, queries, settings.SPARQL_TIMING_SLOWEST)
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with collect_queries() as queries:
+            response = self.get_response(request)
+        return self._finish(request, response, queries)
+
+    async def __acall__(self, request):
+        with collect_queries() as queries:
+            response = await self.get_response(request)
+        return self._finish(request, response, queries)
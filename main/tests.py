@@ -1,3 +1,627 @@
-from django.test import TestCase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+import json
+import os
+import tempfile
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+import pandas as pd
+import requests
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from PIL import Image
+
+from main.utils import image_proxy
+from main.utils.build import build_version
+from main.utils.cache import MISS, ResponseCache, TieredCache
+from main.utils.dataset_loader import canonical_ntriples, diff_sorted
+from main.utils.enrichment import run_enrichment
+from main.utils.http_cache import http_cache, response_etag
+from main.utils.movie import build_movie_query, fetch_movies, parse_movies
+from main.utils.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceeded
+from main.utils.search_index import MovieSearchIndex, decode_cursor, encode_cursor
+from main.utils.wikidata import SECTION_LIMITS, split_enrichment_bindings
+from main.utils.sparql import EmbeddedSparqlClient, wikidata_sparql
+from main.views import _apply_sections, _enrichment_tasks, build_movie_documents
+
+
+class FixtureServer:
+    """
+    Server HTTP lokal untuk test: path -> (status, headers, body). Setiap
+    request dicatat agar test dapat memeriksa apa saja yang diambil.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                server.requests.append(path)
+                status, headers, body = server.routes.get(path, (404, {}, b"not found"))
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def add(self, path, body, status=200, headers=None):
+        self.routes[path] = (status, headers or {}, body)
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def jpeg(width, height):
+    output = BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(output, "JPEG")
+    return output.getvalue()
+
+
+class ImageProxyTests(SimpleTestCase):
+    def setUp(self):
+        self.server = FixtureServer()
+        self.addCleanup(self.server.close)
+        self.server.add("/poster.jpg", jpeg(1200, 1800), headers={"Content-Type": "image/jpeg"})
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings = override_settings(
+            IMAGE_PROXY_ENABLED=True, IMAGE_PROXY_HOSTS=["127.0.0.1"], IMAGE_CACHE_DIR=cache_dir.name,
+            IMAGE_PROXY_RATE=0,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Cache dan Fetcher modul dibuat ulang dengan setting test
+        image_proxy._cache = image_proxy._fetcher = None
+        self.addCleanup(setattr, image_proxy, "_cache", None)
+        self.addCleanup(setattr, image_proxy, "_fetcher", None)
+
+    def get(self, url, variant, **headers):
+        return self.client.get(image_proxy.proxy_image_url(url, variant), **headers)
+
+    def test_rewrites_only_allowed_hosts(self):
+        self.assertTrue(image_proxy.proxy_image_url(f"{self.server.base_url}/poster.jpg", "grid").startswith("/img/grid?src="))
+        self.assertEqual(image_proxy.proxy_image_url("https://example.com/a.jpg", "grid"), "https://example.com/a.jpg")
+        self.assertEqual(self.client.get("/img/grid", {"src": "https://example.com/a.jpg"}).status_code, 403)
+        self.assertEqual(self.client.get("/img/huge", {"src": f"{self.server.base_url}/poster.jpg"}).status_code, 400)
+
+    def test_rejects_redirect_to_other_host(self):
+        # localhost bukan host yang diizinkan, walaupun server-nya sama
+        target = self.server.base_url.replace("127.0.0.1", "localhost") + "/poster.jpg"
+        self.server.add("/redirect.jpg", b"", status=302, headers={"Location": target})
+        response = self.get(f"{self.server.base_url}/redirect.jpg", "grid")
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.server.requests, ["/redirect.jpg"])
+
+    def test_follows_redirect_within_allowed_hosts(self):
+        self.server.add("/redirect.jpg", b"", status=302, headers={"Location": "/poster.jpg"})
+        response = self.get(f"{self.server.base_url}/redirect.jpg", "thumb")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, ["/redirect.jpg", "/poster.jpg"])
+
+    def test_resizes_all_variants_from_one_fetch(self):
+        url = f"{self.server.base_url}/poster.jpg"
+        for variant, width in (("grid", 300), ("detail", 600), ("thumb", 160)):
+            response = self.get(url, variant)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response["Content-Type"], "image/jpeg")
+            self.assertIn("immutable", response["Cache-Control"])
+            image = Image.open(BytesIO(b"".join(response.streaming_content)))
+            self.assertEqual(image.size, (width, width * 3 // 2))
+        self.assertEqual(self.server.requests, ["/poster.jpg"])
+
+    def test_etag_revalidation(self):
+        url = f"{self.server.base_url}/poster.jpg"
+        response = self.get(url, "grid")
+        b"".join(response.streaming_content)
+        etag = response["ETag"]
+        self.assertEqual(self.get(url, "grid", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.get(url, "detail", HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_vector_images_are_not_rewritten(self):
+        url = f"{self.server.base_url}/Flag%20of%20Indonesia.svg"
+        self.assertEqual(image_proxy.proxy_image_url(url, "thumb"), url)
+
+    def test_unsupported_image_is_fetched_once(self):
+        self.server.add("/logo.png", b"<svg></svg>", headers={"Content-Type": "image/svg+xml"})
+        url = f"{self.server.base_url}/logo.png"
+        for variant in ("thumb", "thumb", "grid"):
+            response = self.get(url, variant)
+            self.assertEqual(response.status_code, 302)
+            self.assertEqual(response["Location"], url)
+            self.assertIn("max-age", response["Cache-Control"])
+        self.assertEqual(self.server.requests, ["/logo.png"])
+
+    def test_tiny_cache_budget(self):
+        with override_settings(IMAGE_CACHE_MAX_BYTES=1):
+            image_proxy._cache = None
+            for name in ("a", "b"):
+                self.server.add(f"/{name}.jpg", jpeg(800, 1200))
+                response = self.get(f"{self.server.base_url}/{name}.jpg", "grid")
+                self.assertEqual(response.status_code, 200)
+                b"".join(response.streaming_content)
+
+
+class HarvestPostersTests(SimpleTestCase):
+    def setUp(self):
+        self.server = FixtureServer()
+        self.addCleanup(self.server.close)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.input = os.path.join(self.directory.name, "movies.csv")
+        self.output = os.path.join(self.directory.name, "movies_with_posters.csv")
+        pd.DataFrame({
+            "Title": ["Alpha", "Alpha", "Beta", "Gamma"],
+            "wikidata_id": ["http://www.wikidata.org/entity/Q1", "", "http://www.wikidata.org/entity/Q2",
+                            "http://www.wikidata.org/entity/Q3"],
+            "Poster Link": ["", "", "https://example.com/beta.jpg", ""],
+        }).to_csv(self.input, index=False)
+        self.add_film("Q1", "alpha")
+
+    def add_film(self, entity_id, page):
+        page_url = f"{self.server.base_url}/wiki/{page}"
+        self.server.add(f"/entity/{entity_id}.json", json.dumps({"entities": {entity_id: {"sitelinks": {
+            "enwiki": {"site": "enwiki", "url": page_url},
+        }}}}).encode("utf-8"))
+        self.server.add(
+            f"/wiki/{page}",
+            f'<html><body><table class="infobox"><tr><td><img src="//img.example/{page}.jpg"></td></tr></table>'
+            f'<img src="/other.jpg"></body></html>'.encode("utf-8"),
+        )
+
+    def harvest(self):
+        call_command(
+            "harvest_posters", input=self.input, output=self.output,
+            entity_data_url=f"{self.server.base_url}/entity/{{id}}.json",
+            http_cache=os.path.join(self.directory.name, "http.sqlite3"), rate=0, retries=0,
+            stdout=StringIO(), stderr=StringIO(),
+        )
+        return pd.read_csv(self.output, dtype=str, keep_default_na=False)
+
+    def results(self):
+        entries = []
+        with open(f"{self.output}.jsonl", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue
+        return entries
+
+    def test_incremental_resume(self):
+        df = self.harvest()
+        # Baris tanpa wikidata_id memakai entity dari judul yang sama,
+        # poster yang sudah ada tidak diambil ulang, Q3 gagal (404)
+        self.assertEqual(list(df["wikidata_id"])[:2], ["http://www.wikidata.org/entity/Q1"] * 2)
+        self.assertEqual(list(df["Poster Link"]), ["http://img.example/alpha.jpg"] * 2 + ["https://example.com/beta.jpg", ""])
+        self.assertEqual([entry["wikidata_id"] for entry in self.results()], ["http://www.wikidata.org/entity/Q1"])
+        self.assertNotIn("/entity/Q2.json", self.server.requests)
+
+        # Run berikutnya hanya mengambil entity yang belum ada di log JSONL
+        self.add_film("Q3", "gamma")
+        self.server.requests.clear()
+        df = self.harvest()
+        self.assertEqual(self.server.requests, ["/entity/Q3.json", "/wiki/gamma"])
+        self.assertEqual(df["Poster Link"].iloc[3], "http://img.example/gamma.jpg")
+        self.assertEqual(
+            [entry["wikidata_id"] for entry in self.results()],
+            ["http://www.wikidata.org/entity/Q1", "http://www.wikidata.org/entity/Q3"],
+        )
+
+    def test_truncated_log_line_is_ignored(self):
+        with open(f"{self.output}.jsonl", "w", encoding="utf-8") as f:
+            f.write(json.dumps({"wikidata_id": "http://www.wikidata.org/entity/Q1", "poster": "http://cached/alpha.jpg", "page": None}))
+            f.write('\n{"wikidata_id": "http://www.wiki')
+        self.add_film("Q3", "gamma")
+        df = self.harvest()
+        self.assertEqual(df["Poster Link"].iloc[0], "http://cached/alpha.jpg")
+        self.assertNotIn("/entity/Q1.json", self.server.requests)
+        # Hasil baru tidak tersambung ke baris yang terpotong
+        self.assertEqual(
+            [entry["wikidata_id"] for entry in self.results()],
+            ["http://www.wikidata.org/entity/Q1", "http://www.wikidata.org/entity/Q3"],
+        )
+
+
+MOVIES_TTL = """
+@base <http://nama-kelompok.org/data/> .
+@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix v: <http://nama-kelompok.org/vocab#> .
+@prefix wd: <http://www.wikidata.org/entity/> .
+
+<Robert_Donat> rdf:type <Actor> ; rdfs:label "Robert Donat" .
+<Lucie_Mannheim> rdf:type <Actor> ; rdfs:label "Lucie Mannheim" .
+
+<Alfred_Hitchcock> rdf:type <Director> ; rdfs:label "Alfred Hitchcock" .
+
+<The_39_Steps_1935> rdf:type <Movie> ;
+    rdfs:label "The 39 Steps" ;
+    v:director <Alfred_Hitchcock> ;
+    v:wikidataUri wd:Q501105 ;
+    v:genre "Crime" , "Mystery" ;
+    v:star <Robert_Donat> , <Lucie_Mannheim> ;
+    v:releaseYear 1935 .
+
+<M3GAN_2022> rdf:type <Movie> ;
+    rdfs:label "M3GAN" ;
+    v:releaseYear 2022 .
+"""
+
+
+class EmbeddedStoreMixin:
+    # Store lokal berupa MOVIES_TTL yang dijawab backend rdflib embedded
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        data_path = os.path.join(directory.name, "movies.ttl")
+        with open(data_path, "w", encoding="utf-8") as f:
+            f.write(MOVIES_TTL)
+        settings = override_settings(
+            RDF_DATA_PATH=data_path, RDF_SCHEMA_PATH=data_path, EMBEDDED_CACHE_DIR=None,
+            SPARQL_CACHE_ENABLED=False, DATASET_VERSION="test", WIKIDATA_SOURCE="remote",
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client_sparql = EmbeddedSparqlClient("test-embedded")
+
+    def uri(self, id):
+        return f"http://nama-kelompok.org/data/{id}"
+
+
+class EmbeddedMovieQueryTests(EmbeddedStoreMixin, SimpleTestCase):
+
+    def test_movie_without_stars(self):
+        movies = parse_movies(self.client_sparql.query(build_movie_query([self.uri("M3GAN_2022")])))
+        movie = movies[self.uri("M3GAN_2022")]
+        self.assertEqual(movie["title"], "M3GAN")
+        self.assertEqual(movie["stars"], "")
+        self.assertEqual(movie["genres"], "")
+
+    def test_batch_with_and_without_stars(self):
+        with mock.patch("main.utils.movie.local_sparql", self.client_sparql):
+            movies = fetch_movies([self.uri("The_39_Steps_1935"), self.uri("M3GAN_2022"), self.uri("Nope")])
+        self.assertEqual(sorted(movies), [self.uri("M3GAN_2022"), self.uri("The_39_Steps_1935")])
+        steps = movies[self.uri("The_39_Steps_1935")]
+        self.assertEqual(sorted(steps["stars"].split(", ")), [self.uri("Lucie_Mannheim"), self.uri("Robert_Donat")])
+        self.assertEqual(sorted(steps["genres"].split(", ")), ["Crime", "Mystery"])
+
+    def test_unknown_id_is_404(self):
+        self.assertEqual(parse_movies(self.client_sparql.query(build_movie_query([self.uri("Nope")]))), {})
+        with mock.patch("main.views.local_sparql", self.client_sparql):
+            self.assertEqual(self.client.get("/sync/movie/Nope/").status_code, 404)
+
+    def test_stream_is_not_cached(self):
+        # Header terkirim sebelum section Wikidata selesai, jadi tanpa ETag dan cache bersama
+        with mock.patch("main.views.local_sparql", self.client_sparql), \
+                mock.patch("main.views._enrichment_tasks", return_value={}):
+            response = self.client.get("/stream/movie/M3GAN_2022/")
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("M3GAN", b"".join(response.streaming_content).decode("utf-8"))
+        self.assertFalse(response.has_header("ETag"))
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+
+@override_settings(SEARCH_CACHE_ENABLED=False, HTTP_CACHE_ENABLED=False, SEARCH_MAX_PAGE=50, DATASET_VERSION="test")
+class SearchPageLimitTests(SimpleTestCase):
+    def search(self, **params):
+        return self.client.get("/sync/search", params)
+
+    @override_settings(SEARCH_BACKEND="sparql")
+    def test_sparql_backend_ignores_cursor(self):
+        with mock.patch("main.views.local_sparql") as sparql:
+            sparql.query.return_value = {"results": {"bindings": []}}
+            self.assertEqual(self.search(page=1000000, cursor="x").status_code, 400)
+            sparql.query.assert_not_called()
+
+            response = self.search(page=2, cursor="x")
+            self.assertEqual(response.status_code, 200)
+            self.assertIsNone(response.json()["nextCursor"])
+            self.assertIn("OFFSET 20", sparql.query.call_args.args[0])
+
+    @override_settings(SEARCH_BACKEND="index")
+    def test_index_backend_requires_valid_cursor(self):
+        index = MovieSearchIndex([
+            {"movieId": f"m{i:02d}", "name": f"Movie {i:02d}", "genres": [], "releaseYear": None,
+             "rating": None, "internationalSales": None, "budget": None}
+            for i in range(30)
+        ])
+        with mock.patch("main.views.get_search_index", return_value=index), \
+                mock.patch("main.views.hydrate_movies", return_value=[]) as hydrate:
+            self.assertEqual(self.search(page=1000000, cursor="x").status_code, 400)
+            self.assertEqual(self.search(page=1000000).status_code, 400)
+            hydrate.assert_not_called()
+
+            cursor = encode_cursor("alphabet_asc", "Movie 24", "m24")
+            response = self.search(page=1000000, cursor=cursor)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(hydrate.call_args.args[0], ["m25", "m26", "m27", "m28", "m29"])
+
+
+class SkippedSectionTests(EmbeddedStoreMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        for module in ("main.utils.actor", "main.utils.movie"):
+            patcher = mock.patch(f"{module}.local_sparql", self.client_sparql)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def skip_wikidata(self, error):
+        return mock.patch.object(wikidata_sparql, "query", side_effect=error)
+
+    def test_detail_sections_are_marked_skipped(self):
+        movie = fetch_movies([self.uri("The_39_Steps_1935")])[self.uri("The_39_Steps_1935")]
+        with self.skip_wikidata(CircuitOpenError("Circuit wikidata terbuka, query dilewati")):
+            sections, errors = run_enrichment(_enrichment_tasks(dict(movie)))
+        self.assertEqual(set(errors), {"stars", "director", "wikidata"})
+        document = _apply_sections(dict(movie), sections, errors)
+        for slot in ("stars", "director", "awards"):
+            self.assertEqual(document["skipped"][slot], "Wikidata is temporarily unavailable")
+
+    def test_batch_sections_are_marked_skipped(self):
+        movies = fetch_movies([self.uri("The_39_Steps_1935"), self.uri("M3GAN_2022")])
+        with self.skip_wikidata(DeadlineExceeded("Deadline halaman terlewati, query dilewati")):
+            documents = build_movie_documents(movies)
+        document = documents[self.uri("The_39_Steps_1935")]
+        self.assertIn("stars", document["section_errors"])
+        self.assertIn("director", document["section_errors"])
+        self.assertEqual(document["skipped"]["stars"], "Wikidata took too long to respond")
+
+
+def binding(**values):
+    return {name: {"type": "literal", "value": value} for name, value in values.items()}
+
+
+class SplitEnrichmentTests(SimpleTestCase):
+    FILM = "http://www.wikidata.org/entity/Q501105"
+
+    def test_sections_and_images(self):
+        films = split_enrichment_bindings([
+            binding(film=self.FILM, section="distributors", item="wd:Q1", label="Gaumont", image="logo.png"),
+            binding(film=self.FILM, section="screenwriters", item="wd:Q2", label="Charles Bennett"),
+            # Item yang sama dengan gambar kedua tidak diduplikasi
+            binding(film=self.FILM, section="screenwriters", item="wd:Q2", label="Charles Bennett", image="a.jpg"),
+            binding(film=self.FILM, section="screenwriters", item="wd:Q2", label="Charles Bennett", image="b.jpg"),
+            binding(film=self.FILM, section="awards_received", item="wd:Q3", label="Award", image="x.jpg"),
+            binding(film=self.FILM, section="reviews", score="96%", item="wd:Q4", label="Rotten Tomatoes"),
+            binding(film=self.FILM, section="reviews", score="93/100"),
+        ])
+        sections = films[self.FILM]
+        self.assertEqual(sections["distributors"], [{"label": "Gaumont", "uri": "wd:Q1", "logo": "logo.png"}])
+        self.assertEqual(sections["screenwriters"], [{"label": "Charles Bennett", "uri": "wd:Q2", "image": "a.jpg"}])
+        self.assertEqual(sections["awards_received"], [{"label": "Award", "uri": "wd:Q3"}])
+        self.assertEqual(sections["reviews"], [
+            {"reviewer_label": "Rotten Tomatoes", "reviewer_uri": "wd:Q4", "score": "96%"},
+            {"reviewer_label": "Unknown Reviewer", "reviewer_uri": "#", "score": "93/100"},
+        ])
+        self.assertEqual(sections["composer"], [])
+
+    def test_section_limits(self):
+        other = "http://www.wikidata.org/entity/Q2"
+        bindings = [
+            binding(film=film, section=section, item=f"wd:Q{i}", label=f"Item {i}", score="1")
+            for film in (self.FILM, other)
+            for section in SECTION_LIMITS
+            for i in range(10)
+        ]
+        films = split_enrichment_bindings(bindings)
+        for film in (self.FILM, other):
+            for section, limit in SECTION_LIMITS.items():
+                self.assertEqual(len(films[film][section]), limit)
+        self.assertEqual(films[self.FILM]["countries_of_origin"][0]["uri"], "wd:Q0")
+
+
+class CursorCodecTests(SimpleTestCase):
+    def test_round_trip(self):
+        for sort, value in (("alphabet_asc", "Déjà Vu"), ("rating", 7.5), ("budget", None), ("release_year", 1935)):
+            cursor = encode_cursor(sort, value, "http://nama-kelompok.org/data/Deja_Vu_2006")
+            self.assertNotIn("=", cursor)
+            self.assertEqual(decode_cursor(cursor), (sort, value, "http://nama-kelompok.org/data/Deja_Vu_2006"))
+
+    def test_invalid_cursors(self):
+        for cursor in ("x", "!!!", encode_cursor("unknown", 1, "m"), encode_cursor("rating", "high", "m"),
+                       encode_cursor("alphabet_asc", 3, "m"), encode_cursor("rating", 1, 5)):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
+
+
+@override_settings(SPARQL_BREAKER_THRESHOLD=2, SPARQL_BREAKER_RESET=30)
+class CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch("main.utils.resilience.time.monotonic", side_effect=lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.breaker = CircuitBreaker("test")
+
+    def fail(self):
+        self.breaker.allow()
+        self.breaker.record(ConnectionError("down"))
+
+    def test_opens_after_threshold_and_recovers(self):
+        self.fail()
+        self.assertEqual(self.breaker.state, "closed")
+        self.fail()
+        self.assertEqual(self.breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.allow()
+
+        # Setelah jeda hanya satu percobaan yang boleh lewat
+        self.now += 30
+        self.assertEqual(self.breaker.state, "half-open")
+        self.breaker.allow()
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.allow()
+        self.breaker.record()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        self.fail()
+        self.fail()
+        self.now += 30
+        self.fail()
+        self.assertEqual(self.breaker.state, "open")
+        self.now += 29
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.allow()
+
+    def test_released_probe_and_client_errors(self):
+        self.fail()
+        self.fail()
+        self.now += 30
+        self.breaker.allow()
+        self.breaker.release()
+        self.breaker.allow()
+        # Error 4xx berarti endpoint sehat, circuit tertutup lagi
+        response = mock.Mock(status_code=400)
+        self.breaker.record(requests.HTTPError(response=response))
+        self.assertEqual(self.breaker.state, "closed")
+
+
+class TieredCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache.sqlite3")
+        self.cache = TieredCache(2, self.path)
+
+    def test_memory_disk_and_ttl(self):
+        self.cache.set("local", "a", {"rows": 1})
+        self.cache.set("wikidata", "b", {"rows": 2}, ttl=60)
+        self.assertEqual(self.cache.get("local", "a"), {"rows": 1})
+
+        # Cache baru (proses lain) membaca dari disk lalu menaikkannya ke memory
+        other = TieredCache(2, self.path)
+        self.assertEqual(other.get("wikidata", "b"), {"rows": 2})
+        self.assertEqual(other.get("wikidata", "b"), {"rows": 2})
+        self.assertEqual(other.stats()["wikidata"], {"memory_hits": 1, "disk_hits": 1, "misses": 0})
+
+        with mock.patch("main.utils.cache.time.time", return_value=time.time() + 61):
+            self.assertIs(self.cache.get("wikidata", "b"), MISS)
+            self.assertIs(TieredCache(2, self.path).get("wikidata", "b"), MISS)
+            # Tanpa TTL tidak pernah kedaluwarsa
+            self.assertEqual(self.cache.get("local", "a"), {"rows": 1})
+
+
+class ResponseCacheTests(SimpleTestCase):
+    def test_lru_eviction_keeps_pinned(self):
+        cache = ResponseCache(max_entries=3, max_bytes=1000)
+        cache.set("page1", b"1", "v1", pinned=True)
+        cache.set("a", b"a", "v1")
+        cache.set("b", b"b", "v1")
+        cache.get("a", "v1")
+        cache.set("c", b"c", "v1")
+        self.assertEqual(cache.get("page1", "v1"), b"1")
+        self.assertIs(cache.get("b", "v1"), MISS)
+        self.assertEqual(cache.get("a", "v1"), b"a")
+        self.assertEqual(cache.stats()["pinned"], 1)
+
+    def test_byte_budget_and_version(self):
+        cache = ResponseCache(max_entries=10, max_bytes=10)
+        cache.set("huge", b"x" * 11, "v1")
+        self.assertIs(cache.get("huge", "v1"), MISS)
+        cache.set("a", b"aaaaaa", "v1")
+        cache.set("b", b"bbbbbb", "v1")
+        self.assertIs(cache.get("a", "v1"), MISS)
+        self.assertEqual(cache.stats()["bytes"], 6)
+
+        cache.set("pinned", b"p", "v1", pinned=True)
+        # Versi dataset baru mengosongkan semua entry, termasuk yang di-pin
+        self.assertIs(cache.get("pinned", "v2"), MISS)
+        self.assertEqual(cache.stats()["bytes"], 0)
+
+
+@override_settings(HTTP_CACHE_ENABLED=True, DATASET_VERSION="v1", BUILD_VERSION="build1")
+class HttpCacheTests(SimpleTestCase):
+    def setUp(self):
+        build_version.cache_clear()
+        self.addCleanup(build_version.cache_clear)
+        self.factory = RequestFactory()
+
+    def etag(self, path="/search", route="detail", **params):
+        return response_etag(route, self.factory.get(path, params))
+
+    def test_etag_components(self):
+        etag = self.etag(sort="rating", page="2")
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(etag, self.etag(page="2", sort="rating"))
+        self.assertNotEqual(etag, self.etag(sort="rating", page="3"))
+        self.assertNotEqual(etag, self.etag(path="/movie/x/", sort="rating", page="2"))
+        self.assertNotEqual(etag, self.etag(route="search", sort="rating", page="2"))
+        with override_settings(DATASET_VERSION="v2"):
+            self.assertNotEqual(etag, self.etag(sort="rating", page="2"))
+        with override_settings(BUILD_VERSION="build2"):
+            build_version.cache_clear()
+            self.assertNotEqual(etag, self.etag(sort="rating", page="2"))
+        build_version.cache_clear()
+
+    def test_wikidata_window(self):
+        ttl = 3 * 24 * 60 * 60
+        with override_settings(SPARQL_CACHE_TTL={"local": None, "wikidata": ttl}):
+            with mock.patch("main.utils.http_cache.time.time", return_value=10 * ttl):
+                detail, search = self.etag(), self.etag(route="search")
+            with mock.patch("main.utils.http_cache.time.time", return_value=10 * ttl + ttl - 1):
+                self.assertEqual(self.etag(), detail)
+            with mock.patch("main.utils.http_cache.time.time", return_value=11 * ttl):
+                self.assertNotEqual(self.etag(), detail)
+                # Route tanpa data Wikidata tidak bergantung pada jendela
+                self.assertEqual(self.etag(route="search"), search)
+
+    def test_decorator(self):
+        status = {"code": 200}
+
+        @http_cache("search")
+        def view(request):
+            return HttpResponse("ok", status=status["code"])
+
+        response = view(self.factory.get("/search"))
+        self.assertEqual(response["Cache-Control"], "public, max-age=60, stale-while-revalidate=600")
+        etag = response["ETag"]
+        self.assertEqual(view(self.factory.get("/search", HTTP_IF_NONE_MATCH=etag)).status_code, 304)
+
+        status["code"] = 500
+        response = view(self.factory.get("/search"))
+        self.assertFalse(response.has_header("ETag"))
+        self.assertIn("no-cache", response["Cache-Control"])
+
+
+class DatasetDiffTests(SimpleTestCase):
+    def test_diff_sorted(self):
+        self.assertEqual(diff_sorted(["a", "c", "d"], ["b", "c", "e"]), (["a", "d"], ["b", "e"]))
+        self.assertEqual(diff_sorted([], ["a"]), ([], ["a"]))
+        self.assertEqual(diff_sorted(["a", "b"], []), (["a", "b"], []))
+        self.assertEqual(diff_sorted(["a", "b"], ["a", "b"]), ([], []))
+
+    def test_canonical_ntriples_delta(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        old_path, new_path = (os.path.join(directory.name, name) for name in ("old.ttl", "new.ttl"))
+        prefix = "@prefix v: <http://nama-kelompok.org/vocab#> .\n"
+        with open(old_path, "w", encoding="utf-8") as f:
+            f.write(prefix + '<http://x/M> v:votes 10 ; v:award [ v:name "Oscar" ] .\n')
+        with open(new_path, "w", encoding="utf-8") as f:
+            f.write(prefix + '<http://x/M> v:award [ v:name "Oscar" ] ; v:votes 11 .\n')
+
+        old = canonical_ntriples(old_path)
+        # Blank node diberi label yang sama di setiap parse
+        self.assertEqual(old, canonical_ntriples(old_path))
+        removed, added = diff_sorted(old, canonical_ntriples(new_path))
+        self.assertEqual(len(removed), 1)
+        self.assertEqual(len(added), 1)
+        self.assertIn('"10"', removed[0])
+        self.assertIn('"11"', added[0])
@@ -1,12 +1,33 @@
+from django.conf import settings
 from django.urls import path
-from main.views import search_movies, get_movie_data, landing_page, main_page, get_movie_details
+from main.views import (
+    aget_movie_details, asearch_movies, search_movies, get_movie_data, landing_page, main_page, get_movie_details,
+    get_movie_details_batch, image_proxy, stream_movie_details,
+)
 
 app_name = 'main'
 
+# Dengan ASYNC_VIEWS (dijalankan lewat server ASGI), route utama memakai
+# view async. Kedua versi tetap tersedia di bawah prefix sync/ dan async/
+if settings.ASYNC_VIEWS:
+    movie_detail_view, search_view = aget_movie_details, asearch_movies
+else:
+    movie_detail_view, search_view = get_movie_details, search_movies
+# DETAIL_STREAMING mengirim halaman detail secara bertahap
+if settings.DETAIL_STREAMING:
+    movie_detail_view = stream_movie_details
+
 urlpatterns = [
     path('', landing_page, name='landing_page'),
     path('entity/<str:id>', get_movie_data, name='get_movie_data'),
-    path("movie/<path:uri>/", get_movie_details, name="movie_detail"),
-    path("search", search_movies, name="search_movie"),
+    path("movie/<path:uri>/", movie_detail_view, name="movie_detail"),
+    path("search", search_view, name="search_movie"),
     path("main_search", main_page, name="main_page"),
+    path("sync/movie/<path:uri>/", get_movie_details, name="movie_detail_sync"),
+    path("sync/search", search_movies, name="search_movie_sync"),
+    path("async/movie/<path:uri>/", aget_movie_details, name="movie_detail_async"),
+    path("async/search", asearch_movies, name="search_movie_async"),
+    path("stream/movie/<path:uri>/", stream_movie_details, name="movie_detail_stream"),
+    path("api/movies", get_movie_details_batch, name="movie_details_batch"),
+    path("img/<str:variant>", image_proxy, name="image_proxy"),
 ]
@@ -1,7 +1,14 @@
 # utils/__init__.py
-from .actor import fetch_cast_uri, fetch_label, process_actors
-from .distributor import fetch_all_distributors
-from .director import fetch_director_uri, process_director 
-from .image import fetch_image
-from .review import fetch_review_scores
-from .time import format_running_time
\ No newline at end of file
+from .actor import (
+    afetch_labels, aprocess_actors, fetch_cast_uri, fetch_cast_uris, fetch_label, fetch_labels, process_actors,
+    process_actors_batch,
+)
+from .director import aprocess_director, fetch_director_uri, process_director, process_directors_batch
+from .image import afetch_image, afetch_images, fetch_image, fetch_images, remember_images
+from .movie import build_movie_query, fetch_movies, parse_movies
+from .review import merge_imdb_rating
+from .time import format_running_time
+from .wikidata import (
+    afetch_enrichment, afetch_enrichment_batch, fetch_enrichment, fetch_enrichment_batch,
+    fetch_enrichment_many,
+)
@@ -1,7 +1,12 @@
 # utils/actor.py
 
-from .sparql import wikidata_sparql, local_sparql
-from .image import fetch_image
+import asyncio
+
+from django.conf import settings
+
+from .sparql import wikidata_sparql, local_sparql, escape_literal, chunked
+from .image import afetch_images, fetch_images, remember_images
+from .resilience import SkippedCall
 
 def fetch_label(uri):
     sparql_query = f"""
@@ -13,11 +18,10 @@ def fetch_label(uri):
     }}
     LIMIT 1
     """
-    local_sparql.setQuery(sparql_query)
 
     try:
         # Eksekusi query
-        results = local_sparql.query().convert()
+        results = local_sparql.query(sparql_query, label="label")
         if results["results"]["bindings"]:
             return results["results"]["bindings"][0]["label"]["value"]
         else:
@@ -26,6 +30,9 @@ def fetch_label(uri):
         print(f"Error fetching label for {uri}: {e}")
         return "Error fetching label"
 
+async def afetch_label(uri):
+    return (await afetch_labels([uri]))[uri]
+
 def fetch_cast_uri(uri, nama):
     uriid = uri.split("/")[-1]
     sparql_query = f"""
@@ -37,82 +44,345 @@ def fetch_cast_uri(uri, nama):
         wd:{uriid} wdt:P31 wd:Q11424 ;
             wdt:P161 ?cast.
         ?cast rdfs:label ?nama
-        FILTER(?nama = "{nama}"@en) 
+        FILTER(?nama = "{escape_literal(nama)}"@en) 
     }} LIMIT 1
     """
-    wikidata_sparql.setQuery(sparql_query)
 
     try:
-        results = wikidata_sparql.query().convert()
+        results = wikidata_sparql.query(sparql_query, label="actor:cast_uri")
         result = results["results"]["bindings"][0]
 
         return result["cast"]["value"]
 
+    except SkippedCall:
+        raise
     except Exception as e:
         return {"error": str(e)}
 
-def process_actors(data_movie):
-    stars = data_movie.get("stars", "").split(", ")
-    movie_wikidata_uri = data_movie.get("wikidataUri", "")
+def _labels_query(uris):
+    values = " ".join(f"<{uri}>" for uri in uris)
+    return f"""
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?uri ?label WHERE {{
+        VALUES ?uri {{ {values} }}
+        ?uri rdfs:label ?label .
+    }}
+    """
+
+
+def _collect_labels(labels, batch, results):
+    if isinstance(results, Exception):
+        print(f"Error fetching labels: {results}")
+        for uri in batch:
+            labels[uri] = "Error fetching label"
+        return
+    for binding in results["results"]["bindings"]:
+        labels.setdefault(binding["uri"]["value"], binding["label"]["value"])
+    for uri in batch:
+        labels.setdefault(uri, "Label tidak ditemukan")
+
+
+def fetch_labels(uris):
+    # Mengambil label banyak URI lokal sekaligus dengan VALUES
+    labels = {}
+    for batch in chunked(uris, settings.ACTOR_BATCH_SIZE):
+        try:
+            results = local_sparql.query(_labels_query(batch), label="labels")
+        except Exception as e:
+            results = e
+        _collect_labels(labels, batch, results)
+    return labels
+
+
+async def afetch_labels(uris):
+    labels = {}
+    batches = list(chunked(uris, settings.ACTOR_BATCH_SIZE))
+    responses = await asyncio.gather(
+        *(local_sparql.aquery(_labels_query(batch), label="labels") for batch in batches),
+        return_exceptions=True,
+    )
+    for batch, results in zip(batches, responses):
+        _collect_labels(labels, batch, results)
+    return labels
+
+
+def _cast_uris_query(uri, names):
+    uriid = uri.split("/")[-1]
+    values = " ".join(f'"{escape_literal(nama)}"@en' for nama in names)
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT DISTINCT ?cast ?nama WHERE {{
+        VALUES ?nama {{ {values} }}
+        wd:{uriid} wdt:P31 wd:Q11424 ;
+            wdt:P161 ?cast.
+        ?cast rdfs:label ?nama
+    }}
+    """
+
+
+def _collect_cast_uris(cast_uris, uri, results):
+    # Query yang dilewati (circuit terbuka/deadline habis) membuat section
+    # aktor ditandai tidak tersedia, bukan diisi data setengah jadi
+    if isinstance(results, SkippedCall):
+        raise results
+    if isinstance(results, Exception):
+        print(f"Error fetching cast URIs for {uri}: {results}")
+        return
+    for binding in results["results"]["bindings"]:
+        cast_uris.setdefault(binding["nama"]["value"], binding["cast"]["value"])
+
+
+def fetch_cast_uris(uri, names):
+    # Mencocokkan banyak nama aktor ke cast (P161) film dalam satu query
+    cast_uris = {}
+    for batch in chunked(names, settings.ACTOR_BATCH_SIZE):
+        try:
+            results = wikidata_sparql.query(_cast_uris_query(uri, batch), label="actor:cast_uri")
+        except Exception as e:
+            results = e
+        _collect_cast_uris(cast_uris, uri, results)
+    return cast_uris
+
+
+async def afetch_cast_uris(uri, names):
+    cast_uris = {}
+    responses = await asyncio.gather(
+        *(wikidata_sparql.aquery(_cast_uris_query(uri, batch), label="actor:cast_uri") for batch in chunked(names, settings.ACTOR_BATCH_SIZE)),
+        return_exceptions=True,
+    )
+    for results in responses:
+        _collect_cast_uris(cast_uris, uri, results)
+    return cast_uris
+
+
+def _parse_stars(data_movie):
+    stars = [star.strip() for star in data_movie.get("stars", "").split(", ") if star.strip()]
+    return stars, data_movie.get("wikidataUri", "")
+
 
-    # Mengambil nama aktor lokal
+def _wikidata_actors_query(movie_wikidata_uri):
+    # Mengambil nama aktor dari wikidata dengan limit 20
+    if not movie_wikidata_uri.startswith("http://www.wikidata.org/entity/"):
+        return None
+    movie_id = movie_wikidata_uri.split('/')[-1]
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?actor ?actorLabel ?image WHERE {{
+        wd:{movie_id} wdt:P161 ?actor .
+        OPTIONAL {{ ?actor wdt:P18 ?image. }}
+        OPTIONAL {{ ?actor rdfs:label ?enLabel. FILTER(LANG(?enLabel) = "en") }}
+        BIND(COALESCE(?enLabel, STRAFTER(STR(?actor), STR(wd:))) AS ?actorLabel)
+    }}
+    LIMIT 20
+    """
+
+
+def _merge_actors(stars, star_labels, cast_uris, wd_results):
+    # Aktor lokal lebih dulu, lalu aktor Wikidata yang belum ada di lokal
     local_actor_names = set()
     actors_final = []
-
     for star_uri in stars:
-        if star_uri.strip():
-            star_label = fetch_label(star_uri.strip())
-            uri_star = fetch_cast_uri(data_movie["wikidataUri"], star_label)
-            if isinstance(uri_star, dict) and "error" in uri_star:
-                local_actor_names.add(star_label)
-                actors_final.append({
-                    "label": star_label,
-                    "uri": None,
-                    "image": None 
-                })
-            else:
-                local_actor_names.add(star_label)
+        star_label = star_labels[star_uri]
+        local_actor_names.add(star_label)
+        actors_final.append({
+            "label": star_label,
+            "uri": cast_uris.get(star_label),
+            "image": None
+        })
+
+    if isinstance(wd_results, SkippedCall):
+        raise wd_results
+    if isinstance(wd_results, Exception):
+        print(f"Error fetching actors from Wikidata: {wd_results}")
+    elif wd_results is not None:
+        for wd_result in wd_results["results"]["bindings"]:
+            actor_label = wd_result["actorLabel"]["value"]
+            actor_uri = wd_result["actor"]["value"]
+            actor_image = wd_result.get("image", {}).get("value", None)
+            remember_images({actor_uri: actor_image})
+            if actor_label not in local_actor_names:
                 actors_final.append({
-                    "label": star_label,
-                    "uri": uri_star,
-                    "image": None 
+                    "label": actor_label,
+                    "uri": actor_uri,
+                    "image": actor_image 
                 })
-    
-    # Mengambil nama aktor dari wikidata dengan limit 20
-    if movie_wikidata_uri.startswith("http://www.wikidata.org/entity/"):
-        movie_id = movie_wikidata_uri.split('/')[-1]
-        sparql_query_wikidata = f"""
-        PREFIX wd: <http://www.wikidata.org/entity/>
-        PREFIX wdt: <http://www.wikidata.org/prop/direct/>
-        PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-        SELECT ?actor ?actorLabel ?image WHERE {{
-            wd:{movie_id} wdt:P161 ?actor .
-            OPTIONAL {{ ?actor wdt:P18 ?image. }}
-            SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
-        }}
-        LIMIT 20
-        """
-        wikidata_sparql.setQuery(sparql_query_wikidata)
+    return actors_final
+
+
+def _missing_images(actors):
+    return [actor["uri"] for actor in actors if actor["image"] is None and actor["uri"]]
+
+
+def _fill_images(actors, images):
+    for actor in actors:
+        if actor["image"] is None and actor["uri"]:
+            actor["image"] = images.get(actor["uri"])
+    return actors
+
+
+def process_actors(data_movie):
+    stars, movie_wikidata_uri = _parse_stars(data_movie)
+
+    # Mengambil nama aktor lokal lalu mencocokkannya ke Wikidata secara batch
+    star_labels = fetch_labels(stars)
+    cast_uris = {}
+    if stars:
+        cast_uris = fetch_cast_uris(movie_wikidata_uri, sorted(set(star_labels.values())))
+
+    wd_results = None
+    sparql_query_wikidata = _wikidata_actors_query(movie_wikidata_uri)
+    if sparql_query_wikidata:
         try:
-            wd_results = wikidata_sparql.query().convert()
-            for wd_result in wd_results["results"]["bindings"]:
-                actor_label = wd_result["actorLabel"]["value"]
-                actor_uri = wd_result["actor"]["value"]
-                actor_image = wd_result.get("image", {}).get("value", None)
-                if actor_label not in local_actor_names:
-                    actors_final.append({
-                        "label": actor_label,
-                        "uri": actor_uri,
-                        "image": actor_image 
-                    })
+            wd_results = wikidata_sparql.query(sparql_query_wikidata, label="actor:wikidata")
         except Exception as e:
-            print(f"Error fetching actors from Wikidata: {e}")
+            wd_results = e
+    actors_final = _merge_actors(stars, star_labels, cast_uris, wd_results)
 
-    # Mengambil foto untuk setiap aktor
-    for actor in actors_final:
-        if actor["image"] is None and actor["uri"]:
-            actor_image = fetch_image(actor["uri"])
-            actor["image"] = actor_image
+    # Mengambil foto semua aktor yang belum punya gambar dalam satu query
+    missing = _missing_images(actors_final)
+    images = fetch_images(missing) if missing else {}
+    return _fill_images(actors_final, images)
+
+
+async def aprocess_actors(data_movie):
+    stars, movie_wikidata_uri = _parse_stars(data_movie)
+
+    # Aktor Wikidata tidak bergantung pada label lokal, jadi di-query
+    # bersamaan dengan label; pencocokan cast menunggu label selesai
+    async def wikidata_actors():
+        sparql_query_wikidata = _wikidata_actors_query(movie_wikidata_uri)
+        if not sparql_query_wikidata:
+            return None
+        try:
+            return await wikidata_sparql.aquery(sparql_query_wikidata, label="actor:wikidata")
+        except Exception as e:
+            return e
+
+    async def labels_and_cast():
+        star_labels = await afetch_labels(stars)
+        cast_uris = {}
+        if stars:
+            cast_uris = await afetch_cast_uris(movie_wikidata_uri, sorted(set(star_labels.values())))
+        return star_labels, cast_uris
+
+    (star_labels, cast_uris), wd_results = await asyncio.gather(labels_and_cast(), wikidata_actors())
+    actors_final = _merge_actors(stars, star_labels, cast_uris, wd_results)
+
+    missing = _missing_images(actors_final)
+    images = await afetch_images(missing) if missing else {}
+    return _fill_images(actors_final, images)
+
+
+def _cast_uris_batch_query(pairs):
+    values = " ".join(
+        f'(wd:{film.split("/")[-1]} "{escape_literal(nama)}"@en)' for film, nama in pairs
+    )
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT DISTINCT ?film ?cast ?nama WHERE {{
+        VALUES (?film ?nama) {{ {values} }}
+        ?film wdt:P31 wd:Q11424 ;
+            wdt:P161 ?cast.
+        ?cast rdfs:label ?nama
+    }}
+    """
+
+
+def fetch_cast_uris_batch(names_by_film):
+    # Sama dengan fetch_cast_uris, tetapi untuk banyak film sekaligus:
+    # film -> {nama: URI cast}
+    pairs = [(film, nama) for film, names in names_by_film.items() for nama in names]
+    cast_uris = {film: {} for film in names_by_film}
+    for batch in chunked(pairs, settings.ACTOR_BATCH_SIZE):
+        try:
+            results = wikidata_sparql.query(_cast_uris_batch_query(batch), label="actor:cast_uri")
+        except SkippedCall:
+            raise
+        except Exception as e:
+            print(f"Error fetching cast URIs: {e}")
+            continue
+        for binding in results["results"]["bindings"]:
+            cast_uris[binding["film"]["value"]].setdefault(binding["nama"]["value"], binding["cast"]["value"])
+    return cast_uris
+
+
+def _wikidata_actors_batch_query(films):
+    values = " ".join(f"wd:{film.split('/')[-1]}" for film in films)
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?film ?actor ?actorLabel ?image WHERE {{
+        VALUES ?film {{ {values} }}
+        ?film wdt:P161 ?actor .
+        OPTIONAL {{ ?actor wdt:P18 ?image. }}
+        OPTIONAL {{ ?actor rdfs:label ?enLabel. FILTER(LANG(?enLabel) = "en") }}
+        BIND(COALESCE(?enLabel, STRAFTER(STR(?actor), STR(wd:))) AS ?actorLabel)
+    }}
+    """
+
+
+def fetch_wikidata_actors_batch(films):
+    # Aktor Wikidata untuk banyak film, dibatasi 20 baris per film seperti
+    # LIMIT 20 pada query per film. Hasil per film berbentuk hasil SPARQL
+    # (atau Exception) agar bisa langsung dipakai _merge_actors
+    actors = {}
+    for batch in chunked(films, settings.ENRICHMENT_BATCH_SIZE):
+        try:
+            results = wikidata_sparql.query(_wikidata_actors_batch_query(batch), label="actor:wikidata")
+        except Exception as e:
+            for film in batch:
+                actors[film] = e
+            continue
+        for film in batch:
+            actors[film] = {"results": {"bindings": []}}
+        for binding in results["results"]["bindings"]:
+            bindings = actors[binding["film"]["value"]]["results"]["bindings"]
+            if len(bindings) < 20:
+                bindings.append(binding)
+    return actors
+
+
+def process_actors_batch(movies):
+    """
+    Versi batch dari process_actors untuk banyak film (URI -> data_movie):
+    label, pencocokan cast, aktor Wikidata, dan foto masing-masing diambil
+    dengan query VALUES gabungan. Hasil: URI film -> daftar aktor.
+    """
+    stars_by_movie = {uri: _parse_stars(data_movie) for uri, data_movie in movies.items()}
+    all_stars = list(dict.fromkeys(star for stars, _ in stars_by_movie.values() for star in stars))
+    star_labels = fetch_labels(all_stars)
+
+    names_by_film = {}
+    films = []
+    for stars, film in stars_by_movie.values():
+        if not film.startswith("http://www.wikidata.org/entity/"):
+            continue
+        films.append(film)
+        if stars:
+            names = names_by_film.setdefault(film, set())
+            names.update(star_labels[star] for star in stars)
+    films = list(dict.fromkeys(films))
+    cast_uris = fetch_cast_uris_batch({film: sorted(names) for film, names in names_by_film.items()})
+    wd_actors = fetch_wikidata_actors_batch(films)
+
+    actors = {}
+    for uri, (stars, film) in stars_by_movie.items():
+        actors[uri] = _merge_actors(stars, star_labels, cast_uris.get(film, {}), wd_actors.get(film))
 
-    return actors_final
\ No newline at end of file
+    missing = [actor_uri for movie_actors in actors.values() for actor_uri in _missing_images(movie_actors)]
+    images = fetch_images(missing) if missing else {}
+    for movie_actors in actors.values():
+        _fill_images(movie_actors, images)
+    return actors
@@ -0,0 +1,44 @@
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+
+APP_DIR = Path(__file__).resolve().parents[1]
+TEMPLATE_DIR = APP_DIR / "templates"
+
+
+def files_fingerprint(paths):
+    digest = hashlib.sha1()
+    for path in paths:
+        digest.update(str(Path(path).relative_to(APP_DIR)).encode("utf-8"))
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def detail_templates():
+    return [TEMPLATE_DIR / "detail_movie.html"] + sorted((TEMPLATE_DIR / "detail").glob("*.html"))
+
+
+def _build_files():
+    # Template dan kode view yang menentukan isi HTML/JSON response
+    return (
+        sorted(TEMPLATE_DIR.rglob("*.html")) + sorted(APP_DIR.glob("*.py")) + sorted((APP_DIR / "utils").glob("*.py"))
+    )
+
+
+@lru_cache(maxsize=None)
+def build_version():
+    """
+    Versi build aplikasi: BUILD_VERSION jika diisi (mis. commit git saat
+    deploy), selain itu fingerprint template dan kode view. Dihitung sekali
+    per proses, deploy baru selalu memulai proses baru.
+    """
+    return settings.BUILD_VERSION or files_fingerprint(_build_files())
+
+
+@lru_cache(maxsize=None)
+def build_timestamp():
+    # Waktu perubahan terakhir file build (detik epoch)
+    return max(int(os.stat(path).st_mtime) for path in _build_files())
@@ -0,0 +1,236 @@
+from collections import OrderedDict
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+MISS = object()
+
+
+class LRUCache:
+    # Cache in-memory dengan jumlah entry terbatas, entry terlama dibuang
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISS
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return MISS
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at=None):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ResponseCache:
+    """
+    Cache payload response (bytes) yang dibatasi jumlah entry dan total
+    ukuran. Entry yang di-pin tidak pernah dibuang saat cache penuh. Semua
+    entry dihapus begitu versi dataset berubah.
+    """
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.version = None
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._pinned = {}
+        self._lock = threading.Lock()
+
+    def _check_version(self, version):
+        if version != self.version:
+            self._entries.clear()
+            self._pinned.clear()
+            self.size = 0
+            self.version = version
+
+    def _remove(self, key):
+        value = self._pinned.pop(key, None)
+        if value is None:
+            value = self._entries.pop(key, None)
+        if value is not None:
+            self.size -= len(value)
+
+    def get(self, key, version):
+        with self._lock:
+            self._check_version(version)
+            value = self._pinned.get(key)
+            if value is None:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+            if value is None:
+                self.misses += 1
+                return MISS
+            self.hits += 1
+            return value
+
+    def set(self, key, value, version, pinned=False):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            self._check_version(version)
+            self._remove(key)
+            if pinned:
+                self._pinned[key] = value
+            else:
+                self._entries[key] = value
+            self.size += len(value)
+            while self._entries and (
+                len(self._entries) + len(self._pinned) > self.max_entries or self.size > self.max_bytes
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "pinned": len(self._pinned),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._pinned.clear()
+            self.size = 0
+
+
+class SqliteStore:
+    # Penyimpanan persisten di disk, satu koneksi per thread
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)"
+            )
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return MISS, None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            with self._connection() as conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            return MISS, None
+        return json.loads(value), expires_at
+
+    def set(self, key, value, expires_at=None):
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries")
+
+
+class TieredCache:
+    """
+    Cache dua tingkat: LRU in-memory lalu SQLite di disk. Hit dari disk
+    dinaikkan ke memory. Counter hit/miss dicatat per namespace.
+    """
+
+    def __init__(self, max_entries, path):
+        self.memory = LRUCache(max_entries)
+        self.disk = SqliteStore(path)
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, namespace, field):
+        with self._stats_lock:
+            stats = self._stats.setdefault(namespace, {"memory_hits": 0, "disk_hits": 0, "misses": 0})
+            stats[field] += 1
+
+    def get(self, namespace, key):
+        value = self.memory.get(key)
+        if value is not MISS:
+            self._count(namespace, "memory_hits")
+            return value
+        value, expires_at = self.disk.get(key)
+        if value is not MISS:
+            self.memory.set(key, value, expires_at)
+            self._count(namespace, "disk_hits")
+            return value
+        self._count(namespace, "misses")
+        return MISS
+
+    def set(self, namespace, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl is not None else None
+        self.memory.set(key, value, expires_at)
+        self.disk.set(key, value, expires_at)
+
+    def stats(self):
+        with self._stats_lock:
+            return {namespace: dict(stats) for namespace, stats in self._stats.items()}
+
+    def clear(self):
+        self.memory.clear()
+        self.disk.clear()
+
+
+_sparql_caches = {}
+_sparql_caches_lock = threading.Lock()
+
+
+def get_sparql_cache():
+    path = settings.SPARQL_CACHE_PATH
+    with _sparql_caches_lock:
+        cache = _sparql_caches.get(path)
+        if cache is None:
+            cache = TieredCache(settings.SPARQL_CACHE_MEMORY_SIZE, path)
+            _sparql_caches[path] = cache
+        return cache
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = ResponseCache(settings.SEARCH_CACHE_MAX_ENTRIES, settings.SEARCH_CACHE_MAX_BYTES)
+        return _search_cache
@@ -0,0 +1,46 @@
+import hashlib
+import json
+import os
+
+from django.conf import settings
+
+_stamp = (None, None)
+
+
+def _loaded_version():
+    # Versi dari stamp manage.py load_dataset, dibaca ulang hanya jika filenya berubah
+    global _stamp
+    path = os.path.join(settings.DATASET_STATE_DIR, "dataset.json")
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    if _stamp[0] != mtime:
+        try:
+            with open(path, encoding="utf-8") as f:
+                _stamp = (mtime, json.load(f).get("version"))
+        except (OSError, ValueError) as e:
+            print(f"Error reading dataset stamp {path}: {e}")
+            return None
+    return _stamp[1]
+
+
+def get_dataset_version():
+    # Versi dataset lokal, berubah setiap kali file RDF atau snapshot
+    # Wikidata diganti. Dapat dipaksa lewat setting DATASET_VERSION
+    if settings.DATASET_VERSION:
+        return settings.DATASET_VERSION
+    if settings.LOCAL_SPARQL_BACKEND == "graphdb":
+        version = _loaded_version()
+        if version:
+            return version
+    stamps = []
+    for path in (settings.RDF_DATA_PATH, settings.WIKIDATA_SNAPSHOT_PATH):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        stamps.append(f"{stat.st_size}:{stat.st_mtime_ns}")
+    if not stamps:
+        return "unknown"
+    return hashlib.sha1("|".join(stamps).encode("utf-8")).hexdigest()[:12]
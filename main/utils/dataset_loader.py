@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import time
+from urllib.parse import quote
+
+import requests
+from django.conf import settings
+from rdflib import BNode, Graph
+from rdflib.compare import to_canonical_graph
+
+from .sparql import chunked
+
+META_GRAPH = "http://nama-kelompok.org/graph/meta"
+DATASET_VERSION_PREDICATE = "http://nama-kelompok.org/vocab#datasetVersion"
+
+
+def dataset_graphs():
+    # (key state, named graph atau None untuk default graph, path file)
+    graphs = [("default", None, settings.RDF_DATA_PATH)]
+    if os.path.exists(settings.WIKIDATA_SNAPSHOT_PATH):
+        graphs.append(("wikidata", settings.WIKIDATA_GRAPH, settings.WIKIDATA_SNAPSHOT_PATH))
+    return graphs
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def canonical_ntriples(path):
+    """
+    Isi file RDF sebagai daftar baris N-Triples yang unik dan terurut.
+    Blank node diberi label kanonik agar tidak dianggap berubah setiap parse.
+    """
+    graph = Graph().parse(str(path), format="turtle")
+    if any(isinstance(term, BNode) for triple in graph for term in triple):
+        graph = to_canonical_graph(graph)
+    return sorted(set(line for line in graph.serialize(format="nt").splitlines() if line.strip()))
+
+
+def diff_sorted(old, new):
+    """
+    Membandingkan dua iterable baris terurut (merge, satu kali jalan).
+    Mengembalikan (removed, added).
+    """
+    removed, added = [], []
+    old, new = iter(old), iter(new)
+    a, b = next(old, None), next(new, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a < b):
+            removed.append(a)
+            a = next(old, None)
+        elif a is None or b < a:
+            added.append(b)
+            b = next(new, None)
+        else:
+            a, b = next(old, None), next(new, None)
+    return removed, added
+
+
+def combined_version(graph_versions):
+    raw = "|".join(f"{key}:{graph_versions[key]}" for key in sorted(graph_versions))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12]
+
+
+class DatasetState:
+    """
+    Versi yang terakhir dimuat ke GraphDB: dataset.json (stamp yang dibaca
+    get_dataset_version) dan satu file N-Triples kanonik per graph.
+    """
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        self.stamp_path = os.path.join(self.directory, "dataset.json")
+        self.stamp = {}
+        try:
+            with open(self.stamp_path, encoding="utf-8") as f:
+                self.stamp = json.load(f)
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"Error reading dataset stamp {self.stamp_path}: {e}")
+
+    def graph(self, key):
+        return self.stamp.get("graphs", {}).get(key)
+
+    def lines(self, key):
+        path = os.path.join(self.directory, f"{key}.nt")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return [line.rstrip("\n") for line in f]
+
+    def _write(self, path, content):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def save(self, graphs, lines):
+        os.makedirs(self.directory, exist_ok=True)
+        for key, graph_lines in lines.items():
+            self._write(os.path.join(self.directory, f"{key}.nt"), "".join(f"{line}\n" for line in graph_lines))
+        # Stamp ditulis terakhir: jika proses mati di tengah, stamp lama tetap
+        # tidak cocok dengan GraphDB dan run berikutnya memuat ulang penuh
+        self.stamp = {
+            "version": combined_version({key: graph["version"] for key, graph in graphs.items()}),
+            "loadedAt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "graphs": graphs,
+        }
+        self._write(self.stamp_path, json.dumps(self.stamp, indent=2))
+
+
+class GraphDBLoader:
+    # Menulis ke repository GraphDB lewat SPARQL UPDATE dan Graph Store API
+    def __init__(self, repository_url, batch_size):
+        self.repository_url = repository_url.rstrip("/")
+        self.batch_size = batch_size
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = settings.SPARQL_USER_AGENT
+        self.timeout = (settings.SPARQL_CONNECT_TIMEOUT, max(settings.SPARQL_READ_TIMEOUT, 300))
+
+    def wait_until_ready(self, seconds):
+        deadline = time.monotonic() + seconds
+        while True:
+            try:
+                self.session.get(f"{self.repository_url}/size", timeout=self.timeout).raise_for_status()
+                return
+            except requests.RequestException:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(2)
+
+    def update(self, update):
+        response = self.session.post(f"{self.repository_url}/statements", data={"update": update}, timeout=self.timeout)
+        response.raise_for_status()
+
+    def _graph_block(self, graph, lines):
+        triples = "\n".join(lines)
+        return f"GRAPH <{graph}> {{\n{triples}\n}}" if graph else triples
+
+    def apply(self, graph, removed, added):
+        # Hapus dulu baru tambah, per batch agar request tidak terlalu besar
+        for batch in chunked(removed, self.batch_size):
+            self.update(f"DELETE DATA {{\n{self._graph_block(graph, batch)}\n}}")
+        for batch in chunked(added, self.batch_size):
+            self.update(f"INSERT DATA {{\n{self._graph_block(graph, batch)}\n}}")
+
+    def replace(self, graph, lines):
+        # Isi graph diganti seluruhnya (Graph Store HTTP PUT)
+        target = f"graph={quote(graph, safe='')}" if graph else "default"
+        response = self.session.put(
+            f"{self.repository_url}/rdf-graphs/service?{target}",
+            data="".join(f"{line}\n" for line in lines).encode("utf-8"),
+            headers={"Content-Type": "application/n-triples"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+
+    def loaded_version(self):
+        response = self.session.get(
+            self.repository_url,
+            params={"query": f"SELECT ?version WHERE {{ GRAPH <{META_GRAPH}> {{ <{META_GRAPH}> <{DATASET_VERSION_PREDICATE}> ?version }} }}"},
+            headers={"Accept": "application/sparql-results+json"},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        bindings = response.json()["results"]["bindings"]
+        return bindings[0]["version"]["value"] if bindings else None
+
+    def set_loaded_version(self, version):
+        self.update(
+            f"DELETE WHERE {{ GRAPH <{META_GRAPH}> {{ <{META_GRAPH}> <{DATASET_VERSION_PREDICATE}> ?version }} }};\n"
+            f'INSERT DATA {{ GRAPH <{META_GRAPH}> {{ <{META_GRAPH}> <{DATASET_VERSION_PREDICATE}> "{version}" }} }}'
+        )
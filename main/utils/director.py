@@ -1,32 +1,87 @@
-from .sparql import wikidata_sparql, local_sparql
-from .image import fetch_image  
-from .actor import fetch_label 
+from django.conf import settings
 
-def fetch_director_uri(uri, nama):
+from .sparql import wikidata_sparql, escape_literal, chunked
+from .image import afetch_image, fetch_image, fetch_images, remember_images
+from .actor import afetch_label, fetch_label, fetch_labels
+from .resilience import SkippedCall
+
+def _director_uri_query(uri, nama):
     uriid = uri.split("/")[-1]
-    sparql_query = f"""
+    return f"""
     PREFIX wd: <http://www.wikidata.org/entity/>
     PREFIX wdt: <http://www.wikidata.org/prop/direct/>
     PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
 
     SELECT DISTINCT ?director WHERE {{
         wd:{uriid} wdt:P57 ?director .
-        ?director rdfs:label "{nama}"@en
+        ?director rdfs:label "{escape_literal(nama)}"@en
     }} LIMIT 1
     """
-    wikidata_sparql.setQuery(sparql_query)
 
+def _parse_director_uri(results, nama):
+    if results["results"]["bindings"]:
+        return results["results"]["bindings"][0]["director"]["value"]
+    else:
+        print(f"No director URI found for {nama}")
+        return {"error": f"No director URI found for {nama}"}
+
+def fetch_director_uri(uri, nama):
     try:
-        results = wikidata_sparql.query().convert()
-        if results["results"]["bindings"]:
-            return results["results"]["bindings"][0]["director"]["value"]
-        else:
-            print(f"No director URI found for {nama}")
-            return {"error": f"No director URI found for {nama}"}
+        results = wikidata_sparql.query(_director_uri_query(uri, nama), label="director:uri")
+        return _parse_director_uri(results, nama)
+    except SkippedCall:
+        raise
     except Exception as e:
         print(f"Error fetching director URI for {nama}: {e}")
         return {"error": str(e)}
 
+async def afetch_director_uri(uri, nama):
+    try:
+        results = await wikidata_sparql.aquery(_director_uri_query(uri, nama), label="director:uri")
+        return _parse_director_uri(results, nama)
+    except SkippedCall:
+        raise
+    except Exception as e:
+        print(f"Error fetching director URI for {nama}: {e}")
+        return {"error": str(e)}
+
+def _wikidata_director_query(movie_wikidata_uri):
+    # Mengambil nama director jika tidak ada di lokal
+    if not movie_wikidata_uri.startswith("http://www.wikidata.org/entity/"):
+        return None
+    movie_id = movie_wikidata_uri.split('/')[-1]
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?director ?directorLabel ?image WHERE {{
+        wd:{movie_id} wdt:P57 ?director .
+        OPTIONAL {{ ?director wdt:P18 ?image. }}
+        OPTIONAL {{ ?director rdfs:label ?enLabel. FILTER(LANG(?enLabel) = "en") }}
+        BIND(COALESCE(?enLabel, STRAFTER(STR(?director), STR(wd:))) AS ?directorLabel)
+    }}
+    LIMIT 1
+    """
+
+def _no_director():
+    return {"label": "Tidak terdapat data director", "image": None, "uri": None}
+
+def _parse_wikidata_director(results):
+    # Mengembalikan (director, perlu_gambar); None jika tidak ada director
+    if not results["results"]["bindings"]:
+        return None, False
+    binding = results["results"]["bindings"][0]
+    director = {
+        "label": binding["directorLabel"]["value"],
+        "image": binding.get("image", {}).get("value", None),
+        "uri": binding["director"]["value"],
+    }
+    if director["image"] is None and director["uri"]:
+        return director, True
+    remember_images({director["uri"]: director["image"]})
+    return director, False
+
 def process_director(data_movie):
     director_uri = data_movie.get("director", "")
     if director_uri.startswith("http://"):
@@ -47,44 +102,148 @@ def process_director(data_movie):
             "uri": director_uri_final,
         }
     else:
-        # Mengambil nama director jika tidak ada di lokal
-        director_label = "Tidak terdapat data director"
-        director_uri_final = None
-        director_image = None
-        if data_movie.get("wikidataUri", "").startswith("http://www.wikidata.org/entity/"):
-            movie_id = data_movie["wikidataUri"].split('/')[-1]
-            sparql_query_director_wikidata = f"""
-            PREFIX wd: <http://www.wikidata.org/entity/>
-            PREFIX wdt: <http://www.wikidata.org/prop/direct/>
-            PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-
-            SELECT ?director ?directorLabel ?image WHERE {{
-                wd:{movie_id} wdt:P57 ?director .
-                OPTIONAL {{ ?director wdt:P18 ?image. }}
-                SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
-            }}
-            LIMIT 1
-            """
-            wikidata_sparql.setQuery(sparql_query_director_wikidata)
+        data_movie["director"] = _no_director()
+        sparql_query_director_wikidata = _wikidata_director_query(data_movie.get("wikidataUri", ""))
+        if sparql_query_director_wikidata:
             try:
-                director_wd_results = wikidata_sparql.query().convert()
-                if director_wd_results["results"]["bindings"]:
-                    director_label = director_wd_results["results"]["bindings"][0]["directorLabel"]["value"]
-                    director_uri = director_wd_results["results"]["bindings"][0]["director"]["value"]
-                    director_image = director_wd_results["results"]["bindings"][0].get("image", {}).get("value", None)
-                    if director_image is None and director_uri:
-                        director_image = fetch_image(director_uri)
-                    data_movie["director"] = {
-                        "label": director_label,
-                        "image": director_image,
-                        "uri": director_uri,
-                    }
-                else:
-                    data_movie["director"] = {"label": director_label, "image": director_image, "uri": director_uri_final}
+                director_wd_results = wikidata_sparql.query(sparql_query_director_wikidata, label="director:wikidata")
+                director, needs_image = _parse_wikidata_director(director_wd_results)
+                if director:
+                    if needs_image:
+                        director["image"] = fetch_image(director["uri"])
+                    data_movie["director"] = director
+            except SkippedCall:
+                raise
             except Exception as e:
                 print(f"Error fetching director from Wikidata: {e}")
-                data_movie["director"] = {"label": director_label, "image": director_image, "uri": director_uri_final}
-        else:
-            data_movie["director"] = {"label": director_label, "image": director_image, "uri": director_uri_final}
 
-    return data_movie
\ No newline at end of file
+    return data_movie
+
+async def aprocess_director(data_movie):
+    # Versi async dari process_director, mengembalikan dict director saja
+    director_uri = data_movie.get("director", "")
+    if director_uri.startswith("http://"):
+        director_label = await afetch_label(director_uri)
+        uri_director = await afetch_director_uri(data_movie["wikidataUri"], director_label)
+        if isinstance(uri_director, dict) and "error" in uri_director:
+            return {"label": director_label, "image": None, "uri": None}
+        director_image = await afetch_image(uri_director) if uri_director else None
+        return {"label": director_label, "image": director_image, "uri": uri_director}
+
+    sparql_query_director_wikidata = _wikidata_director_query(data_movie.get("wikidataUri", ""))
+    if not sparql_query_director_wikidata:
+        return _no_director()
+    try:
+        director_wd_results = await wikidata_sparql.aquery(sparql_query_director_wikidata, label="director:wikidata")
+        director, needs_image = _parse_wikidata_director(director_wd_results)
+        if not director:
+            return _no_director()
+        if needs_image:
+            director["image"] = await afetch_image(director["uri"])
+        return director
+    except SkippedCall:
+        raise
+    except Exception as e:
+        print(f"Error fetching director from Wikidata: {e}")
+        return _no_director()
+
+def _director_uris_batch_query(pairs):
+    values = " ".join(
+        f'(wd:{film.split("/")[-1]} "{escape_literal(nama)}"@en)' for film, nama in pairs
+    )
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT DISTINCT ?film ?nama ?director WHERE {{
+        VALUES (?film ?nama) {{ {values} }}
+        ?film wdt:P57 ?director .
+        ?director rdfs:label ?nama
+    }}
+    """
+
+def _wikidata_directors_batch_query(films):
+    values = " ".join(f"wd:{film.split('/')[-1]}" for film in films)
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?film ?director ?directorLabel ?image WHERE {{
+        VALUES ?film {{ {values} }}
+        ?film wdt:P57 ?director .
+        OPTIONAL {{ ?director wdt:P18 ?image. }}
+        OPTIONAL {{ ?director rdfs:label ?enLabel. FILTER(LANG(?enLabel) = "en") }}
+        BIND(COALESCE(?enLabel, STRAFTER(STR(?director), STR(wd:))) AS ?directorLabel)
+    }}
+    """
+
+def _batch_bindings(query_builder, items, size, label):
+    # Menjalankan query batch per potongan; potongan yang gagal dilewati,
+    # tetapi query yang dilewati (SkippedCall) membuat section tidak tersedia
+    bindings = []
+    for batch in chunked(items, size):
+        try:
+            bindings.extend(wikidata_sparql.query(query_builder(batch), label=label)["results"]["bindings"])
+        except SkippedCall:
+            raise
+        except Exception as e:
+            print(f"Error fetching directors from Wikidata: {e}")
+    return bindings
+
+def process_directors_batch(movies):
+    """
+    Versi batch dari process_director untuk banyak film (URI -> data_movie).
+    Label director lokal, pencocokan URI Wikidata, director dari Wikidata
+    untuk film tanpa director lokal, dan fotonya masing-masing diambil
+    dengan query VALUES gabungan. Hasil: URI film -> dict director.
+    """
+    local = {}
+    fallback = {}
+    for uri, data_movie in movies.items():
+        director_uri = data_movie.get("director", "")
+        wikidata_uri = data_movie.get("wikidataUri", "")
+        if director_uri.startswith("http://"):
+            local[uri] = (director_uri, wikidata_uri)
+        elif wikidata_uri.startswith("http://www.wikidata.org/entity/"):
+            fallback[uri] = wikidata_uri
+
+    labels = fetch_labels(list(dict.fromkeys(director_uri for director_uri, _ in local.values())))
+    pairs = list(dict.fromkeys(
+        (wikidata_uri, labels[director_uri])
+        for director_uri, wikidata_uri in local.values()
+        if wikidata_uri.startswith("http://www.wikidata.org/entity/")
+    ))
+    matched = {}
+    for binding in _batch_bindings(_director_uris_batch_query, pairs, settings.ACTOR_BATCH_SIZE, "director:uri"):
+        matched.setdefault((binding["film"]["value"], binding["nama"]["value"]), binding["director"]["value"])
+
+    found = {}
+    for binding in _batch_bindings(
+        _wikidata_directors_batch_query, list(dict.fromkeys(fallback.values())), settings.ENRICHMENT_BATCH_SIZE,
+        "director:wikidata",
+    ):
+        # Seperti LIMIT 1 pada query per film: ambil baris pertama saja
+        film = binding["film"]["value"]
+        if film not in found:
+            found[film], _ = _parse_wikidata_director({"results": {"bindings": [binding]}})
+
+    directors = {}
+    for uri, (director_uri, wikidata_uri) in local.items():
+        label = labels[director_uri]
+        directors[uri] = {"label": label, "image": None, "uri": matched.get((wikidata_uri, label))}
+    for uri, wikidata_uri in fallback.items():
+        directors[uri] = dict(found[wikidata_uri]) if wikidata_uri in found else _no_director()
+    for uri in movies:
+        directors.setdefault(uri, _no_director())
+
+    missing = [
+        director["uri"] for uri, director in directors.items()
+        if director["uri"] and director["image"] is None
+    ]
+    images = fetch_images(list(dict.fromkeys(missing))) if missing else {}
+    for director in directors.values():
+        if director["uri"] and director["image"] is None:
+            director["image"] = images.get(director["uri"])
+    return directors
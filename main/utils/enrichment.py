@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+import asyncio
+import contextvars
+import threading
+
+from django.conf import settings
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor():
+    # Satu pool per jumlah worker, dipakai bersama oleh semua request
+    # sehingga jumlah query Wikidata yang berjalan bersamaan tetap terbatas
+    max_workers = max(1, settings.ENRICHMENT_MAX_WORKERS)
+    with _executors_lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="enrichment")
+            _executors[max_workers] = executor
+        return executor
+
+
+def submit(func, *args):
+    # Submit ke executor bersama dengan membawa context pemanggil, sehingga
+    # deadline halaman (resilience.page_deadline) juga berlaku di thread worker
+    return get_executor().submit(contextvars.copy_context().run, func, *args)
+
+
+def run_enrichment(tasks, timeout=None):
+    """
+    Menjalankan setiap section enrichment secara konkuren.
+
+    tasks berisi nama section -> (fungsi, argumen...). Hasil dan error
+    disimpan per section, jadi section yang gagal atau melewati timeout
+    tidak menghalangi section lainnya.
+    """
+    futures = {}
+    for section, (func, *args) in tasks.items():
+        futures[submit(func, *args)] = section
+
+    done, not_done = wait(futures, timeout=timeout)
+
+    results = {}
+    errors = {}
+    for future in done:
+        section = futures[future]
+        try:
+            results[section] = future.result()
+        except Exception as e:
+            print(f"Error fetching section {section}: {e}")
+            errors[section] = str(e)
+    for future in not_done:
+        future.cancel()
+        errors[futures[future]] = "timeout"
+
+    return results, errors
+
+
+async def arun_enrichment(tasks, timeout=None):
+    """
+    Versi async dari run_enrichment: tasks berisi nama section ->
+    (coroutine function, argumen...) dan semuanya di-await bersamaan
+    di event loop, tanpa thread tambahan.
+    """
+    coroutines = {section: func(*args) for section, (func, *args) in tasks.items()}
+    pending = {asyncio.ensure_future(coro): section for section, coro in coroutines.items()}
+    done, not_done = await asyncio.wait(pending, timeout=timeout)
+
+    results = {}
+    errors = {}
+    for task in done:
+        section = pending[task]
+        try:
+            results[section] = task.result()
+        except Exception as e:
+            print(f"Error fetching section {section}: {e}")
+            # Beberapa error httpx (mis. timeout) tidak punya pesan
+            errors[section] = str(e) or type(e).__name__
+    for task in not_done:
+        task.cancel()
+        errors[pending[task]] = "timeout"
+
+    return results, errors
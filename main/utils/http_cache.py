@@ -0,0 +1,94 @@
+import hashlib
+import os
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.views.decorators.http import condition
+
+from .build import build_timestamp, build_version
+from .dataset import get_dataset_version
+
+
+def wikidata_window(policy):
+    # Awal jendela TTL cache Wikidata saat ini (detik epoch), 0 jika route
+    # tidak memuat data Wikidata
+    ttl = settings.SPARQL_CACHE_TTL["wikidata"]
+    if not policy.get("wikidata") or not ttl:
+        return 0
+    return int(time.time()) // ttl * ttl
+
+
+def response_etag(route, request, *args, **kwargs):
+    """
+    ETag dari versi build (template dan kode), versi dataset, jendela cache
+    Wikidata, path, dan parameter query. Dihitung tanpa query SPARQL, sehingga If-None-Match yang cocok
+    langsung dijawab 304. ETag lemah karena isi section Wikidata boleh
+    berbeda sedikit selama jendela yang sama.
+    """
+    policy = settings.HTTP_CACHE_POLICIES[route]
+    params = sorted((key, value) for key, values in request.GET.lists() for value in values)
+    key = f"{route}|{build_version()}|{get_dataset_version()}|{wikidata_window(policy)}|{request.path}|{params}"
+    return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def response_last_modified(route, request, *args, **kwargs):
+    stamps = [wikidata_window(settings.HTTP_CACHE_POLICIES[route]), build_timestamp()]
+    for path in (settings.RDF_DATA_PATH, settings.WIKIDATA_SNAPSHOT_PATH):
+        try:
+            stamps.append(int(os.stat(path).st_mtime))
+        except OSError:
+            continue
+    return datetime.fromtimestamp(max(stamps), tz=timezone.utc) if any(stamps) else None
+
+
+def _finish(route, response):
+    if response.status_code in (200, 304) and not response.has_header("Cache-Control"):
+        policy = settings.HTTP_CACHE_POLICIES[route]
+        patch_cache_control(
+            response, public=True, max_age=policy["max_age"],
+            stale_while_revalidate=policy["stale_while_revalidate"],
+        )
+    else:
+        # Error atau response yang sudah menolak cache (mis. ada section
+        # yang gagal) tidak boleh divalidasi ulang menjadi 304
+        for header in ("ETag", "Last-Modified"):
+            if response.has_header(header):
+                del response[header]
+        if not response.has_header("Cache-Control"):
+            add_never_cache_headers(response)
+    return response
+
+
+def http_cache(route):
+    """
+    Decorator view (sync maupun async) untuk GET/HEAD: menjawab 304 lewat
+    django condition() sebelum view dijalankan, lalu memasang Cache-Control
+    sesuai HTTP_CACHE_POLICIES[route].
+    """
+    def decorator(view):
+        conditional = condition(
+            etag_func=lambda request, *args, **kwargs: response_etag(route, request, *args, **kwargs),
+            last_modified_func=lambda request, *args, **kwargs: response_last_modified(route, request, *args, **kwargs),
+        )(view)
+
+        def enabled(request):
+            return settings.HTTP_CACHE_ENABLED and request.method in ("GET", "HEAD")
+
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                if not enabled(request):
+                    return await view(request, *args, **kwargs)
+                return _finish(route, await conditional(request, *args, **kwargs))
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                if not enabled(request):
+                    return view(request, *args, **kwargs)
+                return _finish(route, conditional(request, *args, **kwargs))
+        return wrapper
+    return decorator
@@ -0,0 +1,162 @@
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+USER_AGENT = "TopMovies/1.0 (https://github.com/Nama-Kelompok/TopMovies)"
+
+
+class RateLimiter:
+    # Membatasi jumlah request per detik untuk semua thread bersama-sama
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        time.sleep(max(0.0, slot - now))
+
+
+class HostRateLimiter:
+    # Satu RateLimiter per host, jadi host yang lambat tidak menahan host lain
+    def __init__(self, rate):
+        self.rate = rate
+        self._limiters = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = RateLimiter(self.rate)
+        limiter.wait()
+
+
+class ConditionalCache:
+    """
+    Body response HTTP beserta ETag/Last-Modified-nya di SQLite. Request
+    berikutnya ke URL yang sama dikirim sebagai conditional request, dan
+    body dari cache dipakai jika server menjawab 304.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, content_type TEXT, body BLOB, fetched_at REAL)"
+            )
+
+    def _connect(self):
+        # Koneksi SQLite tidak boleh dipakai bersama antar thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, url):
+        row = self._connect().execute(
+            "SELECT etag, last_modified, content_type, body FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"etag": row[0], "last_modified": row[1], "content_type": row[2], "body": row[3]}
+
+    def set(self, url, response):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    url, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                    response.headers.get("Content-Type"), response.content, time.time(),
+                ),
+            )
+
+
+class Fetcher:
+    """
+    GET dengan rate limit per host, retry dan (opsional) conditional request
+    cache. Aman dipakai dari banyak thread; setiap thread punya Session.
+    """
+
+    def __init__(self, rate=1.0, cache=None, timeout=30, retries=2, allowed_hosts=None, max_redirects=5):
+        self.limiter = HostRateLimiter(rate)
+        self.cache = cache
+        self.timeout = timeout
+        self.retries = retries
+        # Jika diisi, setiap URL (termasuk tujuan redirect) harus ke host ini
+        self.allowed_hosts = set(allowed_hosts) if allowed_hosts is not None else None
+        self.max_redirects = max_redirects
+        self.stats = {"requests": 0, "not_modified": 0}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.headers["User-Agent"] = USER_AGENT
+        return session
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def check_host(self, url):
+        if self.allowed_hosts is not None and urlsplit(url).hostname not in self.allowed_hosts:
+            raise ValueError(f"Host {urlsplit(url).hostname} tidak diizinkan")
+
+    def _request(self, url, headers):
+        if self.allowed_hosts is None:
+            return self._session().get(url, headers=headers, timeout=self.timeout)
+        # Redirect diikuti manual agar tujuan redirect juga dicek whitelist-nya
+        for _ in range(self.max_redirects + 1):
+            self.check_host(url)
+            response = self._session().get(url, headers=headers, timeout=self.timeout, allow_redirects=False)
+            if not response.is_redirect:
+                return response
+            url = urljoin(url, response.headers["Location"])
+        raise requests.TooManyRedirects(f"Terlalu banyak redirect untuk {url}")
+
+    def get(self, url):
+        """
+        Mengembalikan (content, content_type). Error HTTP dilempar sebagai
+        requests.HTTPError setelah retry habis (404 tidak di-retry).
+        """
+        cached = self.cache.get(url) if self.cache else None
+        headers = {}
+        if cached and cached["etag"]:
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached["last_modified"]:
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(url)
+            self._count("requests")
+            try:
+                response = self._request(url, headers)
+                if response.status_code == 304 and cached:
+                    self._count("not_modified")
+                    return cached["body"], cached["content_type"]
+                response.raise_for_status()
+            except requests.RequestException as e:
+                retryable = not isinstance(e, requests.HTTPError) or e.response.status_code in (429, 500, 502, 503, 504)
+                if attempt == self.retries or not retryable:
+                    raise
+                time.sleep(2 ** attempt)
+                continue
+            if self.cache and (response.headers.get("ETag") or response.headers.get("Last-Modified")):
+                self.cache.set(url, response)
+            return response.content, response.headers.get("Content-Type")
@@ -1,20 +1,121 @@
-from .sparql import wikidata_sparql
+import asyncio
+import time
 
-def fetch_image(uri):
-    sparql_query = f"""
-    SELECT ?image WHERE {{
-        BIND(<{uri}> AS ?entity) .
+from django.conf import settings
+
+from .cache import LRUCache, MISS
+from .resilience import SkippedCall
+from .sparql import wikidata_sparql, chunked
+
+# Memo gambar per entitas (termasuk entitas tanpa gambar), dipakai bersama
+# oleh semua film sehingga aktor yang sama hanya dicari sekali
+_image_memo = LRUCache(settings.IMAGE_MEMO_SIZE)
+
+
+def remember_images(images):
+    # Menyimpan gambar yang sudah didapat dari query lain (cast, crew, dll.)
+    for uri, image in images.items():
+        if uri and image:
+            _image_memo.set(uri, image)
+
+
+def clear_image_memo():
+    # Dipakai benchmark untuk mengukur halaman detail tanpa memo
+    _image_memo.clear()
+
+
+def _images_query(uris):
+    values = " ".join(f"<{uri}>" for uri in uris)
+    return f"""
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+
+    SELECT ?entity (SAMPLE(?image) AS ?image) WHERE {{
+        VALUES ?entity {{ {values} }}
         ?entity wdt:P18 ?image .
     }}
+    GROUP BY ?entity
     """
-    wikidata_sparql.setQuery(sparql_query)
 
-    try:
-        results = wikidata_sparql.query().convert()
-        if results["results"]["bindings"]:
-            return results["results"]["bindings"][0]["image"]["value"]
+
+def _parse_images(results):
+    return {
+        binding["entity"]["value"]: binding["image"]["value"]
+        for binding in results["results"]["bindings"]
+        if "entity" in binding and "image" in binding
+    }
+
+
+def _query_images(uris):
+    return _parse_images(wikidata_sparql.query(_images_query(uris), label="image:P18"))
+
+
+def _from_memo(uris):
+    # Memisahkan URI yang sudah ada di memo dari yang masih harus di-query
+    images = {}
+    missing = []
+    for uri in dict.fromkeys(uri for uri in uris if uri):
+        image = _image_memo.get(uri)
+        if image is MISS:
+            missing.append(uri)
         else:
-            return None
-    except Exception as e:
-        print(f"Error fetching image for {uri}: {e}")
-        return None
+            images[uri] = image
+    return images, missing
+
+
+def _remember_batch(images, batch, found):
+    # Entitas tanpa gambar kedaluwarsa setelah TTL negatif Wikidata (seperti
+    # hasil kosong di cache SPARQL), jadi gambar yang baru ditambahkan ikut muncul
+    ttl = settings.SPARQL_CACHE_NEGATIVE_TTL.get(wikidata_sparql.name)
+    for uri in batch:
+        images[uri] = found.get(uri)
+        if images[uri]:
+            _image_memo.set(uri, images[uri])
+        else:
+            _image_memo.set(uri, None, time.time() + ttl if ttl is not None else None)
+
+
+def fetch_images(uris):
+    """
+    Mengambil gambar (P18) banyak entitas, hasil: URI -> gambar atau None.
+    Entitas yang sudah ada di memo tidak di-query lagi, sisanya dipecah
+    per IMAGE_BATCH_SIZE.
+    """
+    images, missing = _from_memo(uris)
+    for batch in chunked(missing, settings.IMAGE_BATCH_SIZE):
+        try:
+            found = _query_images(batch)
+        except SkippedCall:
+            raise
+        except Exception as e:
+            print(f"Error fetching images: {e}")
+            continue
+        _remember_batch(images, batch, found)
+
+    return images
+
+
+async def afetch_images(uris):
+    # Versi async dari fetch_images, semua batch di-query bersamaan
+    images, missing = _from_memo(uris)
+    batches = list(chunked(missing, settings.IMAGE_BATCH_SIZE))
+    responses = await asyncio.gather(
+        *(wikidata_sparql.aquery(_images_query(batch), label="image:P18") for batch in batches),
+        return_exceptions=True,
+    )
+    for batch, results in zip(batches, responses):
+        if isinstance(results, SkippedCall):
+            raise results
+        if isinstance(results, Exception):
+            print(f"Error fetching images: {results}")
+            continue
+        _remember_batch(images, batch, _parse_images(results))
+
+    return images
+
+
+def fetch_image(uri):
+    return fetch_images([uri]).get(uri)
+
+
+async def afetch_image(uri):
+    return (await afetch_images([uri])).get(uri)
@@ -0,0 +1,235 @@
+from collections import OrderedDict
+from io import BytesIO
+import hashlib
+import os
+import threading
+from urllib.parse import urlencode, urlsplit
+
+from django.conf import settings
+from django.urls import reverse
+
+from .http_fetch import Fetcher
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+VECTOR_EXTENSIONS = (".svg", ".svgz")
+
+
+def normalize_image_url(url):
+    # Link poster Wikipedia berbentuk //upload.wikimedia.org/...
+    url = (url or "").strip()
+    if url.startswith("//"):
+        url = f"https:{url}"
+    return url
+
+
+def is_proxyable(url):
+    parts = urlsplit(normalize_image_url(url))
+    return parts.scheme in ("http", "https") and parts.hostname in settings.IMAGE_PROXY_HOSTS
+
+
+def is_vector(url):
+    # Bendera (P41) dan logo (P154) Wikidata umumnya SVG, tidak bisa dibaca Pillow
+    return urlsplit(normalize_image_url(url)).path.lower().endswith(VECTOR_EXTENSIONS)
+
+
+def proxy_image_url(url, variant):
+    """
+    URL gambar lewat proxy lokal untuk ukuran variant. URL dari host di
+    luar IMAGE_PROXY_HOSTS, gambar vektor, atau saat proxy dimatikan tidak
+    diubah.
+    """
+    if not url or not settings.IMAGE_PROXY_ENABLED or Image is None or not is_proxyable(url) or is_vector(url):
+        return url
+    return f"{reverse('main:image_proxy', kwargs={'variant': variant})}?{urlencode({'src': normalize_image_url(url)})}"
+
+
+class UnsupportedImage(Exception):
+    """Format gambar tidak bisa dibaca Pillow (mis. SVG)."""
+
+
+def resize_variants(content):
+    """
+    Membuat semua variant sekaligus dari satu gambar asli, jadi gambar asli
+    cukup diambil sekali. Hasil: variant -> (bytes, content type).
+    """
+    try:
+        image = Image.open(BytesIO(content))
+        image = ImageOps.exif_transpose(image)
+    except Exception as e:
+        raise UnsupportedImage(str(e)) from e
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    image = image.convert("RGBA" if has_alpha else "RGB")
+
+    variants = {}
+    for variant, width in settings.IMAGE_VARIANTS.items():
+        resized = image.copy()
+        # thumbnail tidak pernah memperbesar gambar yang lebih kecil
+        resized.thumbnail((width, width * 3), Image.LANCZOS)
+        output = BytesIO()
+        if has_alpha:
+            resized.save(output, "PNG", optimize=True)
+            variants[variant] = (output.getvalue(), "image/png")
+        else:
+            resized.save(output, "JPEG", quality=settings.IMAGE_JPEG_QUALITY, optimize=True, progressive=True)
+            variants[variant] = (output.getvalue(), "image/jpeg")
+    return variants
+
+
+class ImageDiskCache:
+    """
+    Variant gambar sebagai file di disk, dibatasi total IMAGE_CACHE_MAX_BYTES.
+    Setiap akses memperbarui mtime file; saat penuh, file dengan mtime
+    terlama dibuang lebih dulu (LRU).
+    """
+
+    EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png"}
+
+    def __init__(self, directory, max_bytes):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self._size = None
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _files(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            yield path, stat
+
+    def _path(self, key, variant, extension):
+        return os.path.join(self.directory, f"{key}.{variant}.{extension}")
+
+    def _unsupported_path(self, key):
+        return os.path.join(self.directory, f"{key}.unsupported")
+
+    def is_unsupported(self, key):
+        return os.path.exists(self._unsupported_path(key))
+
+    def mark_unsupported(self, key):
+        # Penanda kosong agar gambar yang tidak bisa dibaca tidak diambil ulang
+        open(self._unsupported_path(key), "wb").close()
+
+    def get(self, key, variant):
+        """(path, content type) atau None."""
+        for content_type, extension in self.EXTENSIONS.items():
+            path = self._path(key, variant, extension)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                continue
+            return path, content_type
+        return None
+
+    def set(self, key, variants):
+        """Menulis semua variant, mengembalikan variant -> (path, content type)."""
+        written = 0
+        paths = {}
+        for variant, (content, content_type) in variants.items():
+            path = self._path(key, variant, self.EXTENSIONS[content_type])
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+            written += len(content)
+            paths[variant] = (path, content_type)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(stat.st_size for _, stat in self._files())
+            else:
+                self._size += written
+            if self._size > self.max_bytes:
+                self._evict(keep=key)
+        return paths
+
+    def _evict(self, keep):
+        # Dibuang sampai 90% batas agar eviction tidak terjadi di setiap tulis.
+        # Variant gambar yang baru ditulis (keep) tidak ikut dibuang
+        files = sorted(self._files(), key=lambda item: item[1].st_mtime)
+        self._size = sum(stat.st_size for _, stat in files)
+        target = self.max_bytes * 0.9
+        for path, stat in files:
+            if self._size <= target:
+                break
+            if os.path.basename(path).startswith(f"{keep}."):
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self._size -= stat.st_size
+
+
+_cache = None
+_fetcher = None
+_fetch_locks = OrderedDict()
+_state_lock = threading.Lock()
+
+
+def get_image_cache():
+    global _cache
+    with _state_lock:
+        if _cache is None:
+            _cache = ImageDiskCache(settings.IMAGE_CACHE_DIR, settings.IMAGE_CACHE_MAX_BYTES)
+        return _cache
+
+
+def _get_fetcher():
+    global _fetcher
+    with _state_lock:
+        if _fetcher is None:
+            _fetcher = Fetcher(
+                rate=settings.IMAGE_PROXY_RATE, timeout=settings.IMAGE_PROXY_TIMEOUT, retries=1,
+                allowed_hosts=settings.IMAGE_PROXY_HOSTS,
+            )
+        return _fetcher
+
+
+def _fetch_lock(key):
+    # Request bersamaan untuk gambar yang sama menunggu satu fetch saja
+    with _state_lock:
+        lock = _fetch_locks.get(key)
+        if lock is None:
+            lock = _fetch_locks[key] = threading.Lock()
+            while len(_fetch_locks) > 1024:
+                _fetch_locks.popitem(last=False)
+        return lock
+
+
+def image_key(url):
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()
+
+
+def get_variant(url, variant):
+    """
+    (path file variant, content type). Gambar asli diambil dan semua
+    variant dibuat jika belum ada di cache.
+    """
+    cache = get_image_cache()
+    key = image_key(url)
+    cached = cache.get(key, variant)
+    if cached:
+        return cached
+    with _fetch_lock(key):
+        cached = cache.get(key, variant)
+        if cached:
+            return cached
+        if cache.is_unsupported(key):
+            raise UnsupportedImage(url)
+        content, _ = _get_fetcher().get(url)
+        try:
+            variants = resize_variants(content)
+        except UnsupportedImage:
+            cache.mark_unsupported(key)
+            raise
+        # Path hasil tulis dipakai langsung, bukan dibaca ulang dari cache
+        return cache.set(key, variants)[variant]
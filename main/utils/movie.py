@@ -0,0 +1,135 @@
+from django.conf import settings
+
+from .sparql import chunked, local_sparql
+from .time import format_running_time
+
+MOVIE_ATTRIBUTES = [
+    "director", "genres", "rating", "metaScore", "information",
+    "finalPosterLink", "releaseYear", "runningTime", 
+    "stars", "votes", "wikidataUri", "distributor",
+    "budget", "certificate", "domesticOpening", "domesticSales",
+    "internationalSales", "license", "releaseDate"
+]
+INTEGER_ATTRIBUTES = ["budget", "domesticOpening", "domesticSales", "internationalSales", "votes"]
+
+
+def movie_uri(uri):
+    if not uri.startswith("http://"):
+        uri = f"http://nama-kelompok.org/data/{uri}"
+    return uri
+
+
+def build_movie_query(uris):
+    # Query SPARQL fetch data lokal untuk satu atau banyak film sekaligus
+    values = " ".join(f"<{uri}>" for uri in uris)
+    return f"""
+    PREFIX : <http://nama-kelompok.org/data/>
+    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    PREFIX v: <http://nama-kelompok.org/vocab#>
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+
+    SELECT DISTINCT ?movies ?title ?director 
+           (COALESCE(?genreList, "") AS ?genres)
+           ?rating ?metaScore ?information 
+           (COALESCE(?wikipediaPosterLink, ?otherPosterLink) AS ?finalPosterLink)
+           ?releaseYear ?runningTime 
+           (COALESCE(?starList, "") AS ?stars)
+           ?votes ?wikidataUri ?distributor
+           ?budget ?certificate ?domesticOpening ?domesticSales 
+           ?internationalSales ?license ?releaseDate
+    WHERE {{
+        VALUES ?movies {{ {values} }}
+        ?movies rdf:type :Movie .
+        ?movies rdfs:label ?title .
+        
+        OPTIONAL {{ ?movies v:director ?director. }}
+        OPTIONAL {{ ?movies v:distributor ?distributor. }}
+        # Genre dan bintang digabung di sub-select per film, jadi film tanpa
+        # v:star/v:genre tetap punya baris (rdflib gagal pada GROUP_CONCAT
+        # variabel yang tidak terikat)
+        OPTIONAL {{
+            SELECT ?movies (GROUP_CONCAT(DISTINCT ?genre; separator=", ") AS ?genreList) WHERE {{
+                VALUES ?movies {{ {values} }}
+                ?movies v:genre ?genre .
+            }}
+            GROUP BY ?movies
+        }}
+        OPTIONAL {{
+            SELECT ?movies (GROUP_CONCAT(DISTINCT ?star; separator=", ") AS ?starList) WHERE {{
+                VALUES ?movies {{ {values} }}
+                ?movies v:star ?star .
+            }}
+            GROUP BY ?movies
+        }}
+        OPTIONAL {{ ?movies v:imdbRating ?rating. }}
+        OPTIONAL {{ ?movies v:metaScore ?metaScore. }}
+        OPTIONAL {{ ?movies v:movieInfo ?information. }}
+
+        OPTIONAL {{ ?movies v:posterLink ?wikipediaPosterLink . 
+        FILTER(CONTAINS(STR(?wikipediaPosterLink), "upload.wikimedia.org")) }}
+        
+        OPTIONAL {{ ?movies v:posterLink ?otherPosterLink .
+        FILTER(!CONTAINS(STR(?otherPosterLink), "upload.wikimedia.org")) }}
+        OPTIONAL {{ ?movies v:releaseYear ?releaseYear. }}
+        OPTIONAL {{ ?movies v:runningTime ?runningTime. }}
+        OPTIONAL {{ ?movies v:votes ?votes. }}
+        OPTIONAL {{ ?movies v:wikidataUri ?wikidataUri. }}
+        OPTIONAL {{ ?movies v:budget ?budget. }}
+        OPTIONAL {{ ?movies v:certificate ?certificate. }}
+        OPTIONAL {{ ?movies v:domesticOpening ?domesticOpening. }}
+        OPTIONAL {{ ?movies v:domesticSales ?domesticSales. }}
+        OPTIONAL {{ ?movies v:internationalSales ?internationalSales. }}
+        OPTIONAL {{ ?movies v:license ?license. }}
+        OPTIONAL {{ ?movies v:releaseDate ?releaseDate. }}
+    }}
+    """
+
+
+def parse_movie(result):
+    data_movie = {
+        "movies": result["movies"]["value"],
+        "title": result["title"]["value"],
+    }
+
+    for attr in MOVIE_ATTRIBUTES:
+        if attr in result:
+            value = result[attr]["value"]
+            # Konversi tipe data sesuai kebutuhan
+            if attr in INTEGER_ATTRIBUTES:
+                try:
+                    value = int(value)
+                except ValueError:
+                    value = value 
+            elif attr in ["releaseDate"]:
+                value = value.split("^^")[0].strip('"')
+            data_movie[attr] = value
+        else:
+            data_movie[attr] = f"Tidak terdapat data {attr}"
+
+    # Mengambil running time film
+    running_time = data_movie.get("runningTime", "")
+    data_movie["runningTime"] = format_running_time(running_time)
+    return data_movie
+
+
+def parse_movies(results):
+    # Satu film bisa menghasilkan beberapa baris (mis. dua poster), ambil yang pertama
+    movies = {}
+    for result in results["results"]["bindings"]:
+        # Baris tanpa ?movies (mis. agregat kosong untuk id yang tidak ada) dilewati
+        if "movies" not in result:
+            continue
+        uri = result["movies"]["value"]
+        if uri not in movies:
+            movies[uri] = parse_movie(result)
+    return movies
+
+
+def fetch_movies(uris):
+    # Data lokal banyak film, satu query per MOVIE_BATCH_SIZE film
+    movies = {}
+    for batch in chunked(uris, settings.MOVIE_BATCH_SIZE):
+        movies.update(parse_movies(local_sparql.query(build_movie_query(batch), label="movie:batch")))
+    return movies
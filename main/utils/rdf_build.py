@@ -0,0 +1,259 @@
+import os
+
+import pandas as pd
+
+DATA = "http://nama-kelompok.org/data/"
+VOCAB = "http://nama-kelompok.org/vocab#"
+WIKIDATA_ENTITY = "http://www.wikidata.org/entity/"
+RDF = "http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+RDFS = "http://www.w3.org/2000/01/rdf-schema#"
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+TURTLE_HEADER = f"""@base   <{DATA}> .
+@prefix rdf:  <{RDF}> .
+@prefix rdfs: <{RDFS}> .
+@prefix v:    <{VOCAB}> .
+@prefix wd:   <{WIKIDATA_ENTITY}> .
+@prefix xsd:  <{XSD}> .
+
+"""
+
+# Kolom CSV -> (properti, jenis nilai). Jenis: str, int, float, uri, date,
+# list (dipisah koma), pylist (list Python "['a', 'b']"), minutes, hr_min,
+# wikidata, atau kelas entity (Director/Actor/Distributor)
+IMDB_COLUMNS = {
+    "Series_Title": ("label", "str"),
+    "Poster_Link": ("posterLink", "uri"),
+    "Released_Year": ("releaseYear", "int"),
+    "Certificate": ("certificate", "str"),
+    "Runtime": ("runningTime", "minutes"),
+    "Genre": ("genre", "list"),
+    "IMDB_Rating": ("imdbRating", "float"),
+    "Overview": ("movieInfo", "str"),
+    "Meta_score": ("metaScore", "int"),
+    "Director": ("director", "Director"),
+    "Star1": ("star", "Actor"),
+    "Star2": ("star", "Actor"),
+    "Star3": ("star", "Actor"),
+    "Star4": ("star", "Actor"),
+    "No_of_Votes": ("votes", "int"),
+    "Gross": ("gross", "int"),
+    "wikidata_id": ("wikidataUri", "wikidata"),
+}
+
+HOLLYWOOD_COLUMNS = {
+    "Title": ("label", "str"),
+    "Poster Link": ("posterLink", "uri"),
+    "Year": ("releaseYear", "int"),
+    "Movie Info": ("movieInfo", "str"),
+    "Distributor": ("distributor", "Distributor"),
+    "Budget (in $)": ("budget", "int"),
+    "Domestic Opening (in $)": ("domesticOpening", "int"),
+    "Domestic Sales (in $)": ("domesticSales", "int"),
+    "International Sales (in $)": ("internationalSales", "int"),
+    "World Wide Sales (in $)": ("worldWideSales", "int"),
+    "Release Date": ("releaseDate", "date"),
+    "Genre": ("genre", "pylist"),
+    "Running Time": ("runningTime", "hr_min"),
+    "License": ("license", "str"),
+    "wikidata_id": ("wikidataUri", "wikidata"),
+}
+
+DATE_FORMATS = ["%Y-%m-%d", "%B %d, %Y", "%b %d, %Y", "%d %B %Y"]
+
+# Nama sumber -> (mapping kolom, kolom judul, kolom tahun)
+SOURCES = {
+    "imdb": (IMDB_COLUMNS, "Series_Title", "Released_Year"),
+    "hollywood": (HOLLYWOOD_COLUMNS, "Title", "Year"),
+}
+
+
+def slugify(names):
+    # Aturan id resource di NamaKelompok_RDF.ttl: tanda baca : ' , & ! ( ) ?
+    # (dan karakter yang tidak sah di IRI) dibuang, spasi menjadi _
+    # ("Planes, Trains & Automobiles" -> "Planes_Trains__Automobiles")
+    cleaned = names.str.strip().str.replace(r"""[:',&!()?"<>{}|^`\\]""", "", regex=True)
+    return cleaned.str.replace(" ", "_", regex=False)
+
+
+def escape_literals(values):
+    # Hanya nilai yang mengandung karakter khusus yang di-escape
+    special = values.str.contains(r'[\\"\n\r]', regex=True)
+    if not special.any():
+        return values
+    escaped = (
+        values[special].str.replace("\\", "\\\\", regex=False)
+        .str.replace('"', '\\"', regex=False)
+        .str.replace("\n", "\\n", regex=False)
+        .str.replace("\r", "\\r", regex=False)
+    )
+    return values.where(~special, escaped)
+
+
+def to_int(values):
+    # Angka dengan pemisah ribuan dibersihkan, selain itu (mis. "N/A") kosong
+    cleaned = values.str.replace(",", "", regex=False).str.strip().str.removesuffix(".0")
+    return pd.to_numeric(cleaned.where(cleaned.str.fullmatch(r"\d+")), errors="coerce").astype("Int64")
+
+
+def parse_minutes(values):
+    return pd.to_numeric(values.str.extract(r"(\d+)", expand=False), errors="coerce").astype("Int64")
+
+
+def parse_dates(values):
+    # Format tanggal di CSV sumber dicoba satu per satu (parsing vektor),
+    # jauh lebih cepat daripada format="mixed" yang mem-parse per nilai
+    dates = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for date_format in DATE_FORMATS:
+        missing = dates.isna()
+        if not missing.any():
+            break
+        dates[missing] = pd.to_datetime(values[missing], format=date_format, errors="coerce")
+    return dates
+
+
+def parse_hr_min(values):
+    # "2 hr 18 min" -> 138, "2 hr" -> 120, "95 min" -> 95
+    hours = pd.to_numeric(values.str.extract(r"(\d+)\s*hr", expand=False), errors="coerce")
+    minutes = pd.to_numeric(values.str.extract(r"(\d+)\s*min", expand=False), errors="coerce")
+    total = hours.fillna(0) * 60 + minutes.fillna(0)
+    return total.where(hours.notna() | minutes.notna()).astype("Int64")
+
+
+def split_list(values, kind):
+    # Satu baris per item, index tetap index baris asal (tanpa menduplikasi baris)
+    if kind == "pylist":
+        items = values.str.findall(r"""['"]([^'"]+)['"]""")
+    else:
+        items = values.str.split(",")
+    items = items.explode().dropna().str.strip()
+    return items[items != ""]
+
+
+def normalize_wikidata(values):
+    pattern = r"^(?:http://www\.wikidata\.org/entity/|https://www\.wikidata\.org/wiki/)(Q\d+)$"
+    return values.str.strip().str.extract(pattern, expand=False).dropna()
+
+
+class TripleWriter:
+    """
+    Menulis triple langsung ke file per kolom (operasi string vektor pandas),
+    tanpa membangun graph di memori. Format "nt" (N-Triples) atau "turtle".
+    Entity (film, orang, distributor) yang sudah ditulis diingat agar triple
+    rdf:type dan rdfs:label-nya tidak berulang antar chunk.
+    """
+
+    def __init__(self, file, fmt="nt"):
+        self.file = file
+        self.turtle = fmt == "turtle"
+        self.triples = 0
+        self.seen = set()
+        if self.turtle:
+            file.write(TURTLE_HEADER)
+
+    def data_iri(self, slugs):
+        return "<" + slugs + ">" if self.turtle else f"<{DATA}" + slugs + ">"
+
+    def term(self, iri, prefix, local):
+        return f"{prefix}:{local}" if self.turtle else f"<{iri}{local}>"
+
+    def typed(self, values, datatype):
+        return '"' + values + '"^^' + self.term(XSD, "xsd", datatype)
+
+    def write(self, subjects, predicate, objects):
+        # subjects dan objects adalah Series string dengan index yang sama
+        lines = subjects.loc[objects.index] + f" {predicate} " + objects + " .\n"
+        if len(lines):
+            self.file.write("".join(lines.tolist()))
+            self.triples += len(lines)
+
+    def write_entities(self, names, rdf_class):
+        # Triple type dan label untuk entity baru, mengembalikan IRI tiap baris
+        names = names.str.strip()
+        names = names[names != ""]
+        slugs = slugify(names)
+        keys = rdf_class + "/" + slugs
+        new = ~keys.isin(self.seen) & ~keys.duplicated()
+        self.seen.update(keys[new].tolist())
+        iris = self.data_iri(slugs)
+        classes = pd.Series(self.data_iri(rdf_class), index=iris[new].index)
+        self.write(iris[new], self.term(RDF, "rdf", "type"), classes)
+        self.write(iris[new], self.term(RDFS, "rdfs", "label"), '"' + escape_literals(names[new]) + '"')
+        return iris
+
+    def objects(self, values, kind):
+        if kind == "str":
+            values = values.str.strip()
+            values = values[values != ""]
+            return '"' + escape_literals(values) + '"'
+        if kind == "uri":
+            values = values.str.strip()
+            values = values[values != ""]
+            return self.typed(escape_literals(values), "anyURI")
+        if kind in ("int", "minutes", "hr_min"):
+            parser = {"int": to_int, "minutes": parse_minutes, "hr_min": parse_hr_min}[kind]
+            numbers = parser(values).dropna()
+            return self.typed(numbers.astype(str), "integer")
+        if kind == "float":
+            numbers = pd.to_numeric(values, errors="coerce").dropna()
+            return self.typed(numbers.astype(str), "float")
+        if kind == "date":
+            dates = parse_dates(values).dropna()
+            return self.typed(dates.dt.strftime("%Y-%m-%d"), "date")
+        if kind in ("list", "pylist"):
+            return '"' + escape_literals(split_list(values, kind)) + '"'
+        if kind == "wikidata":
+            ids = normalize_wikidata(values)
+            return "wd:" + ids if self.turtle else f"<{WIKIDATA_ENTITY}" + ids + ">"
+        if kind == "Distributor":
+            # Nilai anomali (berisi "," atau "$") dibuang seperti di notebook
+            values = values[~values.str.contains(r"[,$]")]
+        return self.write_entities(values, kind)
+
+    def write_chunk(self, df, columns, title_column, year_column):
+        """
+        Satu chunk CSV (semua kolom bertipe string). Id film mengikuti
+        <judul>_<tahun>, jadi film yang sama dari kedua sumber digabung.
+        """
+        df = df.fillna("")
+        years = to_int(df[year_column])
+        years = years.astype(str).where(years.notna(), "")
+        slugs = slugify(df[title_column])
+        slugs = slugs.where(years == "", slugs + "_" + years)
+        valid = df[title_column].str.strip() != ""
+        slugs = slugs[valid]
+        subjects = self.data_iri(slugs)
+
+        keys = "Movie/" + slugs
+        new = ~keys.isin(self.seen) & ~keys.duplicated()
+        self.seen.update(keys[new].tolist())
+        self.write(subjects[new], self.term(RDF, "rdf", "type"),
+                   pd.Series(self.data_iri("Movie"), index=subjects[new].index))
+
+        for column, (prop, kind) in columns.items():
+            if column not in df.columns:
+                continue
+            objects = self.objects(df.loc[valid, column], kind)
+            predicate = self.term(RDFS, "rdfs", "label") if prop == "label" else self.term(VOCAB, "v", prop)
+            self.write(subjects, predicate, objects)
+        return len(slugs)
+
+
+def build_dataset(inputs, output, fmt="nt", chunksize=5000, progress=None):
+    """
+    inputs: list (nama sumber, path CSV). Mengembalikan (jumlah baris,
+    jumlah triple). Ditulis ke file sementara lalu di-rename.
+    """
+    rows = 0
+    tmp_output = f"{output}.tmp"
+    with open(tmp_output, "w", encoding="utf-8") as f:
+        writer = TripleWriter(f, fmt)
+        for source, path in inputs:
+            columns, title_column, year_column = SOURCES[source]
+            for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, chunksize=chunksize):
+                rows += writer.write_chunk(chunk, columns, title_column, year_column)
+                if progress:
+                    progress(source, rows, writer.triples)
+    os.replace(tmp_output, output)
+    return rows, writer.triples
+
@@ -0,0 +1,77 @@
+import hashlib
+import os
+import pickle
+import threading
+
+from django.conf import settings
+from rdflib import Graph
+
+
+def embedded_paths():
+    # File yang dimuat backend embedded; snapshot Wikidata ikut dimuat jika
+    # query Wikidata juga dijawab secara lokal
+    paths = [settings.RDF_DATA_PATH, settings.RDF_SCHEMA_PATH]
+    if settings.WIKIDATA_SOURCE == "local" and os.path.exists(settings.WIKIDATA_SNAPSHOT_PATH):
+        paths.append(settings.WIKIDATA_SNAPSHOT_PATH)
+    return [str(path) for path in paths]
+
+
+def _fingerprint(paths):
+    stamps = []
+    for path in paths:
+        stat = os.stat(path)
+        stamps.append(f"{path}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha1("|".join(stamps).encode("utf-8")).hexdigest()[:12]
+
+
+def load_graph(paths, cache_dir=None):
+    """
+    Memuat file Turtle ke rdflib Graph. Hasil parse disimpan sebagai pickle
+    di cache_dir dengan nama berdasarkan ukuran dan waktu modifikasi file,
+    sehingga startup berikutnya tidak perlu parse ulang.
+    """
+    cache_path = None
+    if cache_dir:
+        cache_path = os.path.join(str(cache_dir), f"rdf-{_fingerprint(paths)}.pickle")
+        try:
+            with open(cache_path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading RDF parse cache {cache_path}: {e}")
+
+    graph = Graph()
+    for path in paths:
+        graph.parse(path, format="turtle")
+
+    if cache_path:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Tulis ke file sementara dulu agar proses lain tidak membaca pickle setengah jadi
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(graph, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        # Hapus pickle dari versi file sebelumnya
+        for name in os.listdir(os.path.dirname(cache_path)):
+            stale = os.path.join(os.path.dirname(cache_path), name)
+            if name.startswith("rdf-") and name.endswith(".pickle") and stale != cache_path:
+                os.remove(stale)
+    return graph
+
+
+_graphs = {}
+_graphs_lock = threading.Lock()
+
+
+def get_embedded_graph():
+    # Satu graph per kombinasi file; dimuat ulang jika salah satu file berubah
+    paths = embedded_paths()
+    key = _fingerprint(paths)
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            _graphs.clear()
+            graph = load_graph(paths, settings.EMBEDDED_CACHE_DIR)
+            _graphs[key] = graph
+        return graph
@@ -0,0 +1,180 @@
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+import asyncio
+import contextvars
+import threading
+import time
+
+import httpx
+import requests
+from django.conf import settings
+
+
+class SkippedCall(Exception):
+    """Query tidak dikirim sama sekali (circuit terbuka atau deadline habis)."""
+
+
+class CircuitOpenError(SkippedCall):
+    pass
+
+
+class DeadlineExceeded(SkippedCall):
+    pass
+
+
+# Batas waktu absolut (time.monotonic) untuk request yang sedang diproses.
+# Ikut terbawa ke thread executor lewat contextvars.copy_context()
+_deadline = contextvars.ContextVar("page_deadline", default=None)
+
+
+@contextmanager
+def page_deadline(seconds):
+    token = _deadline.set(time.monotonic() + seconds if seconds else None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time():
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def call_timeout(limit):
+    # Timeout satu query: batas per query, dipotong sisa deadline halaman
+    remaining = remaining_time()
+    if remaining is None:
+        return limit
+    if remaining <= 0:
+        raise DeadlineExceeded("Deadline halaman terlewati, query dilewati")
+    return min(limit, remaining)
+
+
+def is_endpoint_failure(error):
+    # Error 4xx (selain 429) berarti endpoint sehat tetapi query-nya salah
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return True
+
+
+class CircuitBreaker:
+    """
+    Setelah SPARQL_BREAKER_THRESHOLD kegagalan berturut-turut, semua query
+    langsung gagal dengan CircuitOpenError. Setelah SPARQL_BREAKER_RESET
+    detik satu query dibiarkan lewat sebagai percobaan: jika berhasil circuit
+    tertutup lagi, jika gagal circuit terbuka untuk jeda berikutnya.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= settings.SPARQL_BREAKER_RESET:
+            return "half-open"
+        return "open"
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def allow(self):
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return
+            if state == "half-open" and not self._probing:
+                self._probing = True
+                return
+        raise CircuitOpenError(f"Circuit {self.name} terbuka, query dilewati")
+
+    def record(self, error=None):
+        with self._lock:
+            if error is None or not is_endpoint_failure(error):
+                if self._opened_at is not None:
+                    print(f"Circuit {self.name} closed")
+                self._failures = 0
+                self._opened_at = None
+            else:
+                self._failures += 1
+                if self._probing or self._failures >= settings.SPARQL_BREAKER_THRESHOLD:
+                    if self._opened_at is None:
+                        print(f"Circuit {self.name} open after {self._failures} failures: {str(error) or type(error).__name__}")
+                    self._opened_at = time.monotonic()
+            self._probing = False
+
+    def release(self):
+        # Percobaan dibatalkan sebelum ada hasil (mis. request dibatalkan)
+        with self._lock:
+            self._probing = False
+
+
+_hedge_executor = None
+_hedge_lock = threading.Lock()
+
+
+def _get_hedge_executor():
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(thread_name_prefix="hedge")
+        return _hedge_executor
+
+
+def hedged(call, delay):
+    """
+    Menjalankan call(); jika belum selesai setelah delay detik, call() kedua
+    dikirim dan hasil pertama yang berhasil dipakai. Hanya untuk query baca.
+    """
+    executor = _get_hedge_executor()
+    pending = {executor.submit(call)}
+    done, pending = wait(pending, timeout=delay)
+    if not done:
+        pending.add(executor.submit(call))
+    error = None
+    while done or pending:
+        for future in done:
+            if future.exception() is None:
+                for other in pending:
+                    other.cancel()
+                return future.result()
+            error = future.exception()
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+    raise error
+
+
+async def ahedged(call, delay):
+    # Versi async dari hedged, call adalah coroutine function
+    pending = {asyncio.ensure_future(call())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=delay)
+        if not done:
+            pending.add(asyncio.ensure_future(call()))
+        error = None
+        while done or pending:
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
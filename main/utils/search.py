@@ -0,0 +1,110 @@
+from .image_proxy import proxy_image_url
+from .sparql import local_sparql
+
+PAGE_SIZE = 20
+
+# ORDER BY untuk setiap nilai parameter sort
+ORDER_BY = {
+    "alphabet_asc": "ASC(?movieName)",
+    "budget": "DESC(?budget)",
+    "title_desc": "DESC(?movieName)",
+    "release_year": "DESC(xsd:integer(?releaseYear))",
+    "rating": "DESC(xsd:decimal(?rating))",
+    "international_sales": "DESC(xsd:decimal(?internationalSales))",
+}
+DEFAULT_ORDER_BY = "ASC(?movieName)"
+
+PREFIXES = """
+    PREFIX : <http://nama-kelompok.org/data/>
+    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+    PREFIX v: <http://nama-kelompok.org/vocab#>
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
+"""
+
+
+def build_regex_search_query(search_input, sort_input, page):
+    # Query pencarian lama: REGEX atas seluruh judul dan genre di GraphDB
+    order_by = ORDER_BY.get(sort_input, DEFAULT_ORDER_BY)
+    return f"""{PREFIXES}
+    SELECT DISTINCT ?movieId ?movieName
+           (COALESCE(?wikipediaPosterLink, ?otherPosterLink) AS ?finalPosterLink)
+           ?releaseYear ?rating ?internationalSales (SAMPLE(xsd:integer(?budget)) AS ?normalizedBudget) WHERE {{
+        ?movieId rdf:type :Movie .
+        ?movieId rdfs:label ?movieName .
+
+        OPTIONAL {{ ?movieId v:posterLink ?wikipediaPosterLink .
+                   FILTER(CONTAINS(STR(?wikipediaPosterLink), "upload.wikimedia.org")) }}
+
+        OPTIONAL {{ ?movieId v:posterLink ?otherPosterLink .
+                   FILTER(!CONTAINS(STR(?otherPosterLink), "upload.wikimedia.org")) }}
+
+        OPTIONAL {{ ?movieId v:releaseYear ?releaseYear . }}
+        OPTIONAL {{ ?movieId v:imdbRating ?rating . }}
+        OPTIONAL {{ ?movieId v:internationalSales ?internationalSales . }}
+        OPTIONAL {{ ?movieId v:budget ?budget . }}
+        OPTIONAL {{ ?movieId v:genre ?genre . }}
+
+        FILTER(
+            REGEX(?movieName, ".*{search_input}.*", "i") ||
+            (BOUND(?genre) && REGEX(?genre, ".*{search_input}.*", "i"))
+        )
+    }}GROUP BY ?movieId ?movieName ?wikipediaPosterLink ?otherPosterLink
+          ?releaseYear ?rating ?internationalSales
+    ORDER BY {order_by}
+    OFFSET {(page - 1) * PAGE_SIZE}
+    LIMIT {PAGE_SIZE + 1}
+    """
+
+
+def build_hydrate_query(movie_ids):
+    # Mengambil data kartu film hanya untuk ID yang ada di halaman ini
+    values = " ".join(f"<{movie_id}>" for movie_id in movie_ids)
+    return f"""{PREFIXES}
+    SELECT ?movieId ?movieName
+           (COALESCE(?wikipediaPosterLink, ?otherPosterLink) AS ?finalPosterLink)
+           ?releaseYear WHERE {{
+        VALUES ?movieId {{ {values} }}
+        ?movieId rdfs:label ?movieName .
+
+        OPTIONAL {{ ?movieId v:posterLink ?wikipediaPosterLink .
+                   FILTER(CONTAINS(STR(?wikipediaPosterLink), "upload.wikimedia.org")) }}
+
+        OPTIONAL {{ ?movieId v:posterLink ?otherPosterLink .
+                   FILTER(!CONTAINS(STR(?otherPosterLink), "upload.wikimedia.org")) }}
+
+        OPTIONAL {{ ?movieId v:releaseYear ?releaseYear . }}
+    }}
+    """
+
+
+def format_search_movie(movie):
+    return {
+        "movieId": movie['movieId']["value"],
+        "movieName": movie["movieName"]["value"],
+        "posterLink": proxy_image_url(
+            movie.get("finalPosterLink", {}).get("value", "/static/user/images/default.jpg"), "grid"
+        ),
+        "releaseYear": movie.get("releaseYear", {}).get("value", "Unknown")
+    }
+
+
+def _order_rows(movie_ids, results):
+    # Hasil dikembalikan sesuai urutan movie_ids, satu baris per film
+    rows = {}
+    for binding in results["results"]["bindings"]:
+        rows.setdefault(binding["movieId"]["value"], binding)
+    return [rows[movie_id] for movie_id in movie_ids if movie_id in rows]
+
+
+def hydrate_movies(movie_ids):
+    if not movie_ids:
+        return []
+    return _order_rows(movie_ids, local_sparql.query(build_hydrate_query(movie_ids), label="search:hydrate"))
+
+
+async def ahydrate_movies(movie_ids):
+    if not movie_ids:
+        return []
+    return _order_rows(movie_ids, await local_sparql.aquery(build_hydrate_query(movie_ids), label="search:hydrate"))
@@ -0,0 +1,218 @@
+from collections import defaultdict
+import base64
+import heapq
+import json
+import threading
+
+from .dataset import get_dataset_version
+from .search import PREFIXES
+from .sparql import local_sparql
+
+MAX_NGRAM = 3
+
+# Kunci urut per mode sort: (nama field, urutan menurun?)
+SORT_FIELDS = {
+    "alphabet_asc": ("name", False),
+    "title_desc": ("name", True),
+    "budget": ("budget", True),
+    "release_year": ("releaseYear", True),
+    "rating": ("rating", True),
+    "international_sales": ("internationalSales", True),
+}
+DEFAULT_SORT = "alphabet_asc"
+
+INDEX_QUERY = f"""{PREFIXES}
+    SELECT ?movieId ?movieName
+           (GROUP_CONCAT(DISTINCT ?genre; separator="|") AS ?genres)
+           (SAMPLE(?releaseYear) AS ?year) (SAMPLE(?rating) AS ?imdbRating)
+           (SAMPLE(?internationalSales) AS ?sales) (SAMPLE(?budget) AS ?movieBudget)
+    WHERE {{
+        ?movieId rdf:type :Movie .
+        ?movieId rdfs:label ?movieName .
+        OPTIONAL {{ ?movieId v:genre ?genre . }}
+        OPTIONAL {{ ?movieId v:releaseYear ?releaseYear . }}
+        OPTIONAL {{ ?movieId v:imdbRating ?rating . }}
+        OPTIONAL {{ ?movieId v:internationalSales ?internationalSales . }}
+        OPTIONAL {{ ?movieId v:budget ?budget . }}
+    }}
+    GROUP BY ?movieId ?movieName
+"""
+
+
+def normalize_sort(sort):
+    return sort if sort in SORT_FIELDS else DEFAULT_SORT
+
+
+def _number(binding, name):
+    try:
+        return float(binding[name]["value"])
+    except (KeyError, ValueError):
+        return None
+
+
+def ngrams(text):
+    for size in range(1, MAX_NGRAM + 1):
+        for start in range(len(text) - size + 1):
+            yield text[start:start + size]
+
+
+class MovieSearchIndex:
+    """
+    Index n-gram (1-3 karakter) atas judul dan genre film. Pencarian
+    mengikuti semantik REGEX ".*x.*" case-insensitive pada query lama:
+    film cocok jika x muncul di judul atau salah satu genrenya.
+    """
+
+    def __init__(self, movies, version=None):
+        self.version = version
+        self.movies = {movie["movieId"]: movie for movie in movies}
+        self.postings = defaultdict(set)
+        self.texts = {}
+        for movie_id, movie in self.movies.items():
+            texts = [movie["name"].lower()] + [genre.lower() for genre in movie["genres"]]
+            self.texts[movie_id] = texts
+            for text in texts:
+                for gram in ngrams(text):
+                    self.postings[gram].add(movie_id)
+
+        # Urutan lengkap dan peringkat per mode sort dihitung sekali saat build
+        self.orders = {sort: self._full_order(sort) for sort in SORT_FIELDS}
+        self.ranks = {
+            sort: {movie_id: rank for rank, movie_id in enumerate(order)}
+            for sort, order in self.orders.items()
+        }
+
+    @classmethod
+    def from_store(cls):
+        results = local_sparql.query(INDEX_QUERY, label="search:index")
+        movies = []
+        for binding in results["results"]["bindings"]:
+            genres = binding.get("genres", {}).get("value", "")
+            movies.append({
+                "movieId": binding["movieId"]["value"],
+                "name": binding["movieName"]["value"],
+                "genres": [genre for genre in genres.split("|") if genre],
+                "releaseYear": _number(binding, "year"),
+                "rating": _number(binding, "imdbRating"),
+                "internationalSales": _number(binding, "sales"),
+                "budget": _number(binding, "movieBudget"),
+            })
+        return cls(movies, version=get_dataset_version())
+
+    def _full_order(self, sort):
+        # Urut berdasarkan (nilai, movieId); film tanpa nilai selalu di akhir
+        field, descending = SORT_FIELDS[sort]
+        present = [movie_id for movie_id, movie in self.movies.items() if movie[field] is not None]
+        missing = sorted(movie_id for movie_id, movie in self.movies.items() if movie[field] is None)
+        present.sort(key=lambda movie_id: (self.movies[movie_id][field], movie_id), reverse=descending)
+        return present + missing
+
+    def match(self, text):
+        text = text.lower()
+        if not text:
+            return set(self.movies)
+        if len(text) <= MAX_NGRAM:
+            return set(self.postings.get(text, ()))
+
+        grams = [text[start:start + MAX_NGRAM] for start in range(len(text) - MAX_NGRAM + 1)]
+        postings = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set.intersection(*postings)
+        return {
+            movie_id for movie_id in candidates
+            if any(text in field for field in self.texts[movie_id])
+        }
+
+    def search(self, text, sort=DEFAULT_SORT):
+        # Mengembalikan ID film yang cocok, sudah terurut sesuai mode sort
+        sort = normalize_sort(sort)
+        if not text:
+            return self.orders[sort]
+        return sorted(self.match(text), key=self.ranks[sort].__getitem__)
+
+    def _precedes(self, sort, movie_id, value, cursor_id):
+        # True jika movie_id berada sebelum (atau sama dengan) posisi cursor
+        field, descending = SORT_FIELDS[sort]
+        current = self.movies[movie_id][field]
+        if current is None or value is None:
+            if current is None and value is None:
+                return movie_id <= cursor_id
+            return value is None
+        if descending:
+            return (current, movie_id) >= (value, cursor_id)
+        return (current, movie_id) <= (value, cursor_id)
+
+    def _position(self, sort, value, cursor_id):
+        # Binary search posisi film pertama setelah cursor pada urutan lengkap.
+        # Memakai kunci di cursor, bukan ID saja, agar tetap benar jika film
+        # cursor sudah tidak ada di dataset
+        order = self.orders[sort]
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            if self._precedes(sort, order[middle], value, cursor_id):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def page(self, text, sort=DEFAULT_SORT, cursor=None, offset=0, size=20):
+        """
+        Mengambil satu halaman ID film mulai setelah cursor (atau dari awal
+        ditambah offset). Mengembalikan (ids, hasNextPage).
+        """
+        sort = normalize_sort(sort)
+        start = 0
+        if cursor:
+            cursor_sort, value, cursor_id = decode_cursor(cursor)
+            if cursor_sort != sort:
+                raise ValueError("Cursor tidak sesuai dengan mode sort")
+            start = self._position(sort, value, cursor_id)
+
+        order = self.orders[sort]
+        limit = offset + size + 1
+        if not text:
+            ids = order[start + offset:start + limit]
+        else:
+            ranks = self.ranks[sort]
+            matched = (ranks[movie_id] for movie_id in self.match(text))
+            ids = [order[rank] for rank in heapq.nsmallest(limit, (rank for rank in matched if rank >= start))]
+            ids = ids[offset:]
+        return ids[:size], len(ids) > size
+
+    def cursor_after(self, sort, movie_id):
+        sort = normalize_sort(sort)
+        field, _ = SORT_FIELDS[sort]
+        return encode_cursor(sort, self.movies[movie_id][field], movie_id)
+
+
+def encode_cursor(sort, value, movie_id):
+    payload = json.dumps([sort, value, movie_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort, value, movie_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Cursor tidak valid")
+    field, _ = SORT_FIELDS.get(sort, (None, None))
+    if field is None or not isinstance(movie_id, str):
+        raise ValueError("Cursor tidak valid")
+    if value is not None and not isinstance(value, str if field == "name" else (int, float)):
+        raise ValueError("Cursor tidak valid")
+    return sort, value, movie_id
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    # Index dibangun sekali dan dibangun ulang jika versi dataset berubah
+    global _index
+    version = get_dataset_version()
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = MovieSearchIndex.from_store()
+        return _index
@@ -1,11 +1,303 @@
-from SPARQLWrapper import SPARQLWrapper, JSON
+import asyncio
+import hashlib
+import itertools
+import json
+import threading
+import time
+import weakref
+
+import httpx
+import requests
 from django.conf import settings
+from rdflib import Graph
+from requests.adapters import HTTPAdapter
+
+from .cache import MISS, get_sparql_cache
+from .dataset import get_dataset_version
+from .rdf_store import get_embedded_graph
+from .resilience import CircuitBreaker, SkippedCall, ahedged, call_timeout, hedged
+from .timing import record_query
+
+MAX_GET_QUERY_LENGTH = 2000
+ASYNC_CLIENT_CONNECTIONS = 16
+
+
+def escape_literal(value):
+    # Escape string agar aman dipakai sebagai literal "..." di dalam query
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def chunked(items, size):
+    items = list(items)
+    size = max(1, size)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def is_empty_result(data):
+    return not data.get("results", {}).get("bindings")
+
+
+def row_count(data):
+    if not isinstance(data, dict) or "results" not in data:
+        return None
+    return len(data["results"]["bindings"])
+
+
+class SparqlClient:
+    """
+    Client SPARQL yang aman dipakai bersamaan oleh banyak thread. Query
+    diberikan per pemanggilan (tidak disimpan di state bersama) dan koneksi
+    HTTP keep-alive dipakai ulang dari pool per endpoint.
+    """
+
+    def __init__(self, name, endpoint, versioned=False, resilient=False, cache=True):
+        self.name = name
+        self.endpoint = endpoint
+        # cache=False untuk client yang menyimpan hasilnya sendiri (mis.
+        # checkpoint reconcile_wikidata) dan harus selalu bertanya ke endpoint
+        self.cache = cache
+        # Endpoint versioned (data lokal) memasukkan versi dataset ke key cache
+        self.versioned = versioned
+        # Endpoint resilient (Wikidata) memakai timeout per query, deadline
+        # halaman, circuit breaker, dan hedged request
+        self.breaker = None
+        if resilient:
+            self.breaker = CircuitBreaker(name)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.SPARQL_POOL_SIZE,
+            pool_block=True,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.headers = {
+            "Accept": "application/sparql-results+json",
+            "User-Agent": settings.SPARQL_USER_AGENT,
+        }
+        self.session.headers.update(self.headers)
+        # httpx.AsyncClient terikat ke event loop yang membuatnya
+        self._async_clients = weakref.WeakKeyDictionary()
+
+    def _send(self, query, timeout=None):
+        read_timeout = timeout or settings.SPARQL_READ_TIMEOUT
+        timeout = (min(settings.SPARQL_CONNECT_TIMEOUT, read_timeout), read_timeout)
+        # Query pendek lewat GET (bisa di-cache oleh endpoint), query
+        # panjang seperti batch VALUES lewat POST
+        if len(query) < MAX_GET_QUERY_LENGTH:
+            response = self.session.get(self.endpoint, params={"query": query}, timeout=timeout)
+        else:
+            response = self.session.post(self.endpoint, data={"query": query}, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _async_client(self):
+        # Klien async terikat ke event loop, jadi disimpan per loop. Pool
+        # httpcore memindai semua koneksinya secara kuadratik setiap kali
+        # request masuk atau selesai, sehingga koneksi dibagi ke beberapa
+        # client kecil (ASYNC_CLIENT_CONNECTIONS per client) yang dipakai
+        # bergiliran. Semaphore menjaga total request berjalan <= pool size
+        loop = asyncio.get_running_loop()
+        state = self._async_clients.get(loop)
+        if state is None:
+            pool_size = max(1, settings.SPARQL_POOL_SIZE)
+            timeout = httpx.Timeout(settings.SPARQL_READ_TIMEOUT, connect=settings.SPARQL_CONNECT_TIMEOUT)
+            clients = []
+            for start in range(0, pool_size, ASYNC_CLIENT_CONNECTIONS):
+                connections = min(ASYNC_CLIENT_CONNECTIONS, pool_size - start)
+                clients.append(httpx.AsyncClient(
+                    headers=self.headers,
+                    timeout=timeout,
+                    limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+                ))
+            state = (itertools.cycle(clients), asyncio.Semaphore(pool_size))
+            self._async_clients[loop] = state
+        return state
+
+    async def _asend(self, query, timeout=None):
+        # Versi non-blocking dari _send untuk view async
+        clients, slots = self._async_client()
+        options = {}
+        if timeout:
+            options["timeout"] = httpx.Timeout(timeout, connect=min(settings.SPARQL_CONNECT_TIMEOUT, timeout))
+        async with slots:
+            client = next(clients)
+            if len(query) < MAX_GET_QUERY_LENGTH:
+                response = await client.get(self.endpoint, params={"query": query}, **options)
+            else:
+                response = await client.post(self.endpoint, data={"query": query}, **options)
+        response.raise_for_status()
+        return response.json()
+
+    def _fetch(self, query):
+        if self.breaker is None:
+            return self._send(query)
+        timeout = call_timeout(settings.WIKIDATA_CALL_TIMEOUT)
+        self.breaker.allow()
+        try:
+            if settings.SPARQL_HEDGE_DELAY and settings.SPARQL_HEDGE_DELAY < timeout:
+                data = hedged(lambda: self._send(query, timeout), settings.SPARQL_HEDGE_DELAY)
+            else:
+                data = self._send(query, timeout)
+        except Exception as e:
+            self.breaker.record(e)
+            raise
+        self.breaker.record()
+        return data
+
+    async def _afetch(self, query):
+        if self.breaker is None:
+            return await self._asend(query)
+        timeout = call_timeout(settings.WIKIDATA_CALL_TIMEOUT)
+        self.breaker.allow()
+        try:
+            # wait_for membatasi total waktu query, termasuk antre di pool
+            if settings.SPARQL_HEDGE_DELAY and settings.SPARQL_HEDGE_DELAY < timeout:
+                data = await asyncio.wait_for(
+                    ahedged(lambda: self._asend(query, timeout), settings.SPARQL_HEDGE_DELAY), timeout
+                )
+            else:
+                data = await asyncio.wait_for(self._asend(query, timeout), timeout)
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            self.breaker.record(e)
+            raise
+        self.breaker.record()
+        return data
+
+    def construct(self, query):
+        # CONSTRUCT dikembalikan sebagai rdflib Graph dan tidak di-cache
+        response = self.session.post(
+            self.endpoint,
+            data={"query": query},
+            headers={"Accept": "text/turtle"},
+            timeout=(settings.SPARQL_CONNECT_TIMEOUT, settings.SPARQL_READ_TIMEOUT),
+        )
+        response.raise_for_status()
+        return Graph().parse(data=response.text, format="turtle")
+
+    def _cache_key(self, query):
+        version = get_dataset_version() if self.versioned else ""
+        raw = f"{self.endpoint}\n{version}\n{query}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _store(self, key, data):
+        # Hasil kosong (mis. "No director URI found") juga di-cache
+        # dengan TTL negatif yang terpisah
+        if is_empty_result(data):
+            ttl = settings.SPARQL_CACHE_NEGATIVE_TTL.get(self.name)
+        else:
+            ttl = settings.SPARQL_CACHE_TTL.get(self.name)
+        get_sparql_cache().set(self.name, key, data, ttl)
+
+    def _cached(self, query):
+        # (key cache, data atau MISS); key None jika cache dimatikan
+        if not settings.SPARQL_CACHE_ENABLED or not self.cache:
+            return None, MISS
+        key = self._cache_key(query)
+        return key, get_sparql_cache().get(self.name, key)
+
+    def query(self, query, label="query"):
+        """
+        label menamai query di instrumentasi per request (Server-Timing),
+        mis. "crew:P344" atau "actor:cast_uri".
+        """
+        start = time.perf_counter()
+        status, data = "off", None
+        try:
+            key, data = self._cached(query)
+            if data is not MISS:
+                status = "hit"
+                return data
+            if key is not None:
+                status = "miss"
+            data = self._fetch(query)
+            if key is not None:
+                self._store(key, data)
+            return data
+        except SkippedCall:
+            status = "skipped"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            record_query(self.name, label, time.perf_counter() - start, row_count(data), status)
+
+    async def aquery(self, query, label="query"):
+        # Sama dengan query(), tetapi request HTTP tidak memblokir event loop.
+        # Cache SQLite tetap diakses langsung karena hanya operasi disk lokal
+        start = time.perf_counter()
+        status, data = "off", None
+        try:
+            key, data = self._cached(query)
+            if data is not MISS:
+                status = "hit"
+                return data
+            if key is not None:
+                status = "miss"
+            data = await self._afetch(query)
+            if key is not None:
+                self._store(key, data)
+            return data
+        except SkippedCall:
+            status = "skipped"
+            raise
+        except Exception:
+            status = "error"
+            raise
+        finally:
+            record_query(self.name, label, time.perf_counter() - start, row_count(data), status)
+
+
+class EmbeddedSparqlClient(SparqlClient):
+    """
+    Menjawab query SPARQL langsung dari rdflib Graph di dalam proses,
+    tanpa GraphDB dan tanpa HTTP. Interface sama dengan SparqlClient.
+    """
+
+    def __init__(self, name, versioned=True):
+        self.name = name
+        self.endpoint = "embedded"
+        self.versioned = versioned
+        self.cache = True
+        self.breaker = None
+        # Parser dan evaluator SPARQL rdflib tidak thread-safe
+        self._lock = threading.Lock()
+
+    def _send(self, query, timeout=None):
+        graph = get_embedded_graph()
+        with self._lock:
+            result = graph.query(query)
+            return json.loads(result.serialize(format="json"))
+
+    async def _asend(self, query, timeout=None):
+        # rdflib tidak punya API async, query dijalankan di thread lain
+        return await asyncio.to_thread(self._send, query)
+
+    def construct(self, query):
+        graph = get_embedded_graph()
+        with self._lock:
+            return graph.query(query).graph
+
+
+def make_local_client(name):
+    if settings.LOCAL_SPARQL_BACKEND == "embedded":
+        return EmbeddedSparqlClient(name)
+    return SparqlClient(name, settings.GRAPHDB_URL, versioned=True)
+
 
 # Inisialisasi SPARQL endpoints
-local_sparql = SPARQLWrapper(settings.GRAPHDB_URL)
-local_sparql.setReturnFormat(JSON)
-wikidata_sparql = SPARQLWrapper("https://query.wikidata.org/sparql")
-wikidata_sparql.setReturnFormat(JSON)
+local_sparql = make_local_client("local")
+# Dengan WIKIDATA_SOURCE=local, query Wikidata dijawab oleh snapshot hasil
+# harvest_wikidata yang dimuat ke named graph di GraphDB lokal
+if settings.WIKIDATA_SOURCE == "local":
+    wikidata_sparql = make_local_client("wikidata")
+else:
+    wikidata_sparql = SparqlClient("wikidata", settings.WIKIDATA_URL, resilient=True)
 
 # Export untuk digunakan di modul lain
 __all__ = ['local_sparql', 'wikidata_sparql']
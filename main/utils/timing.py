@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+import contextvars
+import re
+import threading
+
+# Daftar query SPARQL request yang sedang diproses. List yang sama ikut
+# terbawa ke thread executor dan task async lewat contextvars
+_queries = contextvars.ContextVar("sparql_queries", default=None)
+_lock = threading.Lock()
+
+
+@contextmanager
+def collect_queries():
+    queries = []
+    token = _queries.set(queries)
+    try:
+        yield queries
+    finally:
+        _queries.reset(token)
+
+
+def record_query(endpoint, label, duration, rows, cache):
+    queries = _queries.get()
+    if queries is None:
+        return
+    with _lock:
+        queries.append({
+            "endpoint": endpoint,
+            "label": label,
+            "duration": duration,
+            "rows": rows,
+            "cache": cache,
+        })
+
+
+def summarize(queries):
+    """
+    Menggabungkan query dengan endpoint dan label yang sama. Hasil diurutkan
+    dari total durasi terbesar.
+    """
+    groups = {}
+    for query in queries:
+        group = groups.setdefault((query["endpoint"], query["label"]), {
+            "endpoint": query["endpoint"],
+            "label": query["label"],
+            "count": 0,
+            "duration": 0.0,
+            "rows": 0,
+            "hits": 0,
+            "errors": 0,
+        })
+        group["count"] += 1
+        group["duration"] += query["duration"]
+        group["rows"] += query["rows"] or 0
+        group["hits"] += query["cache"] == "hit"
+        group["errors"] += query["cache"] == "error"
+    return sorted(groups.values(), key=lambda group: group["duration"], reverse=True)
+
+
+def _metric_name(endpoint, label):
+    # Nama metric Server-Timing harus berupa token HTTP
+    return re.sub(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]", "-", f"{endpoint}.{label}")
+
+
+def server_timing_header(queries, max_entries):
+    entries = [
+        f'sparql;dur={sum(query["duration"] for query in queries) * 1000:.1f};desc="{len(queries)} queries"'
+    ]
+    for group in summarize(queries)[:max_entries]:
+        desc = f'{group["label"]} x{group["count"]}, {group["rows"]} rows, {group["hits"]} cached'
+        if group["errors"]:
+            desc += f', {group["errors"]} failed'
+        entries.append(
+            f'{_metric_name(group["endpoint"], group["label"])};dur={group["duration"] * 1000:.1f};desc="{desc}"'
+        )
+    return ", ".join(entries)
+
+
+def print_slowest(path, queries, limit):
+    if not queries:
+        return
+    total = sum(query["duration"] for query in queries)
+    print(f"SPARQL {path}: {len(queries)} queries, {total * 1000:.1f}ms total")
+    for query in sorted(queries, key=lambda query: query["duration"], reverse=True)[:limit]:
+        print(
+            f'  {query["duration"] * 1000:8.1f}ms  {query["endpoint"]:<8} {query["label"]:<24} '
+            f'{query["rows"] if query["rows"] is not None else "-":>5} rows  {query["cache"]}'
+        )
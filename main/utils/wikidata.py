@@ -0,0 +1,212 @@
+from django.conf import settings
+
+from .sparql import chunked, wikidata_sparql
+from .review import merge_imdb_rating
+from .image import remember_images
+
+WIKIDATA_ENTITY = "http://www.wikidata.org/entity/"
+
+# Section yang diambil dengan pola "film -> properti -> item (+ gambar)".
+# Urutan tuple: nama section, properti film, properti gambar item
+PROPERTY_SECTIONS = [
+    ("distributors", "P750", "P154"),
+    ("screenwriters", "P58", "P18"),
+    ("countries_of_origin", "P495", "P41"),
+    ("awards_received", "P166", None),
+    ("filming_locations", "P915", "P18"),
+    ("director_of_photography", "P344", "P18"),
+    ("film_editor", "P1040", "P18"),
+    ("production_designer", "P2554", "P18"),
+    ("costume_designer", "P2515", "P18"),
+    ("composer", "P86", "P18"),
+    ("producer", "P162", "P18"),
+]
+
+ENRICHMENT_SECTIONS = [section for section, _, _ in PROPERTY_SECTIONS] + ["reviews"]
+
+# Batas jumlah item seperti pada query per-section sebelumnya
+SECTION_LIMITS = {
+    "countries_of_origin": 1,
+    "awards_received": 5,
+    "reviews": 5,
+}
+
+
+# Section yang mengikuti semua statement (p:/ps:, termasuk rank deprecated
+# dan non-truthy) seperti query screenwriter lama, bukan hanya wdt:
+STATEMENT_SECTIONS = {"screenwriters"}
+
+
+def _property_branch(image_prop, statements=False):
+    # Satu cabang UNION untuk semua section yang memakai properti gambar sama
+    # (dan cara pengambilan item yang sama), atau None jika tidak ada
+    sections = [
+        (section, prop) for section, prop, section_image_prop in PROPERTY_SECTIONS
+        if section_image_prop == image_prop and (section in STATEMENT_SECTIONS) == statements
+    ]
+    if not sections:
+        return None
+    image = f"\n            OPTIONAL {{ ?item wdt:{image_prop} ?image. }}" if image_prop else ""
+    if statements:
+        rows = " ".join(f'("{section}" p:{prop} ps:{prop})' for section, prop in sections)
+        values = f"VALUES (?section ?claim ?statementValue) {{ {rows} }}"
+        pattern = "?film ?claim ?statement .\n            ?statement ?statementValue ?item ."
+    else:
+        rows = " ".join(f'("{section}" wdt:{prop})' for section, prop in sections)
+        values = f"VALUES (?section ?property) {{ {rows} }}"
+        pattern = "?film ?property ?item ."
+    return f"""{{
+            {values}
+            {pattern}
+            ?item rdfs:label ?label .
+            FILTER(LANG(?label) = "en"){image}
+        }}"""
+
+
+def build_enrichment_query(movie_uris):
+    films = " ".join(f"wd:{uri.split('/')[-1]}" for uri in movie_uris)
+    image_props = list(dict.fromkeys(image_prop for _, _, image_prop in PROPERTY_SECTIONS))
+    branches = [
+        _property_branch(image_prop, statements) for image_prop in image_props for statements in (False, True)
+    ]
+    branches = "\n        UNION\n        ".join(branch for branch in branches if branch)
+    return f"""
+    PREFIX wd: <http://www.wikidata.org/entity/>
+    PREFIX wdt: <http://www.wikidata.org/prop/direct/>
+    PREFIX p: <http://www.wikidata.org/prop/>
+    PREFIX ps: <http://www.wikidata.org/prop/statement/>
+    PREFIX pq: <http://www.wikidata.org/prop/qualifier/>
+    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
+
+    SELECT ?film ?section ?item ?label ?image ?score WHERE {{
+        VALUES ?film {{ {films} }}
+        {branches}
+        UNION
+        {{
+            BIND("reviews" AS ?section)
+            ?film p:P444 ?reviewStatement .
+            ?reviewStatement ps:P444 ?score .
+            OPTIONAL {{
+                ?reviewStatement pq:P447 ?item .
+                ?item rdfs:label ?label .
+                FILTER(LANG(?label) = "en")
+            }}
+        }}
+    }}
+    """
+
+
+def _empty_sections():
+    return {section: [] for section in ENRICHMENT_SECTIONS}
+
+
+def split_enrichment_bindings(bindings):
+    """
+    Memecah hasil query gabungan menjadi {film: {section: [...]}} dengan
+    bentuk dict yang sama seperti helper per-section.
+    """
+    films = {}
+    seen = {}
+    for binding in bindings:
+        film = binding["film"]["value"]
+        section = binding["section"]["value"]
+        sections = films.setdefault(film, _empty_sections())
+        items = sections[section]
+
+        if section == "reviews":
+            items.append({
+                "reviewer_label": binding.get("label", {}).get("value", "Unknown Reviewer"),
+                "reviewer_uri": binding.get("item", {}).get("value", "#"),
+                "score": binding.get("score", {}).get("value", ""),
+            })
+            continue
+
+        image = binding["image"]["value"] if "image" in binding else None
+        image_key = "logo" if section == "distributors" else "image"
+        key = (film, section, binding["item"]["value"])
+        if key in seen:
+            # Item yang sama muncul sekali per gambar, cukup ambil satu gambar
+            existing = items[seen[key]]
+            if image and image_key in existing and existing[image_key] is None:
+                existing[image_key] = image
+            continue
+
+        item = {"label": binding["label"]["value"], "uri": binding["item"]["value"]}
+        if section != "awards_received":
+            item[image_key] = image
+        seen[key] = len(items)
+        items.append(item)
+
+    for sections in films.values():
+        for section, limit in SECTION_LIMITS.items():
+            del sections[section][limit:]
+    return films
+
+
+def _remember_crew_images(films):
+    # Foto crew (P18) ikut disimpan ke memo gambar agar tidak dicari ulang
+    p18_sections = [section for section, _, image_prop in PROPERTY_SECTIONS if image_prop == "P18"]
+    for sections in films.values():
+        for section in p18_sections:
+            remember_images({item["uri"]: item["image"] for item in sections[section]})
+
+
+def fetch_enrichment_batch(movie_uris):
+    # Satu query Wikidata untuk semua section dari semua film yang diminta
+    movie_uris = [uri for uri in movie_uris if uri.startswith(WIKIDATA_ENTITY)]
+    if not movie_uris:
+        return {}
+    results = wikidata_sparql.query(build_enrichment_query(movie_uris), label="enrichment")
+    films = split_enrichment_bindings(results["results"]["bindings"])
+    _remember_crew_images(films)
+    return films
+
+
+async def afetch_enrichment_batch(movie_uris):
+    movie_uris = [uri for uri in movie_uris if uri.startswith(WIKIDATA_ENTITY)]
+    if not movie_uris:
+        return {}
+    results = await wikidata_sparql.aquery(build_enrichment_query(movie_uris), label="enrichment")
+    films = split_enrichment_bindings(results["results"]["bindings"])
+    _remember_crew_images(films)
+    return films
+
+
+def fetch_enrichment_many(movie_uris):
+    """
+    Enrichment untuk banyak film, satu query per ENRICHMENT_BATCH_SIZE film.
+    Hasil: film -> sections, atau Exception jika batch film tersebut gagal.
+    """
+    movie_uris = list(dict.fromkeys(uri for uri in movie_uris if uri.startswith(WIKIDATA_ENTITY)))
+    films = {}
+    for batch in chunked(movie_uris, settings.ENRICHMENT_BATCH_SIZE):
+        try:
+            found = fetch_enrichment_batch(batch)
+        except Exception as e:
+            print(f"Error fetching enrichment batch: {e}")
+            found = {uri: e for uri in batch}
+        films.update(found)
+    return films
+
+
+def _with_imdb_rating(films, movie_uri, imdb_rating):
+    sections = films.get(movie_uri, _empty_sections())
+    sections["reviews"] = merge_imdb_rating(sections["reviews"], imdb_rating)
+    return sections
+
+
+def enrichment_for(films, movie_uri, imdb_rating=None):
+    # Section satu film dari hasil fetch_enrichment_many. Disalin dulu karena
+    # satu film Wikidata bisa dipakai oleh lebih dari satu film lokal
+    sections = films.get(movie_uri)
+    if isinstance(sections, Exception):
+        raise sections
+    return _with_imdb_rating({movie_uri: dict(sections)} if sections else {}, movie_uri, imdb_rating)
+
+
+def fetch_enrichment(movie_uri, imdb_rating=None):
+    return _with_imdb_rating(fetch_enrichment_batch([movie_uri]), movie_uri, imdb_rating)
+
+
+async def afetch_enrichment(movie_uri, imdb_rating=None):
+    return _with_imdb_rating(await afetch_enrichment_batch([movie_uri]), movie_uri, imdb_rating)
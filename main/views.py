@@ -1,25 +1,52 @@
+import asyncio
+import json
+import os
+
+from concurrent.futures import TimeoutError, as_completed
+
+from django.conf import settings
 from django.shortcuts import render
-from django.http import HttpResponseRedirect, JsonResponse
+from django.http import FileResponse, HttpResponse, HttpResponseRedirect, JsonResponse, StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import add_never_cache_headers, patch_cache_control
 from django.urls import reverse
-
-from .utils.distributor import fetch_all_distributors
-from .utils.director import process_director 
-from .utils.actor import process_actors
-from .utils.screenwriter import fetch_all_screenwriters
-from .utils.review import fetch_review_scores
-from .utils.time import format_running_time
-from .utils.additional import fetch_country_of_origin, fetch_awards_received, fetch_filming_locations
-from .utils.supporting import (
-    fetch_director_of_photography,
-    fetch_film_editor,
-    fetch_production_designer,
-    fetch_costume_designer,
-    fetch_composer,
-    fetch_producer
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_http_methods
+
+from .utils.director import aprocess_director, process_director, process_directors_batch
+from .utils.actor import aprocess_actors, process_actors, process_actors_batch
+from .utils.movie import build_movie_query, fetch_movies, movie_uri, parse_movies
+from .utils.wikidata import (
+    ENRICHMENT_SECTIONS, afetch_enrichment, enrichment_for, fetch_enrichment, fetch_enrichment_many,
 )
 
+from .utils.enrichment import arun_enrichment, run_enrichment, submit
+from .utils.search import PAGE_SIZE, ahydrate_movies, build_regex_search_query, format_search_movie, hydrate_movies
+from .utils.search_index import decode_cursor, get_search_index, normalize_sort
+from .utils.cache import MISS, get_search_cache
+from .utils.dataset import get_dataset_version
+from .utils.http_cache import http_cache
+from .utils.image_proxy import UnsupportedImage, get_variant, image_key, is_proxyable, normalize_image_url, proxy_image_url
+from .utils.resilience import page_deadline
 from .utils.sparql import local_sparql 
 
+SECTION_NAMES = ["stars", "director"] + ENRICHMENT_SECTIONS
+
+# Slot di detail_movie.html yang diisi oleh setiap task enrichment
+# (template partial-nya ada di templates/detail/<slot>.html)
+STREAM_SLOTS = {
+    "stars": ["stars"],
+    "director": ["director"],
+    "wikidata": [
+        "country_flags", "reviews", "countries", "awards", "filming_locations", "distributors",
+        "producer", "screenwriters", "director_of_photography", "film_editor",
+        "production_designer", "costume_designer", "composer",
+    ],
+}
+STREAM_MARKER = "<!-- sections -->"
+# Slot template untuk section yang namanya berbeda
+SECTION_SLOTS = {"countries_of_origin": ["countries"], "awards_received": ["awards"]}
+
 def landing_page(request):
     return render(request, "landing.html")
 
@@ -28,90 +55,129 @@ def main_page(request):
     context = {"search": search}
     return render(request, "main.html", context)
 
-def search_movies(request):
-    PAGE_SIZE = 20
-    search_input = request.GET.get("movie", "").strip()
-    sort_input = request.GET.get("sort", "").strip()
-    page = int(request.GET.get("page", 1))
-    
-    # Menentukan ORDER BY berdasarkan sort_input
-    if sort_input == "alphabet_asc":
-        order_by = "ASC(?movieName)"
-    elif sort_input == "budget":
-        order_by = "DESC(?budget)"
-    elif sort_input == "title_desc":
-        order_by = "DESC(?movieName)"
-    elif sort_input == "release_year":
-        order_by = "DESC(xsd:integer(?releaseYear))"
-    elif sort_input == "rating":
-        order_by = "DESC(xsd:decimal(?rating))"
-    elif sort_input == "international_sales":
-        order_by = "DESC(xsd:decimal(?internationalSales))"
-    else:
-        order_by = "ASC(?movieName)"
-    
-    sparql_query = f"""
-    PREFIX : <http://nama-kelompok.org/data/> 
-    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    PREFIX v: <http://nama-kelompok.org/vocab#>
-    PREFIX wd: <http://www.wikidata.org/entity/>
-    PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-
-    SELECT DISTINCT ?movieId ?movieName 
-           (COALESCE(?wikipediaPosterLink, ?otherPosterLink) AS ?finalPosterLink) 
-           ?releaseYear ?rating ?internationalSales (SAMPLE(xsd:integer(?budget)) AS ?normalizedBudget) WHERE {{
-        ?movieId rdf:type :Movie .
-        ?movieId rdfs:label ?movieName .
-        
-        OPTIONAL {{ ?movieId v:posterLink ?wikipediaPosterLink . 
-                   FILTER(CONTAINS(STR(?wikipediaPosterLink), "upload.wikimedia.org")) }}
-        
-        OPTIONAL {{ ?movieId v:posterLink ?otherPosterLink .
-                   FILTER(!CONTAINS(STR(?otherPosterLink), "upload.wikimedia.org")) }}
-                   
-        OPTIONAL {{ ?movieId v:releaseYear ?releaseYear . }}
-        OPTIONAL {{ ?movieId v:imdbRating ?rating . }}
-        OPTIONAL {{ ?movieId v:internationalSales ?internationalSales . }}
-        OPTIONAL {{ ?movieId v:budget ?budget . }}
-        OPTIONAL {{ ?movieId v:genre ?genre . }}
-        
-        FILTER(
-            REGEX(?movieName, ".*{search_input}.*", "i") || 
-            (BOUND(?genre) && REGEX(?genre, ".*{search_input}.*", "i"))
-        )
-    }}GROUP BY ?movieId ?movieName ?wikipediaPosterLink ?otherPosterLink 
-          ?releaseYear ?rating ?internationalSales
-    ORDER BY {order_by}
-    OFFSET {(page - 1) * PAGE_SIZE}
-    LIMIT {PAGE_SIZE + 1}
-    """
+def _search_params(request):
+    # Mengembalikan (params, response error)
+    params = {
+        "search": request.GET.get("movie", "").strip(),
+        "sort": request.GET.get("sort", "").strip(),
+        "cursor": request.GET.get("cursor", "").strip(),
+    }
 
-    local_sparql.setQuery(sparql_query)
+    # Parameter page tetap didukung, tetapi dibatasi agar halaman yang sangat
+    # dalam tidak membebani server. Halaman berikutnya memakai cursor
     try:
-        query_results = local_sparql.query().convert()["results"]["bindings"]
+        params["page"] = int(request.GET.get("page", 1))
+    except ValueError:
+        return None, JsonResponse({"error": "Parameter page tidak valid"}, status=400)
+    # Cursor hanya dipakai backend index. Backend sparql selalu memakai
+    # OFFSET dari page, jadi cursor diabaikan dan batas page tetap berlaku
+    if settings.SEARCH_BACKEND == "sparql":
+        params["cursor"] = ""
+    elif params["cursor"]:
+        try:
+            decode_cursor(params["cursor"])
+        except ValueError as e:
+            return None, JsonResponse({"error": str(e)}, status=400)
+    if params["page"] < 1 or (params["page"] > settings.SEARCH_MAX_PAGE and not params["cursor"]):
+        return None, JsonResponse(
+            {"error": f"Parameter page harus antara 1 dan {settings.SEARCH_MAX_PAGE}, gunakan cursor"},
+            status=400,
+        )
+    return params, None
+
+def _cached_search(params):
+    # Response JSON di-cache per (backend, kata kunci, sort, page, cursor)
+    # dan otomatis dikosongkan saat versi dataset berubah
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None, None, None
+    version = get_dataset_version()
+    cache_key = (
+        settings.SEARCH_BACKEND, params["search"].lower(), normalize_sort(params["sort"]),
+        params["page"], params["cursor"],
+    )
+    cached = get_search_cache().get(cache_key, version)
+    if cached is MISS:
+        return cache_key, version, None
+    return cache_key, version, HttpResponse(cached, content_type="application/json")
+
+def _index_page(params):
+    # Index in-memory menentukan ID film di halaman ini,
+    # GraphDB hanya mengambil data untuk ID tersebut
+    index = get_search_index()
+    offset = 0 if params["cursor"] else (params["page"] - 1) * PAGE_SIZE
+    movie_ids, hasNextPage = index.page(params["search"], params["sort"], params["cursor"], offset, PAGE_SIZE)
+    nextCursor = index.cursor_after(params["sort"], movie_ids[-1]) if hasNextPage else None
+    return movie_ids, hasNextPage, nextCursor
+
+def _search_response(params, query_results, hasNextPage, nextCursor, cache_key, version):
+    data = {
+        "hasNextPage": hasNextPage,
+        "currentPage": params["page"],
+        "nextCursor": nextCursor,
+        "movies": [format_search_movie(movie) for movie in query_results]
+    }
+
+    response = JsonResponse(data)
+    if cache_key is not None:
+        pinned = not params["search"] and not params["cursor"] and params["page"] <= settings.SEARCH_CACHE_PIN_PAGES
+        get_search_cache().set(cache_key, response.content, version, pinned=pinned)
+    return response
+
+@http_cache("search")
+def search_movies(request):
+    params, error = _search_params(request)
+    if error:
+        return error
+    cache_key, version, cached = _cached_search(params)
+    if cached:
+        return cached
 
-        hasNextPage = False
-        if len(query_results) > PAGE_SIZE:
-            hasNextPage = True
+    try:
+        nextCursor = None
+        if settings.SEARCH_BACKEND == "sparql":
+            sparql_query = build_regex_search_query(params["search"], params["sort"], params["page"])
+            query_results = local_sparql.query(sparql_query, label="search:regex")["results"]["bindings"]
+            hasNextPage = len(query_results) > PAGE_SIZE
             query_results = query_results[:PAGE_SIZE]
+        else:
+            try:
+                movie_ids, hasNextPage, nextCursor = _index_page(params)
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+            query_results = hydrate_movies(movie_ids)
 
-        data = {
-            "hasNextPage": hasNextPage,
-            "currentPage": page,
-            "movies": []
-        }
+        return _search_response(params, query_results, hasNextPage, nextCursor, cache_key, version)
 
-        for movie in query_results:
-            tempData = {
-                "movieId": movie['movieId']["value"],
-                "movieName": movie["movieName"]["value"],
-                "posterLink": movie.get("finalPosterLink", {}).get("value", "/static/user/images/default.jpg"),
-                "releaseYear": movie.get("releaseYear", {}).get("value", "Unknown")
-            }
-            data["movies"].append(tempData)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
 
-        return JsonResponse(data)
+@http_cache("search")
+async def asearch_movies(request):
+    # Versi async dari search_movies untuk ASGI
+    params, error = _search_params(request)
+    if error:
+        return error
+    cache_key, version, cached = _cached_search(params)
+    if cached:
+        return cached
+
+    try:
+        nextCursor = None
+        if settings.SEARCH_BACKEND == "sparql":
+            sparql_query = build_regex_search_query(params["search"], params["sort"], params["page"])
+            query_results = (await local_sparql.aquery(sparql_query, label="search:regex"))["results"]["bindings"]
+            hasNextPage = len(query_results) > PAGE_SIZE
+            query_results = query_results[:PAGE_SIZE]
+        else:
+            # Index dibangun secara sinkron saat pertama kali dipakai,
+            # jadi dijalankan di thread agar event loop tidak terblokir
+            try:
+                movie_ids, hasNextPage, nextCursor = await asyncio.to_thread(_index_page, params)
+            except ValueError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+            query_results = await ahydrate_movies(movie_ids)
+
+        return _search_response(params, query_results, hasNextPage, nextCursor, cache_key, version)
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
@@ -125,153 +191,317 @@ def get_movie_data(request, id):
     context = {"id": id}
     return JsonResponse(context)
 
+def fetch_director(data_movie):
+    # process_director mengubah dict yang diberikan, jadi gunakan salinan
+    # agar aman dijalankan bersamaan dengan section lain
+    return process_director(dict(data_movie))["director"]
+
+def _enrichment_tasks(data_movie, asynchronous=False):
+    # Aktor, director, dan section Wikidata lain (satu query gabungan)
+    # saling independen, jadi dijalankan paralel
+    wikidata_uri = data_movie["wikidataUri"]
+    imdb_rating = data_movie.get("rating")
+    if asynchronous:
+        return {
+            "stars": (aprocess_actors, data_movie),
+            "director": (aprocess_director, data_movie),
+            "wikidata": (afetch_enrichment, wikidata_uri, imdb_rating),
+        }
+    return {
+        "stars": (process_actors, data_movie),
+        "director": (fetch_director, data_movie),
+        "wikidata": (fetch_enrichment, wikidata_uri, imdb_rating),
+    }
+
+def _skip_reason(error):
+    # Pesan singkat di halaman untuk section yang dilewati
+    if error == "timeout" or error.startswith("Deadline") or "timed out" in error.lower() or "Timeout" in error:
+        return "Wikidata took too long to respond"
+    if error.startswith("Circuit"):
+        return "Wikidata is temporarily unavailable"
+    return "Wikidata could not be reached"
+
+def _proxy_section_images(value):
+    if isinstance(value, dict):
+        if not any(value.get(key) for key in ("image", "logo")):
+            return value
+        value = dict(value)
+        for key in ("image", "logo"):
+            if value.get(key):
+                value[key] = proxy_image_url(value[key], "thumb")
+        return value
+    if isinstance(value, list):
+        return [_proxy_section_images(item) for item in value]
+    return value
+
+def _apply_sections(data_movie, sections, errors):
+    sections.update(sections.pop("wikidata", {}))
+    if "wikidata" in errors:
+        error = errors.pop("wikidata")
+        errors.update({section: error for section in ENRICHMENT_SECTIONS})
+
+    for section in SECTION_NAMES:
+        if section in sections:
+            data_movie[section] = sections[section]
+        elif section == "director":
+            data_movie[section] = {"label": "Tidak terdapat data director", "image": None, "uri": None}
+        else:
+            data_movie[section] = []
+    data_movie["section_errors"] = errors
+    data_movie["skipped"] = {
+        slot: _skip_reason(error)
+        for section, error in errors.items()
+        for slot in SECTION_SLOTS.get(section, [section])
+    }
+
+    # Gambar section (foto, logo, bendera) lewat image proxy. Item disalin
+    # karena list section bisa berasal dari cache yang dipakai bersama
+    for section in SECTION_NAMES:
+        data_movie[section] = _proxy_section_images(data_movie[section])
+
+    # Menetapkan photoUrl
+    poster_link = data_movie.get("finalPosterLink", "").strip() 
+    if poster_link and poster_link != "Tidak terdapat data posterLink":
+        data_movie["photoUrl"] = proxy_image_url(poster_link, "detail")
+    else:
+        data_movie["photoUrl"] = "{% static 'user/images/placeholder.jpg' %}"
+    return data_movie
+
+def _detail_response(request, data_movie):
+    response = render(request, "detail_movie.html", {"movie": data_movie})
+    if data_movie["section_errors"]:
+        # Halaman dengan section yang gagal tidak di-cache agar request
+        # berikutnya mencoba Wikidata lagi
+        add_never_cache_headers(response)
+    return response
+
 # Mengambil detail dari movie
+@http_cache("detail")
 def get_movie_details(request, uri=None):
-    if not uri.startswith("http://"):
-        uri = f"http://nama-kelompok.org/data/{uri}"
-
-    # Query SPARQL fetch data lokal
-    sparql_query = f"""
-    PREFIX : <http://nama-kelompok.org/data/> 
-    PREFIX rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#>
-    PREFIX rdfs: <http://www.w3.org/2000/01/rdf-schema#>
-    PREFIX v: <http://nama-kelompok.org/vocab#>
-    PREFIX wd: <http://www.wikidata.org/entity/>
-    PREFIX xsd: <http://www.w3.org/2001/XMLSchema#>
-
-    SELECT DISTINCT ?movies ?title ?director 
-           (GROUP_CONCAT(DISTINCT ?genre; separator=", ") AS ?genres) 
-           ?rating ?metaScore ?information 
-           (COALESCE(?wikipediaPosterLink, ?otherPosterLink) AS ?finalPosterLink)
-           ?releaseYear ?runningTime 
-           (GROUP_CONCAT(DISTINCT ?star; separator=", ") AS ?stars) 
-           ?votes ?wikidataUri ?distributor
-           ?budget ?certificate ?domesticOpening ?domesticSales 
-           ?internationalSales ?license ?releaseDate
-    WHERE {{
-        ?movies rdf:type :Movie .
-        ?movies rdfs:label ?title .
-        
-        OPTIONAL {{ ?movies v:director ?director. }}
-        OPTIONAL {{ ?movies v:distributor ?distributor. }}
-        OPTIONAL {{ ?movies v:genre ?genre. }}
-        OPTIONAL {{ ?movies v:imdbRating ?rating. }}
-        OPTIONAL {{ ?movies v:metaScore ?metaScore. }}
-        OPTIONAL {{ ?movies v:movieInfo ?information. }}
-
-        OPTIONAL {{ ?movies v:posterLink ?wikipediaPosterLink . 
-        FILTER(CONTAINS(STR(?wikipediaPosterLink), "upload.wikimedia.org")) }}
-        
-        OPTIONAL {{ ?movies v:posterLink ?otherPosterLink .
-        FILTER(!CONTAINS(STR(?otherPosterLink), "upload.wikimedia.org")) }}
-        OPTIONAL {{ ?movies v:releaseYear ?releaseYear. }}
-        OPTIONAL {{ ?movies v:runningTime ?runningTime. }}
-        OPTIONAL {{ ?movies v:star ?star. }}
-        OPTIONAL {{ ?movies v:votes ?votes. }}
-        OPTIONAL {{ ?movies v:wikidataUri ?wikidataUri. }}
-        OPTIONAL {{ ?movies v:budget ?budget. }}
-        OPTIONAL {{ ?movies v:certificate ?certificate. }}
-        OPTIONAL {{ ?movies v:domesticOpening ?domesticOpening. }}
-        OPTIONAL {{ ?movies v:domesticSales ?domesticSales. }}
-        OPTIONAL {{ ?movies v:internationalSales ?internationalSales. }}
-        OPTIONAL {{ ?movies v:license ?license. }}
-        OPTIONAL {{ ?movies v:releaseDate ?releaseDate. }}
-        VALUES ?movies {{ <{uri}> }} 
-    }}
-    GROUP BY ?movies ?title ?director ?rating ?metaScore ?information 
-         ?releaseYear ?runningTime ?votes ?wikidataUri ?distributor
-         ?budget ?certificate ?domesticOpening ?domesticSales 
-         ?internationalSales ?license ?releaseDate 
-         ?wikipediaPosterLink ?otherPosterLink
-    LIMIT 1
-    """
-    local_sparql.setQuery(sparql_query)
+    uri = movie_uri(uri)
     try:
-        results = local_sparql.query().convert()
-
-        attributes = [
-            "director", "genres", "rating", "metaScore", "information",
-            "finalPosterLink", "releaseYear", "runningTime", 
-            "stars", "votes", "wikidataUri", "distributor",
-            "budget", "certificate", "domesticOpening", "domesticSales",
-            "internationalSales", "license", "releaseDate"
-        ]
-
-        if results["results"]["bindings"]:
-            result = results["results"]["bindings"][0]
-            data_movie = {
-                "movies": result["movies"]["value"],
-                "title": result["title"]["value"],
-            }
-
-            for attr in attributes:
-                if attr in result:
-                    value = result[attr]["value"]
-                    # Konversi tipe data sesuai kebutuhan
-                    if attr in ["budget", "domesticOpening", "domesticSales", "internationalSales", "votes"]:
-                        try:
-                            value = int(value)
-                        except ValueError:
-                            value = value 
-                    elif attr in ["releaseDate"]:
-                        value = value.split("^^")[0].strip('"')
-                    data_movie[attr] = value
-                else:
-                    data_movie[attr] = f"Tidak terdapat data {attr}"
-
-            # Mengambil nama aktor
-            actors_final = process_actors(data_movie)
-            data_movie["stars"] = actors_final
-
-            # Mengambil nama distributor
-            distributors = fetch_all_distributors(data_movie["wikidataUri"])
-            data_movie["distributors"] = distributors
-
-            # Mengambil nama director menggunakan fungsi process_director
-            data_movie = process_director(data_movie)
-
-            # Mengambil nama screenwriter
-            screenwriters = fetch_all_screenwriters(data_movie["wikidataUri"])
-            data_movie["screenwriters"] = screenwriters
-
-            # Mengambil running time film
-            running_time = data_movie.get("runningTime", "")
-            data_movie["runningTime"] = format_running_time(running_time)
-
-            # Mengambil review scores, tambahkan rating IMDb jika perlu
-            imdb_rating = data_movie.get("rating")
-            reviews = fetch_review_scores(data_movie["wikidataUri"], imdb_rating)
-            data_movie["reviews"] = reviews
-
-            # Mengambil data tambahan
-            countries = fetch_country_of_origin(data_movie["wikidataUri"])
-            data_movie["countries_of_origin"] = countries
-
-            awards = fetch_awards_received(data_movie["wikidataUri"])
-            data_movie["awards_received"] = awards
-
-            filming_locations = fetch_filming_locations(data_movie["wikidataUri"])
-            data_movie["filming_locations"] = filming_locations
-
-            # Fetch crew members
-            data_movie["director_of_photography"] = fetch_director_of_photography(data_movie["wikidataUri"])
-            data_movie["film_editor"] = fetch_film_editor(data_movie["wikidataUri"])
-            data_movie["production_designer"] = fetch_production_designer(data_movie["wikidataUri"])
-            data_movie["costume_designer"] = fetch_costume_designer(data_movie["wikidataUri"])
-            data_movie["composer"] = fetch_composer(data_movie["wikidataUri"])
-            data_movie["producer"] = fetch_producer(data_movie["wikidataUri"])
-
-            # Menetapkan photoUrl
-            poster_link = data_movie.get("finalPosterLink", "").strip() 
-            if poster_link and poster_link != "Tidak terdapat data posterLink":
-                data_movie["photoUrl"] = poster_link
-            else:
-                data_movie["photoUrl"] = "{% static 'user/images/placeholder.jpg' %}"
-
-            return render(request, "detail_movie.html", {"movie": data_movie})
+        movies = parse_movies(local_sparql.query(build_movie_query([uri]), label="movie:detail"))
+        if uri not in movies:
+            return JsonResponse({"error": "Film tidak ditemukan"}, status=404)
 
-        else:
+        data_movie = movies[uri]
+        # Semua query Wikidata halaman ini berhenti setelah DETAIL_PAGE_DEADLINE,
+        # section yang belum selesai ditampilkan sebagai tidak tersedia
+        with page_deadline(settings.DETAIL_PAGE_DEADLINE):
+            sections, errors = run_enrichment(
+                _enrichment_tasks(data_movie), timeout=settings.DETAIL_PAGE_DEADLINE or None
+            )
+        _apply_sections(data_movie, sections, errors)
+        return _detail_response(request, data_movie)
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+@http_cache("detail")
+async def aget_movie_details(request, uri=None):
+    # Versi async: semua query Wikidata di-await bersamaan di event loop,
+    # sehingga satu worker ASGI dapat melayani banyak request sekaligus
+    uri = movie_uri(uri)
+    try:
+        movies = parse_movies(await local_sparql.aquery(build_movie_query([uri]), label="movie:detail"))
+        if uri not in movies:
             return JsonResponse({"error": "Film tidak ditemukan"}, status=404)
 
+        data_movie = movies[uri]
+        with page_deadline(settings.DETAIL_PAGE_DEADLINE):
+            sections, errors = await arun_enrichment(
+                _enrichment_tasks(data_movie, asynchronous=True), timeout=settings.DETAIL_PAGE_DEADLINE or None
+            )
+        _apply_sections(data_movie, sections, errors)
+        return _detail_response(request, data_movie)
+
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+def _section_chunk(slot, html):
+    # Konten section dikirim sebagai <template> lalu dipindahkan ke slotnya
+    return f'<template id="section-{slot}-content">{html}</template><script>fillSection("{slot}")</script>\n'
+
+def _render_task_sections(task, result, data_movie, error=None):
+    movie = dict(data_movie)
+    sections = {} if error else {task: result}
+    _apply_sections(movie, sections, {task: error} if error else {})
+    chunks = []
+    for slot in STREAM_SLOTS[task]:
+        if slot in movie["skipped"]:
+            html = render_to_string("detail/unavailable.html", {"reason": movie["skipped"][slot]})
+        else:
+            html = render_to_string(f"detail/{slot}.html", {"movie": movie})
+        chunks.append(_section_chunk(slot, html))
+    return "".join(chunks)
+
+def stream_movie_details(request, uri=None):
+    """
+    Halaman detail yang dikirim bertahap: data lokal (judul, poster, rating,
+    running time) langsung dikirim, lalu setiap section Wikidata menyusul
+    begitu selesai. Section yang melewati DETAIL_STREAM_DEADLINE diganti
+    placeholder. Header dikirim sebelum section selesai, jadi response ini
+    tidak memakai http_cache dan tidak boleh disimpan cache bersama.
+    """
+    uri = movie_uri(uri)
+    try:
+        movies = parse_movies(local_sparql.query(build_movie_query([uri]), label="movie:detail"))
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+    if uri not in movies:
+        return JsonResponse({"error": "Film tidak ditemukan"}, status=404)
+
+    # Task memakai data asli; shell dirender dengan section default
+    data_movie = movies[uri]
+    with page_deadline(settings.DETAIL_STREAM_DEADLINE):
+        futures = {
+            submit(func, *args): task
+            for task, (func, *args) in _enrichment_tasks(dict(data_movie)).items()
+        }
+    _apply_sections(data_movie, {}, {})
+    page = render_to_string("detail_movie.html", {"movie": data_movie, "streaming": True}, request=request)
+    head, tail = page.split(STREAM_MARKER, 1)
+
+    def stream():
+        yield head
+        pending = dict(futures)
+        try:
+            for future in as_completed(futures, timeout=settings.DETAIL_STREAM_DEADLINE):
+                task = pending.pop(future)
+                try:
+                    yield _render_task_sections(task, future.result(), data_movie)
+                except Exception as e:
+                    print(f"Error fetching section {task}: {e}")
+                    yield _render_task_sections(task, None, data_movie, str(e) or type(e).__name__)
+        except TimeoutError:
+            for future, task in pending.items():
+                future.cancel()
+                yield _render_task_sections(task, None, data_movie, "timeout")
+        yield tail
+
+    response = StreamingHttpResponse(stream(), content_type="text/html; charset=utf-8")
+    # Mencegah proxy (mis. nginx) menahan chunk sampai response selesai
+    response["X-Accel-Buffering"] = "no"
+    # Section bisa berakhir sebagai placeholder "unavailable" setelah header
+    # terkirim, jadi halaman ini tidak di-cache CDN dan selalu divalidasi ulang
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+def _batch_ids(request):
+    # ID film dari ?ids=a,b,c (boleh berulang) atau body JSON {"ids": [...]}
+    if request.method == "POST":
+        try:
+            ids = json.loads(request.body or b"{}").get("ids", [])
+        except (ValueError, AttributeError):
+            return None, JsonResponse({"error": "Body JSON tidak valid"}, status=400)
+        if not isinstance(ids, list) or not all(isinstance(id, str) for id in ids):
+            return None, JsonResponse({"error": "ids harus berupa list string"}, status=400)
+    else:
+        ids = [id for value in request.GET.getlist("ids") for id in value.split(",")]
+
+    ids = list(dict.fromkeys(id.strip() for id in ids if id.strip()))
+    if not ids:
+        return None, JsonResponse({"error": "Parameter ids wajib diisi"}, status=400)
+    if len(ids) > settings.MOVIE_API_MAX_IDS:
+        return None, JsonResponse(
+            {"error": f"Maksimal {settings.MOVIE_API_MAX_IDS} film per request"}, status=400
+        )
+    return ids, None
+
+def _batch_document(uri, data_movie, sections, errors):
+    # Memilih hasil batch milik satu film lalu disusun seperti get_movie_details
+    movie_sections = {}
+    movie_errors = dict(errors)
+    for task in ("stars", "director"):
+        if task in sections:
+            movie_sections[task] = sections[task].get(uri)
+    if "wikidata" in sections:
+        try:
+            movie_sections["wikidata"] = enrichment_for(
+                sections["wikidata"], data_movie["wikidataUri"], data_movie.get("rating")
+            )
+        except Exception as e:
+            movie_errors["wikidata"] = str(e) or type(e).__name__
+    return _apply_sections(data_movie, movie_sections, movie_errors)
+
+def build_movie_documents(movies):
+    """
+    Dokumen detail (field sama seperti get_movie_details) untuk banyak film
+    dari fetch_movies. Aktor, director, dan enrichment Wikidata semua film
+    dijalankan paralel dengan query batch.
+    """
+    sections, errors = run_enrichment({
+        "stars": (process_actors_batch, movies),
+        "director": (process_directors_batch, movies),
+        "wikidata": (fetch_enrichment_many, [movie["wikidataUri"] for movie in movies.values()]),
+    })
+    return {
+        uri: _batch_document(uri, data_movie, sections, errors)
+        for uri, data_movie in movies.items()
+    }
+
+# Detail banyak film sekaligus dalam JSON, dengan field yang sama seperti
+# get_movie_details. Semua film di-resolve dengan query batch (VALUES),
+# bukan satu halaman detail per film
+@csrf_exempt
+@require_http_methods(["GET", "POST"])
+@http_cache("api")
+def get_movie_details_batch(request):
+    ids, error = _batch_ids(request)
+    if error:
+        return error
+
+    uris = {id: movie_uri(id) for id in ids}
+    try:
+        documents = build_movie_documents(fetch_movies(list(dict.fromkeys(uris.values()))))
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+    response = JsonResponse({
+        "movies": [documents[uri] for id, uri in uris.items() if uri in documents],
+        "notFound": [id for id, uri in uris.items() if uri not in documents],
+    })
+    if any(document["section_errors"] for document in documents.values()):
+        add_never_cache_headers(response)
+    return response
+
+# Poster dan foto dari host di IMAGE_PROXY_HOSTS, diambil sekali lalu
+# disimpan dalam ukuran IMAGE_VARIANTS di cache disk. URL-nya tidak pernah
+# berubah isinya, jadi boleh di-cache browser/CDN selamanya
+@require_http_methods(["GET", "HEAD"])
+def image_proxy(request, variant):
+    if variant not in settings.IMAGE_VARIANTS:
+        return JsonResponse({"error": "Variant tidak dikenal"}, status=400)
+    src = normalize_image_url(request.GET.get("src"))
+    if not is_proxyable(src):
+        return JsonResponse({"error": "Host gambar tidak diizinkan"}, status=403)
+
+    try:
+        path, content_type = get_variant(src, variant)
+        # File bisa saja dibuang eviction di antara get_variant dan open
+        try:
+            image = open(path, "rb")
+        except FileNotFoundError:
+            path, content_type = get_variant(src, variant)
+            image = open(path, "rb")
+    except UnsupportedImage:
+        # Format yang tidak bisa diubah ukurannya (mis. SVG) memakai URL asli;
+        # redirect-nya juga di-cache agar browser tidak bertanya lagi
+        response = HttpResponseRedirect(src)
+        patch_cache_control(response, public=True, max_age=settings.IMAGE_PROXY_MAX_AGE)
+        return response
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=403)
     except Exception as e:
-        return JsonResponse({"error": str(e)}, status=500)
\ No newline at end of file
+        print(f"Error fetching image {src}: {e}")
+        return JsonResponse({"error": "Gambar tidak dapat diambil"}, status=502)
+
+    etag = f'"{image_key(src)[:16]}-{variant}-{os.fstat(image.fileno()).st_size}"'
+    if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+        image.close()
+        response = HttpResponse(status=304)
+    else:
+        response = FileResponse(image, content_type=content_type)
+    response["ETag"] = etag
+    patch_cache_control(response, public=True, max_age=settings.IMAGE_PROXY_MAX_AGE, immutable=True)
+    return response